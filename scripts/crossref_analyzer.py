@@ -7,47 +7,43 @@ Stage 4 of the document pipeline.
 import sys
 import os
 import re
-import yaml
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent))
+from document_catalog import open_catalog
+from frontmatter_io import read_frontmatter, write_frontmatter
 
-def read_frontmatter(file_path):
-    """Extract YAML frontmatter from markdown file."""
-    content = file_path.read_text(encoding='utf-8')
 
-    if not content.startswith('---'):
-        return None, content
-
-    end_match = re.search(r'\n---\n', content[3:])
-    if not end_match:
-        return None, content
-
-    frontmatter_text = content[3:end_match.start() + 3]
-    body = content[end_match.end() + 3:]
-
-    try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-        return frontmatter, body
-    except:
-        return None, content
+def empty_stats():
+    """Counters updated by crossref_document."""
+    return {
+        'documents_analyzed': 0,
+        'proposals_created': 0,
+        'relationships_found': 0,
+        'contradictions_found': 0
+    }
 
 
-def write_frontmatter(file_path, frontmatter, body):
-    """Write markdown file with YAML frontmatter."""
-    frontmatter_text = yaml.dump(frontmatter, default_flow_style=False, sort_keys=False)
-    content = f"---\n{frontmatter_text}---\n\n{body}"
-    file_path.write_text(content, encoding='utf-8')
+def load_kb_names(kb_dir):
+    """People and term names known to the knowledge base, as matched against documents."""
+    people_dir = kb_dir / 'people'
+    defs_dir = kb_dir / 'definitions'
+    kb_people = {f.stem.replace('-', ' ').title() for f in people_dir.glob('*.md')} if people_dir.exists() else None
+    kb_terms = {f.stem.replace('-', ' ').upper() for f in defs_dir.glob('*.md')} if defs_dir.exists() else None
+    return kb_people, kb_terms
 
 
-def analyze_document_relationships(doc_path, kb_dir):
+def analyze_document_relationships(doc_path, kb_dir, document=None, kb_names=None):
     """Analyze relationships between document and knowledge base."""
-    frontmatter, body = read_frontmatter(doc_path)
+    frontmatter, body = document or read_frontmatter(doc_path)
 
     if not frontmatter:
         return None
 
+    kb_people, kb_terms = kb_names or load_kb_names(kb_dir)
+
     relationships = {
         'people_mentioned': [],
         'terms_used': [],
@@ -60,9 +56,7 @@ def analyze_document_relationships(doc_path, kb_dir):
     people_in_doc = set(re.findall(people_pattern, body))
 
     # Check against knowledge base people
-    people_dir = kb_dir / 'people'
-    if people_dir.exists():
-        kb_people = {f.stem.replace('-', ' ').title() for f in people_dir.glob('*.md')}
+    if kb_people is not None:
         relationships['people_mentioned'] = list(people_in_doc & kb_people)
 
     # Extract acronyms/terms from document
@@ -70,9 +64,7 @@ def analyze_document_relationships(doc_path, kb_dir):
     terms_in_doc = set(re.findall(acronym_pattern, body))
 
     # Check against knowledge base definitions
-    defs_dir = kb_dir / 'definitions'
-    if defs_dir.exists():
-        kb_terms = {f.stem.replace('-', ' ').upper() for f in defs_dir.glob('*.md')}
+    if kb_terms is not None:
         relationships['terms_used'] = list(terms_in_doc & kb_terms)
 
     # Identify projects from filename/content
@@ -142,9 +134,18 @@ _Add notes here when reviewing_
     return proposal
 
 
-def crossref_document(doc_path, kb_dir, proposals_dir, proposal_counter, stats):
-    """Cross-reference a single document with knowledge base."""
-    frontmatter, body = read_frontmatter(doc_path)
+def crossref_document(doc_path, kb_dir, proposals_dir, proposal_counter, stats, catalog=None,
+                      document=None, kb_names=None):
+    """
+    Cross-reference a single document with knowledge base.
+
+    document is an optional already parsed (frontmatter, body) pair and
+    kb_names the result of load_kb_names(), reused across documents.
+    """
+    if catalog is not None and catalog.get_state(doc_path).get('crossref_date'):
+        return proposal_counter
+
+    frontmatter, body = document or read_frontmatter(doc_path)
 
     if not frontmatter:
         return proposal_counter
@@ -154,7 +155,7 @@ def crossref_document(doc_path, kb_dir, proposals_dir, proposal_counter, stats):
         return proposal_counter
 
     # Analyze relationships
-    relationships = analyze_document_relationships(doc_path, kb_dir)
+    relationships = analyze_document_relationships(doc_path, kb_dir, (frontmatter, body), kb_names)
 
     if not relationships:
         return proposal_counter
@@ -216,7 +217,10 @@ def crossref_document(doc_path, kb_dir, proposals_dir, proposal_counter, stats):
     # Mark document as cross-referenced
     frontmatter['crossref_date'] = datetime.now().strftime('%Y-%m-%d')
     frontmatter['crossref_proposals'] = doc_proposals
-    write_frontmatter(doc_path, frontmatter, body)
+    if catalog is not None:
+        catalog.set_state(doc_path, crossref_date=frontmatter['crossref_date'], crossref_proposals=doc_proposals)
+    else:
+        write_frontmatter(doc_path, frontmatter, body)
 
     stats['documents_analyzed'] += 1
     stats['relationships_found'] += len(relationships['people_mentioned']) + len(relationships['terms_used'])
@@ -224,6 +228,69 @@ def crossref_document(doc_path, kb_dir, proposals_dir, proposal_counter, stats):
     return proposal_counter
 
 
+def write_crossref_summary(proposals_dir, stats):
+    """Write today's cross-reference summary report next to the proposals."""
+    summary_file = proposals_dir / f"_summary-{datetime.now().strftime('%Y-%m-%d')}.md"
+
+    summary_content = f"""# Cross-Reference Summary
+
+**Analysis Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+**Documents Analyzed:** {stats['documents_analyzed']}
+**Knowledge Base Entries Scanned:** Multiple directories
+
+## Findings Overview
+
+| Category | Count |
+|----------|-------|
+| Documents Analyzed | {stats['documents_analyzed']} |
+| Relationships Found | {stats['relationships_found']} |
+| Update Proposals | {stats['proposals_created']} |
+| Contradictions | {stats['contradictions_found']} |
+
+## Proposed Updates
+
+Total proposals created: {stats['proposals_created']}
+
+See individual proposal files in this directory for details.
+
+## Review Process
+
+1. Review each `update-NNN-*.md` file
+2. Check the evidence and rationale
+3. Mark your decision in the "Review Actions" checklist
+4. Use `/review <proposal-id>` to apply approved changes
+
+## Important
+
+**NO CHANGES WERE AUTO-APPLIED**
+
+All proposals require manual review before being applied to the knowledge base.
+"""
+
+    summary_file.write_text(summary_content, encoding='utf-8')
+
+    return summary_file
+
+
+def write_crossref_log(project_dir, stats):
+    """Append this run's counts to today's crossref log."""
+    log_dir = project_dir / 'logs'
+    log_dir.mkdir(exist_ok=True)
+    log_file = log_dir / f"crossref-{datetime.now().strftime('%Y-%m-%d')}.md"
+
+    log_content = f"## Cross-Reference Log - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    log_content += f"Documents Analyzed: {stats['documents_analyzed']}\n"
+    log_content += f"Proposals Generated: {stats['proposals_created']}\n"
+    log_content += f"Relationships Found: {stats['relationships_found']}\n"
+    log_content += f"Contradictions Found: {stats['contradictions_found']}\n\n"
+
+    separator = "\n" if log_file.exists() else ""
+    with open(log_file, 'a') as f:
+        f.write(separator + log_content)
+
+    return log_file
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python3 crossref_analyzer.py <project_dir> [filter]")
@@ -246,16 +313,24 @@ def main():
 
     proposals_dir.mkdir(exist_ok=True)
 
-    # Get documents to analyze
-    files = list(processed_dir.glob('*.md'))
+    # Get documents to analyze (already cross-referenced ones are skipped anyway)
+    catalog = open_catalog(project_dir, ['processed'])
 
     if filter_arg == 'today':
-        # Filter to documents processed today
+        # Filter to documents processed (or dropped into processed/) today
         today = datetime.now().date()
-        files = [f for f in files if datetime.fromtimestamp(f.stat().st_mtime).date() == today]
+        midnight = datetime.combine(today, datetime.min.time()).timestamp()
+        files = catalog.documents(
+            'processed',
+            where='crossref_date IS NULL AND (processed_date = ? OR mtime >= ?)',
+            params=(today.strftime('%Y-%m-%d'), midnight),
+        )
+    else:
+        files = catalog.documents('processed', where='crossref_date IS NULL')
 
     if not files:
         print("No documents to cross-reference")
+        catalog.close()
         return
 
     # Count existing proposals to continue numbering
@@ -267,23 +342,24 @@ def main():
     print(f"Documents to analyze: {len(files)}")
     print(f"Existing proposals: {len(existing_proposals)}\n")
 
-    stats = {
-        'documents_analyzed': 0,
-        'proposals_created': 0,
-        'relationships_found': 0,
-        'contradictions_found': 0
-    }
+    stats = empty_stats()
+
+    # The knowledge base does not change during cross-referencing
+    kb_names = load_kb_names(kb_dir)
 
     # Process each document
-    for i, doc_path in enumerate(sorted(files), 1):
+    for i, doc_path in enumerate(files, 1):
         if i % 25 == 0:
             print(f"Progress: {i}/{len(files)}")
 
         try:
-            proposal_counter = crossref_document(doc_path, kb_dir, proposals_dir, proposal_counter, stats)
+            proposal_counter = crossref_document(doc_path, kb_dir, proposals_dir, proposal_counter, stats, catalog,
+                                                 kb_names=kb_names)
         except Exception as e:
             print(f"  Error analyzing {doc_path.name}: {e}")
 
+    catalog.close()
+
     print(f"\n\nCross-Reference Complete")
     print(f"========================\n")
 
@@ -294,62 +370,8 @@ def main():
     if stats['contradictions_found'] > 0:
         print(f"Contradictions Found: {stats['contradictions_found']}")
 
-    # Generate summary report
-    summary_file = proposals_dir / f"_summary-{datetime.now().strftime('%Y-%m-%d')}.md"
-
-    summary_content = f"""# Cross-Reference Summary
-
-**Analysis Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**Documents Analyzed:** {stats['documents_analyzed']}
-**Knowledge Base Entries Scanned:** Multiple directories
-
-## Findings Overview
-
-| Category | Count |
-|----------|-------|
-| Documents Analyzed | {stats['documents_analyzed']} |
-| Relationships Found | {stats['relationships_found']} |
-| Update Proposals | {stats['proposals_created']} |
-| Contradictions | {stats['contradictions_found']} |
-
-## Proposed Updates
-
-Total proposals created: {stats['proposals_created']}
-
-See individual proposal files in this directory for details.
-
-## Review Process
-
-1. Review each `update-NNN-*.md` file
-2. Check the evidence and rationale
-3. Mark your decision in the "Review Actions" checklist
-4. Use `/review <proposal-id>` to apply approved changes
-
-## Important
-
-**NO CHANGES WERE AUTO-APPLIED**
-
-All proposals require manual review before being applied to the knowledge base.
-"""
-
-    summary_file.write_text(summary_content, encoding='utf-8')
-
-    # Write log
-    log_dir = project_dir / 'logs'
-    log_dir.mkdir(exist_ok=True)
-    log_file = log_dir / f"crossref-{datetime.now().strftime('%Y-%m-%d')}.md"
-
-    log_content = f"## Cross-Reference Log - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-    log_content += f"Documents Analyzed: {stats['documents_analyzed']}\n"
-    log_content += f"Proposals Generated: {stats['proposals_created']}\n"
-    log_content += f"Relationships Found: {stats['relationships_found']}\n"
-    log_content += f"Contradictions Found: {stats['contradictions_found']}\n\n"
-
-    if log_file.exists():
-        existing = log_file.read_text()
-        log_file.write_text(existing + "\n" + log_content)
-    else:
-        log_file.write_text(log_content)
+    summary_file = write_crossref_summary(proposals_dir, stats)
+    log_file = write_crossref_log(project_dir, stats)
 
     print(f"\nSummary written to: {summary_file}")
     print(f"Log written to: {log_file}")
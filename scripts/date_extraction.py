@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Document date extraction for intake.
+
+One precompiled pattern recognizes every supported date format:
+
+- ISO: 2024-03-04, 2024/03/04, 2024.3.4 (and ISO timestamps: 2024-03-04T10:00:00Z)
+- US and EU numeric: 03/04/2024 is March 4; 25/03/2024 and 04.03.2024 are day first
+- month names: March 4, 2024 / Mar 4th 2024 / 4 March 2024 / 4th of Mar, 2024
+- Zoom recording names: GMT20240304-150000
+- Slack JSON message timestamps: "ts": "1709560800.000100"
+
+A match is only accepted when it is a real calendar date. The pattern runs
+over a header window at the start of the document, where dates almost always
+are; past the window, only the surroundings of four-digit years are checked,
+so a long document without a date costs one cheap scan.
+
+Usage:
+    python3 date_extraction.py <file_or_directory>...   # benchmark over a corpus
+"""
+
+import re
+import sys
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+
+# The combined pattern runs over this much of the start of a document
+HEADER_WINDOW_CHARS = 64 * 1024
+
+MONTH_NAMES = (r'jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+               r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?')
+
+MONTHS = {name: number for number, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), 1)}
+
+YEAR = r'(?:19|20)\d\d'
+
+DATE_PATTERN = re.compile(rf'''
+    (?<!\d)(?:
+        (?P<iso_y>{YEAR})(?P<iso_sep>[-/.])(?P<iso_m>\d\d?)(?P=iso_sep)(?P<iso_d>\d\d?)(?!\d)
+      | (?P<num_a>\d\d?)(?P<num_sep>[-/.])(?P<num_b>\d\d?)(?P=num_sep)(?P<num_y>{YEAR})(?!\d)
+      | (?P<dmy_d>\d\d?)(?:st|nd|rd|th)?\s+(?:of\s+)?(?P<dmy_m>{MONTH_NAMES})\b\.?,?\s+(?P<dmy_y>{YEAR})(?!\d)
+    )
+  | \b(?P<mdy_m>{MONTH_NAMES})\b\.?\s+(?P<mdy_d>\d\d?)(?:st|nd|rd|th)?,?\s+(?P<mdy_y>{YEAR})(?!\d)
+  | GMT(?P<gmt_y>{YEAR})(?P<gmt_m>\d\d)(?P<gmt_d>\d\d)-\d{{6}}
+  | "ts"\s*:\s*"(?P<epoch>\d{{9,10}})(?:\.\d+)?"
+''', re.VERBOSE | re.IGNORECASE)
+
+# Past the header window, DATE_PATTERN is only tried around these
+YEAR_CANDIDATE = re.compile(YEAR)
+
+# How far around a year a date can reach: "4th of September, 2024" before it,
+# "-03-04" or "0304-150000" after it
+DATE_REACH_BEFORE = 24
+DATE_REACH_AFTER = 12
+
+
+def _to_date(match):
+    """(YYYY-MM-DD, format) for a DATE_PATTERN match, or None if it is not a real date."""
+    groups = match.groupdict()
+    try:
+        if groups['iso_y']:
+            day = date(int(groups['iso_y']), int(groups['iso_m']), int(groups['iso_d']))
+            kind = 'iso'
+        elif groups['num_y']:
+            first, second = int(groups['num_a']), int(groups['num_b'])
+            # Dotted dates and ones whose first number cannot be a month are day first
+            if groups['num_sep'] == '.' or first > 12:
+                day, kind = date(int(groups['num_y']), second, first), 'eu'
+            else:
+                day, kind = date(int(groups['num_y']), first, second), 'us'
+        elif groups['dmy_y']:
+            day = date(int(groups['dmy_y']), MONTHS[groups['dmy_m'][:3].lower()], int(groups['dmy_d']))
+            kind = 'month-name'
+        elif groups['mdy_y']:
+            day = date(int(groups['mdy_y']), MONTHS[groups['mdy_m'][:3].lower()], int(groups['mdy_d']))
+            kind = 'month-name'
+        elif groups['gmt_y']:
+            day = date(int(groups['gmt_y']), int(groups['gmt_m']), int(groups['gmt_d']))
+            kind = 'zoom'
+        else:
+            day = datetime.fromtimestamp(int(groups['epoch']), timezone.utc).date()
+            kind = 'slack'
+    except ValueError:
+        return None
+    return day.strftime('%Y-%m-%d'), kind
+
+
+def _next_to_date(text, start, end):
+    """Whether the year at text[start:end] has the neighbours of a date in some format."""
+    after = text[end:end + 1]
+    before = text[max(0, start - DATE_REACH_BEFORE):start]
+    if after in ('-', '/', '.') and text[end + 1:end + 2].isdigit():
+        return True  # 2024-03-04, GMT20240304 has none
+    if before[-1:] in ('-', '/', '.') or before[-3:].upper() == 'GMT':
+        return True
+    # March 4, 2024 / 4th 2024 / 4 March 2024 / Sept. 2024
+    words = before.rstrip(' \t\r\n,.').rsplit(None, 1)
+    word = words[-1].lower() if words else ''
+    return word[-1:].isdigit() or word[-2:] in ('st', 'nd', 'rd', 'th') or word[:3] in MONTHS
+
+
+def match_date(text, window=HEADER_WINDOW_CHARS):
+    """The first date in text as (YYYY-MM-DD, format), or None."""
+    # Read a little past the window so a date starting on its edge is seen whole;
+    # matches starting further on may be cut short and are left to the year scan
+    for match in DATE_PATTERN.finditer(text, 0, window + DATE_REACH_BEFORE + DATE_REACH_AFTER):
+        if match.start() >= window:
+            break
+        found = _to_date(match)
+        if found:
+            return found
+
+    for candidate in YEAR_CANDIDATE.finditer(text, window):
+        year = candidate.start()
+        if not _next_to_date(text, year, candidate.end()):
+            continue
+        for match in DATE_PATTERN.finditer(text, year - DATE_REACH_BEFORE, candidate.end() + DATE_REACH_AFTER):
+            if match.start() <= year < match.end():
+                found = _to_date(match)
+                if found:
+                    return found
+    return None
+
+
+def extract_date_from_content(content):
+    """Try to extract a date from document content."""
+    found = match_date(content)
+    return found[0] if found else None
+
+
+def extract_date_from_filename(filename):
+    """Try to extract a date from filename."""
+    found = match_date(filename)
+    return found[0] if found else None
+
+
+def _corpus_files(paths):
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob('*') if p.is_file() and p.suffix.lower() in ('.md', '.txt', '.vtt', '.json', '.eml'))
+        elif path.is_file():
+            yield path
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 date_extraction.py <file_or_directory>...")
+        sys.exit(1)
+
+    files = list(_corpus_files(Path(arg).expanduser() for arg in sys.argv[1:]))
+    if not files:
+        print("No documents found")
+        return
+
+    print(f"Benchmarking date extraction over {len(files)} documents")
+
+    formats = {}
+    timings = []
+    total_chars = 0
+    for path in files:
+        try:
+            text = path.read_text(encoding='utf-8', errors='replace')
+        except OSError as e:
+            print(f"  Error reading {path}: {e}")
+            continue
+
+        start = time.perf_counter()
+        found = match_date(text)
+        timings.append((time.perf_counter() - start, path))
+        total_chars += len(text)
+        kind = found[1] if found else 'none'
+        formats[kind] = formats.get(kind, 0) + 1
+
+    elapsed = sum(seconds for seconds, _ in timings)
+    print(f"\nDocuments: {len(timings)} ({total_chars / 1e6:.1f}M chars)")
+    print(f"Time: {elapsed:.3f}s ({total_chars / 1e6 / elapsed if elapsed else 0:.0f}M chars/s, "
+          f"{elapsed / len(timings) * 1000:.2f}ms per document)")
+    print("\nDates found by format:")
+    for kind, count in sorted(formats.items(), key=lambda item: -item[1]):
+        print(f"  {kind}: {count}")
+    print("\nSlowest documents:")
+    for seconds, path in sorted(timings, reverse=True)[:5]:
+        print(f"  {seconds * 1000:.2f}ms  {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Count fixed dictionary terms (technical phrases, product names) in text.
+
+A dictionary is built once into an Aho-Corasick automaton over words rather
+than characters: the text is walked word by word, and every entry ending at
+a word is counted, however many entries there are. Entries match whole
+words, ignoring case; the words of a multi-word entry may be separated by
+any whitespace, or by a hyphen where the entry has one ("Real-time").
+
+Dictionary files hold one entry per line; "#" starts a comment.
+"Entry = Name" counts the entry under Name instead of its normalized form.
+
+Usage:
+    python3 dictionary_matcher.py <dictionary_file> <file>...   # count entries in files
+"""
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from token_stream import TokenStream
+
+
+DICTIONARY_DIR = Path(__file__).parent / 'dictionaries'
+
+# Separators allowed between the words of an entry, by the gap in the entry itself
+SPACE, HYPHEN = ' ', '-'
+
+
+def _gap(separator):
+    """SPACE or HYPHEN for a separator between two words, None if it breaks a phrase."""
+    if separator == HYPHEN:
+        return HYPHEN
+    return SPACE if separator.isspace() else None
+
+
+class DictionaryMatcher:
+    """Aho-Corasick automaton over case-folded words; edges past the first word carry the separator."""
+
+    def __init__(self, entries):
+        """entries: (phrase, name) pairs; name is what a match of the phrase is counted as."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for phrase, name in entries:
+            self._add(phrase, name)
+        self._link()
+
+    def _add(self, phrase, name):
+        tokens = TokenStream(phrase.strip())
+        words = tokens.folded
+        if not words[0] or not words[-1]:
+            raise ValueError(f"dictionary entry {phrase!r} is not made of words")
+
+        state = 0
+        for i, word in enumerate(words):
+            if i == 0:
+                symbol = word
+            else:
+                gap = _gap(tokens.gaps[i - 1])
+                if gap is None:
+                    raise ValueError(f"dictionary entry {phrase!r}: words must be separated by spaces or a hyphen")
+                symbol = gap + word
+
+            if symbol not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][symbol] = len(self._goto) - 1
+            state = self._goto[state][symbol]
+
+        if all(name != named for named, _ in self._out[state]):
+            self._out[state] += ((name, len(words)),)
+
+    def _link(self):
+        """Failure links, breadth first; outputs are extended with those of the failure state (names once)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = list(goto[0].values())
+        for state in queue:
+            for symbol, child in goto[state].items():
+                queue.append(child)
+                target = fail[state]
+                # A suffix starting at this word matches the word on its own, whatever precedes it
+                while target and symbol not in goto[target]:
+                    target = fail[target]
+                fail[child] = goto[target].get(symbol) if target else goto[0].get(symbol[1:], 0)
+                names = {name for name, _ in out[child]}
+                out[child] += tuple(entry for entry in out[fail[child]] if entry[0] not in names)
+
+    def count(self, text):
+        """Counter of entry names matched in text."""
+        return self.count_tokens(TokenStream(text))
+
+    def count_tokens(self, tokens, mentions=None):
+        """
+        Counter of entry names matched in a token_stream.TokenStream.
+
+        When mentions is a dict, the character span of each match is appended
+        to mentions[name].
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        gaps = tokens.gaps
+        counts = Counter()
+        state = 0
+
+        for i, word in enumerate(tokens.folded):
+            if state:
+                gap = _gap(gaps[i - 1])
+                symbol = gap + word if gap else None
+                while state and (symbol is None or symbol not in goto[state]):
+                    state = fail[state]
+                state = goto[state][symbol] if state else root.get(word, 0)
+            else:
+                state = root.get(word, 0)
+
+            if state:
+                for name, length in out[state]:
+                    counts[name] += 1
+                    if mentions is not None:
+                        mentions.setdefault(name, []).append(tokens.span(i - length + 1, i))
+        return counts
+
+
+def read_dictionary(path, normalize=str):
+    """(phrase, name) entries of a dictionary file; name defaults to normalize(phrase)."""
+    entries = []
+    for line in Path(path).read_text(encoding='utf-8').splitlines():
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        phrase, _, name = line.partition('=')
+        phrase, name = phrase.strip(), name.strip()
+        entries.append((phrase, name or normalize(phrase)))
+    return entries
+
+
+def dictionary_files(name, project_dir=None):
+    """The shipped dictionary of this name, plus the project's own if it has one."""
+    files = [DICTIONARY_DIR / name]
+    if project_dir:
+        project_file = Path(project_dir).expanduser() / 'dictionaries' / name
+        if project_file.exists():
+            files.append(project_file)
+    return files
+
+
+def load_matcher(paths, normalize=str):
+    """A DictionaryMatcher over the entries of the given dictionary files."""
+    return DictionaryMatcher(entry for path in paths for entry in read_dictionary(path, normalize))
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python3 dictionary_matcher.py <dictionary_file> <file>...")
+        sys.exit(1)
+
+    matcher = load_matcher([sys.argv[1]])
+    counts = Counter()
+    for path in sys.argv[2:]:
+        counts.update(matcher.count(Path(path).read_text(encoding='utf-8', errors='replace')))
+
+    for name, count in counts.most_common():
+        print(f"  {name:<30} {count:>6}")
+
+
+if __name__ == '__main__':
+    main()
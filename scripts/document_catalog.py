@@ -0,0 +1,761 @@
+#!/usr/bin/env python3
+"""
+SQLite document catalog shared by every pipeline stage.
+
+Records each document's path, stage, status, hashes, dates, participants and
+extraction links in <project_dir>/catalog.db. Stages query the catalog for
+their inputs and update it as they go instead of globbing a directory and
+re-parsing the frontmatter of every file on every run.
+
+The catalog is also the sidecar store for pipeline state (status,
+processed_date, crossref_proposals, organized_to, ...). Documents in
+processed/ and extractions/ are written once; later state changes only touch
+the catalog. Use --materialize to write that state back into the frontmatter
+of each document when a tool needs to see it in the files themselves.
+
+Usage:
+    python3 document_catalog.py <project_dir> [--rebuild | --materialize]
+
+Without flags, reconciles the catalog with the stage directories and prints a
+summary. --rebuild re-parses every document (sidecar state is kept).
+"""
+
+import sys
+import os
+import json
+import hashlib
+import sqlite3
+from pathlib import Path
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent))
+from frontmatter_io import read_header, read_frontmatter, write_frontmatter
+from turn_index import TurnTable
+
+
+CATALOG_FILENAME = 'catalog.db'
+
+# Directories tracked by the catalog, in pipeline order
+STAGES = ('to-process', 'processed', 'extractions')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    stage TEXT NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT,
+    source TEXT,
+    origin TEXT,
+    document_date TEXT,
+    intake_date TEXT,
+    processed_date TEXT,
+    crossref_date TEXT,
+    organized_date TEXT,
+    content_hash TEXT,
+    input_hash TEXT,
+    mtime REAL,
+    size INTEGER,
+    state TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_stage_status ON documents (stage, status);
+CREATE INDEX IF NOT EXISTS documents_origin ON documents (origin);
+CREATE INDEX IF NOT EXISTS documents_input_hash ON documents (input_hash);
+CREATE INDEX IF NOT EXISTS documents_content_hash ON documents (content_hash);
+
+CREATE TABLE IF NOT EXISTS participants (
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (path, name)
+);
+CREATE INDEX IF NOT EXISTS participants_name ON participants (name);
+
+CREATE TABLE IF NOT EXISTS extractions (
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    extraction_path TEXT NOT NULL,
+    PRIMARY KEY (path, kind)
+);
+
+CREATE TABLE IF NOT EXISTS raw_files (
+    name TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    mtime REAL,
+    size INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS fingerprints (
+    id INTEGER PRIMARY KEY,
+    origin TEXT NOT NULL,
+    name TEXT NOT NULL,
+    input_hash TEXT,
+    shingles INTEGER,
+    signature BLOB,
+    samples INTEGER
+);
+CREATE INDEX IF NOT EXISTS fingerprints_origin ON fingerprints (origin);
+CREATE INDEX IF NOT EXISTS fingerprints_input_hash ON fingerprints (input_hash);
+
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    fingerprint INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lsh_buckets_band_bucket ON lsh_buckets (band, bucket);
+CREATE INDEX IF NOT EXISTS lsh_buckets_fingerprint ON lsh_buckets (fingerprint);
+
+CREATE TABLE IF NOT EXISTS shingle_samples (
+    shingle INTEGER NOT NULL,
+    fingerprint INTEGER NOT NULL,
+    PRIMARY KEY (shingle, fingerprint)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS shingle_samples_fingerprint ON shingle_samples (fingerprint);
+
+CREATE TABLE IF NOT EXISTS turns (
+    path TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS entity_counts (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    signature TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS mentions (
+    entity TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    document INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (entity, kind, document)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS mentions_document ON mentions (document);
+
+CREATE TABLE IF NOT EXISTS stage_sync (
+    stage TEXT PRIMARY KEY,
+    dir_mtime INTEGER
+);
+"""
+
+# Frontmatter keys copied into catalog columns
+FRONTMATTER_COLUMNS = (
+    'status', 'source', 'document_date', 'intake_date',
+    'processed_date', 'crossref_date', 'organized_date',
+)
+
+# Pipeline state kept as JSON in the sidecar `state` column
+STATE_KEYS = (
+    'extracted', 'task_count', 'people_count', 'definition_count',
+    'crossref_proposals', 'organized', 'organized_to',
+)
+
+# Columns that hold pipeline state rather than intake metadata
+STATE_COLUMNS = ('status', 'processed_date', 'crossref_date', 'organized_date')
+
+
+def hash_bytes(data):
+    """SHA-256 hex digest of bytes or text."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _as_text(value):
+    """Render a frontmatter scalar (dates included) as catalog text."""
+    if value is None or value == '':
+        return None
+    return str(value)
+
+
+class DocumentCatalog:
+    """Persistent index of pipeline documents for one project directory."""
+
+    def __init__(self, project_dir):
+        self.project_dir = Path(project_dir).expanduser()
+        self.db_path = self.project_dir / CATALOG_FILENAME
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Bring a catalog created by an earlier version up to the current schema."""
+        columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(documents)')}
+        if 'state' not in columns:
+            self.conn.execute('ALTER TABLE documents ADD COLUMN state TEXT')
+        columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(fingerprints)')}
+        if 'samples' not in columns:
+            self.conn.execute('ALTER TABLE fingerprints ADD COLUMN samples INTEGER')
+        # Entity counts are a cache: ones keyed by the implicit rowid are dropped and rebuilt
+        columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(entity_counts)')}
+        if 'id' not in columns:
+            self.conn.executescript('DROP TABLE mentions; DROP TABLE entity_counts;' + SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Commit pending changes and close the database."""
+        if self.conn is not None:
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
+
+    def commit(self):
+        self.conn.commit()
+
+    # -------------------------------------------------------------------------
+    # Paths
+    # -------------------------------------------------------------------------
+
+    def key(self, path):
+        """Catalog key for a path: posix path relative to the project dir."""
+        path = Path(path)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.project_dir)
+            except ValueError:
+                path = Path(os.path.relpath(path, self.project_dir))
+        return path.as_posix()
+
+    def path(self, key):
+        """Absolute path for a catalog key."""
+        return self.project_dir / key
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    def record(self, path, stage, frontmatter=None, stat=None, **fields):
+        """
+        Insert or refresh a document from its frontmatter and stat.
+
+        Values missing from the frontmatter keep what the catalog already
+        holds, so re-reading a write-once document never loses sidecar state.
+        """
+        key = self.key(path)
+        frontmatter = frontmatter or {}
+        existing = self.get(key) or {}
+
+        if stat is None:
+            try:
+                stat = self.path(key).stat()
+            except OSError:
+                stat = None
+
+        row = {}
+        for col in FRONTMATTER_COLUMNS:
+            value = _as_text(frontmatter.get(col))
+            row[col] = value if value is not None else existing.get(col)
+
+        if stage == 'processed':
+            row['status'] = 'processed'
+        elif stage == 'extractions':
+            row['status'] = 'organized' if frontmatter.get('organized') else existing.get('status', 'pending')
+
+        origin = frontmatter.get('original_filename') or frontmatter.get('source_document')
+        row['origin'] = _as_text(origin) or existing.get('origin')
+        row['content_hash'] = existing.get('content_hash')
+        row['input_hash'] = _as_text(frontmatter.get('input_hash')) or existing.get('input_hash')
+
+        state = json.loads(existing['state']) if existing.get('state') else {}
+        state.update({k: frontmatter[k] for k in STATE_KEYS if k in frontmatter})
+        row['state'] = json.dumps(state, default=str) if state else None
+
+        row.update(fields)
+        row.update({
+            'path': key,
+            'stage': stage,
+            'name': Path(key).name,
+            'mtime': stat.st_mtime if stat else None,
+            'size': stat.st_size if stat else None,
+        })
+
+        columns = ', '.join(row)
+        placeholders = ', '.join(f':{c}' for c in row)
+        self.conn.execute(f'INSERT OR REPLACE INTO documents ({columns}) VALUES ({placeholders})', row)
+
+        participants = frontmatter.get('participants')
+        if isinstance(participants, list):
+            self.set_participants(key, participants)
+
+        extracted = frontmatter.get('extracted')
+        if isinstance(extracted, dict):
+            self.set_extractions(key, extracted)
+
+    def update(self, path, **fields):
+        """Update individual columns of an existing document."""
+        if not fields:
+            return
+        assignments = ', '.join(f'{c} = :{c}' for c in fields)
+        fields = {c: _as_text(v) if c.endswith('_date') else v for c, v in fields.items()}
+        fields['_key'] = self.key(path)
+        self.conn.execute(f'UPDATE documents SET {assignments} WHERE path = :_key', fields)
+
+    def set_state(self, path, **fields):
+        """
+        Record pipeline state for a document without touching the file.
+
+        Status and date fields go to their columns; everything else is merged
+        into the JSON state column.
+        """
+        key = self.key(path)
+        self.update(key, **{c: v for c, v in fields.items() if c in STATE_COLUMNS})
+
+        extra = {c: v for c, v in fields.items() if c not in STATE_COLUMNS}
+        if extra:
+            row = self.conn.execute('SELECT state FROM documents WHERE path = ?', (key,)).fetchone()
+            if row is None:
+                return
+            state = json.loads(row['state']) if row['state'] else {}
+            state.update(extra)
+            self.update(key, state=json.dumps(state, default=str))
+
+    def get_state(self, path):
+        """Pipeline state for a document: non-empty state columns plus the JSON extras."""
+        row = self.get(path)
+        if row is None:
+            return {}
+        state = {c: row[c] for c in STATE_COLUMNS if row[c] is not None}
+        if row['state']:
+            state.update(json.loads(row['state']))
+        return state
+
+    def touch(self, path):
+        """Refresh the stored mtime/size after a document was rewritten."""
+        key = self.key(path)
+        try:
+            stat = self.path(key).stat()
+        except OSError:
+            return
+        self.conn.execute(
+            'UPDATE documents SET mtime = ?, size = ? WHERE path = ?',
+            (stat.st_mtime, stat.st_size, key),
+        )
+
+    def move(self, old_path, new_path, stage, **fields):
+        """Re-key a document after it was renamed into another stage."""
+        old_key, new_key = self.key(old_path), self.key(new_path)
+        self.conn.execute('DELETE FROM documents WHERE path = ?', (new_key,))
+        self.conn.execute(
+            'UPDATE documents SET path = ?, stage = ?, name = ? WHERE path = ?',
+            (new_key, stage, Path(new_key).name, old_key),
+        )
+        for table in ('participants', 'extractions', 'turns'):
+            self.conn.execute(f'DELETE FROM {table} WHERE path = ?', (new_key,))
+            self.conn.execute(f'UPDATE {table} SET path = ? WHERE path = ?', (new_key, old_key))
+        self.update(new_key, **fields)
+        self.touch(new_key)
+
+    def remove(self, path):
+        """Forget a document that no longer exists."""
+        key = self.key(path)
+        for table in ('documents', 'participants', 'extractions', 'turns'):
+            self.conn.execute(f'DELETE FROM {table} WHERE path = ?', (key,))
+
+    def set_participants(self, path, participants):
+        key = self.key(path)
+        self.conn.execute('DELETE FROM participants WHERE path = ?', (key,))
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO participants (path, name) VALUES (?, ?)',
+            [(key, p) for p in participants if p and isinstance(p, str)],
+        )
+
+    def set_extractions(self, path, extracted):
+        """Link a document to its extraction files ({kind: relative path})."""
+        key = self.key(path)
+        self.conn.execute('DELETE FROM extractions WHERE path = ?', (key,))
+        self.conn.executemany(
+            'INSERT INTO extractions (path, kind, extraction_path) VALUES (?, ?, ?)',
+            [(key, kind, str(rel)) for kind, rel in extracted.items()],
+        )
+
+    def set_turns(self, path, turns):
+        """Store a transcript's speaker-turn index (a turn_index.TurnTable)."""
+        self.conn.execute(
+            'INSERT OR REPLACE INTO turns (path, data) VALUES (?, ?)', (self.key(path), turns.to_bytes())
+        )
+
+    def set_entity_counts(self, content_hash, signature, data, postings=()):
+        """
+        Store a document's entity counts (JSON) under its content hash and the
+        extractor's signature, replacing its mention postings with the given
+        (entity, kind, data) from mention_index.document_postings.
+        """
+        # Postings refer to the id, so an update must keep it
+        self.conn.execute(
+            'INSERT INTO entity_counts (content_hash, signature, data) VALUES (?, ?, ?) '
+            'ON CONFLICT (content_hash) DO UPDATE SET signature = excluded.signature, data = excluded.data',
+            (content_hash, signature, data),
+        )
+        document = self.conn.execute(
+            'SELECT id FROM entity_counts WHERE content_hash = ?', (content_hash,)
+        ).fetchone()[0]
+        self.conn.execute('DELETE FROM mentions WHERE document = ?', (document,))
+        self.conn.executemany(
+            'INSERT INTO mentions (entity, kind, document, data) VALUES (?, ?, ?, ?)',
+            [(entity, kind, document, data) for entity, kind, data in postings],
+        )
+
+    def prune_entity_counts(self, signature):
+        """
+        Drop entity counts of another extractor signature or of content no
+        document has any more, and the mention postings that go with them.
+        """
+        pruned = self.conn.execute(
+            'DELETE FROM entity_counts WHERE signature != ? OR content_hash NOT IN '
+            '(SELECT content_hash FROM documents WHERE content_hash IS NOT NULL)',
+            (signature,),
+        ).rowcount
+        if pruned:
+            self.conn.execute('DELETE FROM mentions WHERE document NOT IN (SELECT id FROM entity_counts)')
+
+    def raw_file(self, name):
+        """Last recorded hash and stat of a raw/ input, or None."""
+        row = self.conn.execute('SELECT * FROM raw_files WHERE name = ?', (name,)).fetchone()
+        return dict(row) if row else None
+
+    def record_raw(self, name, content_hash, stat):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO raw_files (name, content_hash, mtime, size) VALUES (?, ?, ?, ?)',
+            (name, content_hash, stat.st_mtime, stat.st_size),
+        )
+
+    def derived_from(self, origin, input_hash):
+        """Keys of the document produced from a raw input plus its extraction files."""
+        docs = [
+            row['path'] for row in self.conn.execute(
+                'SELECT path FROM documents WHERE origin = ? AND input_hash = ? '
+                "AND stage IN ('to-process', 'processed')",
+                (origin, input_hash),
+            )
+        ]
+        derived = list(docs)
+        for key in docs:
+            derived.extend(self.extractions(key).values())
+        return derived
+
+    def record_fingerprint(self, origin, name, input_hash, fingerprint, band_keys):
+        """Index an intaken document for duplicate detection (see near_duplicates.py)."""
+        signature, shingles, samples = fingerprint if fingerprint else (None, 0, ())
+        cursor = self.conn.execute(
+            'INSERT INTO fingerprints (origin, name, input_hash, shingles, signature, samples) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (origin, name, input_hash, shingles, signature.tobytes() if signature is not None else None,
+             len(samples)),
+        )
+        self.conn.executemany(
+            'INSERT INTO lsh_buckets (band, bucket, fingerprint) VALUES (?, ?, ?)',
+            [(band, bucket, cursor.lastrowid) for band, bucket in enumerate(band_keys)],
+        )
+        self.conn.executemany(
+            'INSERT INTO shingle_samples (shingle, fingerprint) VALUES (?, ?)',
+            [(shingle, cursor.lastrowid) for shingle in samples],
+        )
+
+    def remove_fingerprints(self, origin):
+        """Drop the duplicate-detection entries of a raw input."""
+        ids = [row['id'] for row in self.conn.execute('SELECT id FROM fingerprints WHERE origin = ?', (origin,))]
+        self.conn.executemany('DELETE FROM lsh_buckets WHERE fingerprint = ?', [(i,) for i in ids])
+        self.conn.executemany('DELETE FROM shingle_samples WHERE fingerprint = ?', [(i,) for i in ids])
+        self.conn.execute('DELETE FROM fingerprints WHERE origin = ?', (origin,))
+
+    def fingerprint_by_hash(self, input_hash):
+        """An indexed document intaken from byte-identical input, or None."""
+        row = self.conn.execute('SELECT * FROM fingerprints WHERE input_hash = ? LIMIT 1', (input_hash,)).fetchone()
+        return dict(row) if row else None
+
+    def fingerprint_candidates(self, band_keys):
+        """Indexed documents sharing at least one LSH bucket with the given band keys."""
+        matches = ' OR '.join(['(band = ? AND bucket = ?)'] * len(band_keys))
+        params = [value for band, bucket in enumerate(band_keys) for value in (band, bucket)]
+        rows = self.conn.execute(
+            f'SELECT * FROM fingerprints WHERE signature IS NOT NULL AND id IN '
+            f'(SELECT fingerprint FROM lsh_buckets WHERE {matches})',
+            params,
+        )
+        return [dict(row) for row in rows]
+
+    def sample_candidates(self, samples):
+        """(indexed document, number of shared samples) for each document sharing a sampled shingle."""
+        if not len(samples):
+            return []
+        rows = self.conn.execute(
+            'SELECT f.*, c.shared FROM '
+            '(SELECT s.fingerprint, COUNT(*) AS shared FROM json_each(?) AS j '
+            'CROSS JOIN shingle_samples AS s ON s.shingle = j.value GROUP BY s.fingerprint) AS c '
+            'CROSS JOIN fingerprints AS f ON f.id = c.fingerprint',
+            (json.dumps(list(samples)),),
+        )
+        return [(dict(row), row['shared']) for row in rows]
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def get(self, path):
+        """Catalog row for a document as a dict, or None."""
+        row = self.conn.execute('SELECT * FROM documents WHERE path = ?', (self.key(path),)).fetchone()
+        return dict(row) if row else None
+
+    def documents(self, stage, status=None, exclude_status=None, modified_since=None, where=None, params=()):
+        """Absolute paths of documents in a stage, sorted by name."""
+        clauses, where_params, params = ['stage = ?'], list(params), [stage]
+        if status is not None:
+            clauses.append('status = ?')
+            params.append(status)
+        if exclude_status is not None:
+            clauses.append('(status IS NULL OR status != ?)')
+            params.append(exclude_status)
+        if modified_since is not None:
+            clauses.append('mtime >= ?')
+            params.append(modified_since)
+        if where:
+            clauses.append(where)
+            params.extend(where_params)
+
+        rows = self.conn.execute(
+            f"SELECT path FROM documents WHERE {' AND '.join(clauses)} ORDER BY name", params
+        )
+        return [self.path(row['path']) for row in rows]
+
+    def count(self, stage, status=None):
+        sql, params = 'SELECT COUNT(*) FROM documents WHERE stage = ?', [stage]
+        if status is not None:
+            sql += ' AND status = ?'
+            params.append(status)
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def content_hashes(self, stage):
+        """(absolute path, content hash or None) of every document in a stage, sorted by name."""
+        rows = self.conn.execute(
+            'SELECT path, content_hash FROM documents WHERE stage = ? ORDER BY name', (stage,)
+        )
+        return [(self.path(row['path']), row['content_hash']) for row in rows]
+
+    def entity_count_hashes(self, signature):
+        """Content hashes that have entity counts stored under an extractor signature."""
+        rows = self.conn.execute('SELECT content_hash FROM entity_counts WHERE signature = ?', (signature,))
+        return {row['content_hash'] for row in rows}
+
+    def entity_counts(self, content_hash, signature):
+        """The entity counts JSON stored for a content hash under an extractor signature, or None."""
+        row = self.conn.execute(
+            'SELECT data FROM entity_counts WHERE content_hash = ? AND signature = ?', (content_hash, signature)
+        ).fetchone()
+        return row['data'] if row else None
+
+    def mentions(self, entity, kind=None, stage='processed', date_prefix=None):
+        """
+        Mention postings of an entity in a stage's documents, by document date then name.
+
+        Returns (absolute path, document date, kind, data) tuples; unpack data
+        with mention_index.unpack. date_prefix matches the start of the
+        document date (e.g. '2025-01').
+        """
+        # CROSS JOIN fixes the join order: from the entity's postings, not from every document of the stage
+        sql = ('SELECT d.path, d.document_date, m.kind, m.data FROM mentions m '
+               'CROSS JOIN entity_counts e ON e.id = m.document '
+               'CROSS JOIN documents d ON d.content_hash = e.content_hash WHERE m.entity = ? AND d.stage = ?')
+        params = [entity, stage]
+        if kind is not None:
+            sql += ' AND m.kind = ?'
+            params.append(kind)
+        if date_prefix is not None:
+            sql += ' AND substr(d.document_date, 1, ?) = ?'
+            params.extend([len(date_prefix), date_prefix])
+        rows = self.conn.execute(sql + ' ORDER BY d.document_date, d.name', params)
+        return [(self.path(row['path']), row['document_date'], row['kind'], row['data']) for row in rows]
+
+    def mention_documents(self, entity, kind=None, stage='processed'):
+        """(catalog key, document date) of a stage's documents that mention an entity, by name."""
+        sql = ('SELECT DISTINCT d.path, d.name, d.document_date FROM mentions m '
+               'CROSS JOIN entity_counts e ON e.id = m.document '
+               'CROSS JOIN documents d ON d.content_hash = e.content_hash WHERE m.entity = ? AND d.stage = ?')
+        params = [entity, stage]
+        if kind is not None:
+            sql += ' AND m.kind = ?'
+            params.append(kind)
+        rows = self.conn.execute(sql + ' ORDER BY d.name', params)
+        return [(row['path'], row['document_date']) for row in rows]
+
+    def participants(self, stage='processed'):
+        """Distinct participant names across all documents in a stage."""
+        rows = self.conn.execute(
+            'SELECT DISTINCT p.name FROM participants p JOIN documents d ON d.path = p.path '
+            'WHERE d.stage = ?',
+            (stage,),
+        )
+        return {row[0] for row in rows}
+
+    def extractions(self, path):
+        """Extraction files linked to a document as {kind: relative path}."""
+        rows = self.conn.execute(
+            'SELECT kind, extraction_path FROM extractions WHERE path = ?', (self.key(path),)
+        )
+        return {row['kind']: row['extraction_path'] for row in rows}
+
+    def turns(self, path):
+        """A document's speaker-turn index as a TurnTable, or None."""
+        row = self.conn.execute('SELECT data FROM turns WHERE path = ?', (self.key(path),)).fetchone()
+        return TurnTable.from_bytes(row['data']) if row else None
+
+    def documents_with_turns(self, stage=None):
+        """Absolute paths of documents that have a speaker-turn index, sorted by name."""
+        sql, params = 'SELECT d.path FROM documents d JOIN turns t ON t.path = d.path', []
+        if stage is not None:
+            sql += ' WHERE d.stage = ?'
+            params.append(stage)
+        rows = self.conn.execute(sql + ' ORDER BY d.name', params)
+        return [self.path(row['path']) for row in rows]
+
+    # -------------------------------------------------------------------------
+    # Reconciliation
+    # -------------------------------------------------------------------------
+
+    def sync_stage(self, stage, force=False, check_files=False):
+        """
+        Reconcile one stage directory with the catalog.
+
+        Skipped entirely when the directory mtime is unchanged since the last
+        sync, unless check_files is set (a file edited in place leaves the
+        directory mtime alone). Otherwise lists the directory once and
+        re-parses frontmatter only for files that are new or whose content
+        hash changed (e.g. written by the LLM subagents rather than these
+        scripts). Returns the number of documents re-parsed.
+        """
+        stage_dir = self.project_dir / stage
+        if not stage_dir.is_dir():
+            return 0
+
+        dir_mtime = stage_dir.stat().st_mtime_ns
+        row = self.conn.execute('SELECT dir_mtime FROM stage_sync WHERE stage = ?', (stage,)).fetchone()
+        if row and row['dir_mtime'] == dir_mtime and not (force or check_files):
+            return 0
+
+        known = {
+            r['path']: (r['mtime'], r['size'])
+            for r in self.conn.execute('SELECT path, mtime, size FROM documents WHERE stage = ?', (stage,))
+        }
+
+        reparsed = 0
+        seen = set()
+        with os.scandir(stage_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.md') or not entry.is_file():
+                    continue
+                key = f"{stage}/{entry.name}"
+                seen.add(key)
+                stat = entry.stat()
+                if not force and known.get(key) == (stat.st_mtime, stat.st_size):
+                    continue
+
+                # Touched but identical content keeps its state; only refresh the stat
+                digest = hash_file(entry.path)
+                if key in known and not force and self.get(key)['content_hash'] == digest:
+                    self.conn.execute(
+                        'UPDATE documents SET mtime = ?, size = ? WHERE path = ?',
+                        (stat.st_mtime, stat.st_size, key),
+                    )
+                    continue
+
+                frontmatter = read_header(Path(entry.path), stat=stat) or {}
+                fields = {}
+                if stage == 'extractions':
+                    # A rewritten extraction is new content and needs organizing again
+                    fields['status'] = 'organized' if frontmatter.get('organized') else 'pending'
+                self.record(key, stage, frontmatter, stat=stat, content_hash=digest, **fields)
+                reparsed += 1
+
+        for key in known.keys() - seen:
+            self.remove(key)
+
+        self.conn.execute(
+            'INSERT OR REPLACE INTO stage_sync (stage, dir_mtime) VALUES (?, ?)', (stage, dir_mtime)
+        )
+        self.conn.commit()
+        return reparsed
+
+    def sync(self, force=False):
+        """Reconcile every stage directory."""
+        return {stage: self.sync_stage(stage, force=force) for stage in STAGES}
+
+
+def materialize_state(catalog, stage):
+    """Write sidecar pipeline state back into the frontmatter of a stage's documents."""
+    written = 0
+    for doc_path in catalog.documents(stage):
+        state = catalog.get_state(doc_path)
+        frontmatter, body = read_frontmatter(doc_path)
+        if not isinstance(frontmatter, dict) or not state:
+            continue
+        if all(frontmatter.get(k) == v for k, v in state.items()):
+            continue
+        frontmatter.update(state)
+        write_frontmatter(doc_path, frontmatter, body)
+        catalog.touch(doc_path)
+        written += 1
+    return written
+
+
+def open_catalog(project_dir, stages=()):
+    """Open the project catalog and reconcile the given stages."""
+    catalog = DocumentCatalog(project_dir)
+    for stage in stages:
+        catalog.sync_stage(stage)
+    return catalog
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 document_catalog.py <project_dir> [--rebuild | --materialize]")
+        sys.exit(1)
+
+    project_dir = Path(sys.argv[1]).expanduser()
+    rebuild = '--rebuild' in sys.argv[2:]
+    materialize = '--materialize' in sys.argv[2:]
+
+    if not project_dir.exists():
+        print(f"Error: {project_dir} not found")
+        sys.exit(1)
+
+    start = datetime.now()
+    with DocumentCatalog(project_dir) as catalog:
+        reparsed = catalog.sync(force=rebuild)
+
+        print(f"\nDocument Catalog")
+        print(f"================")
+        print(f"Catalog: {catalog.db_path}\n")
+
+        print("| Stage | Documents | Re-parsed |")
+        print("|-------|-----------|-----------|")
+        for stage in STAGES:
+            print(f"| {stage} | {catalog.count(stage)} | {reparsed[stage]} |")
+
+        print(f"\nPending in to-process/: {catalog.count('to-process', 'pending')}")
+        print(f"Extractions awaiting organize: {catalog.count('extractions', 'pending')}")
+
+        if materialize:
+            written = sum(materialize_state(catalog, stage) for stage in STAGES)
+            print(f"Frontmatter updated from catalog state: {written} documents")
+
+    elapsed = (datetime.now() - start).total_seconds()
+    print(f"\nSynced in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
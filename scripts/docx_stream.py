@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Read the body of a .docx straight from its XML, without python-docx.
+
+The main document part is parsed with lxml's iterparse, one top-level
+paragraph or table at a time; each is turned into a block and cleared, so
+memory stays flat however long the document is. Paragraph styles are
+resolved from the styles part, which is read once.
+
+Blocks follow python-docx's reading of a document, so docx_to_markdown
+renders the same markdown from either: only a paragraph's direct runs are
+body text, table cells also include hyperlink text, and merged cells repeat
+for every grid column and row they span. Documents this reader cannot
+follow raise UnsupportedDocument and are left to python-docx.
+"""
+
+import posixpath
+import zipfile
+
+from lxml import etree
+
+
+W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+
+def _w(tag):
+    return f'{{{W}}}{tag}'
+
+
+BODY, P, TBL, TR, TC, R, HYPERLINK = (_w(tag) for tag in ('body', 'p', 'tbl', 'tr', 'tc', 'r', 'hyperlink'))
+PPR, PSTYLE, NUMPR, ILVL = (_w(tag) for tag in ('pPr', 'pStyle', 'numPr', 'ilvl'))
+RPR, BOLD, ITALIC, STRIKE = (_w(tag) for tag in ('rPr', 'b', 'i', 'strike'))
+T, TAB, PTAB, BR, CR, NO_BREAK_HYPHEN = (_w(tag) for tag in ('t', 'tab', 'ptab', 'br', 'cr', 'noBreakHyphen'))
+TRPR, GRID_BEFORE, TCPR, GRID_SPAN, VMERGE = (_w(tag) for tag in ('trPr', 'gridBefore', 'tcPr', 'gridSpan', 'vMerge'))
+VAL, TYPE = _w('val'), _w('type')
+
+PACKAGE_RELS = '_rels/.rels'
+RELATIONSHIP = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+
+# Block kinds, shared with docx_to_markdown
+PARAGRAPH, TABLE = 'paragraph', 'table'
+
+# The options python-docx parses parts with
+PARSE_OPTIONS = {'remove_blank_text': True, 'resolve_entities': False}
+
+
+class UnsupportedDocument(Exception):
+    """The document needs python-docx's full object model."""
+
+
+def _on_off(element, attribute=VAL):
+    """Value of an ST_OnOff property element: None when absent, True when it has no value."""
+    if element is None:
+        return None
+    value = element.get(attribute)
+    if value is None or value in ('1', 'true', 'on'):
+        return True
+    if value in ('0', 'false', 'off'):
+        return False
+    raise UnsupportedDocument(f"invalid on/off value {value!r}")
+
+
+def _int_val(element, default):
+    return int(element.get(VAL)) if element is not None and element.get(VAL) is not None else default
+
+
+def _relationships(archive, rels_path, base_dir):
+    """{relationship type suffix: part path} from a .rels part; internal targets only."""
+    try:
+        root = etree.fromstring(archive.read(rels_path), etree.XMLParser(**PARSE_OPTIONS))
+    except KeyError:
+        return {}
+
+    targets = {}
+    for rel in root.iter(RELATIONSHIP):
+        if rel.get('TargetMode') == 'External':
+            continue
+        target = rel.get('Target', '')
+        path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join(base_dir, target))
+        targets.setdefault(rel.get('Type', '').rsplit('/', 1)[-1], path)
+    return targets
+
+
+def _part_paths(archive):
+    """Paths of the main document part and its styles part."""
+    document = _relationships(archive, PACKAGE_RELS, '').get('officeDocument')
+    if not document:
+        raise UnsupportedDocument("no main document part")
+
+    directory, name = posixpath.split(document)
+    styles = _relationships(archive, posixpath.join(directory, '_rels', f'{name}.rels'), directory).get('styles')
+    if not styles or styles not in archive.NameToInfo:
+        # python-docx falls back to its default template styles
+        raise UnsupportedDocument("no styles part")
+    return document, styles
+
+
+def load_style_names(archive, styles_path):
+    """
+    Resolver for paragraph style names from a styles part.
+
+    Returns style_name(style_id) giving the lowercased name of a paragraph
+    style, or of the default paragraph style when the ID is missing, unknown
+    or not a paragraph style.
+    """
+    root = etree.fromstring(archive.read(styles_path), etree.XMLParser(**PARSE_OPTIONS))
+
+    styles = {}
+    default = None
+    for style in root.iterchildren(_w('style')):
+        name = style.find(_w('name'))
+        entry = (style.get(TYPE), (name.get(VAL) or '').lower() if name is not None else '')
+        styles.setdefault(style.get(_w('styleId')), entry)
+        if entry[0] == 'paragraph' and _on_off(style, _w('default')):
+            default = entry
+
+    def style_name(style_id):
+        style = styles.get(style_id) if style_id else None
+        if style is None or style[0] != 'paragraph':
+            style = default
+        return style[1] if style else ''
+
+    return style_name
+
+
+def _run_text(run):
+    """Text of a w:r element, with tabs and line breaks as characters."""
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == T:
+            parts.append(child.text or '')
+        elif tag == TAB or tag == PTAB:
+            parts.append('\t')
+        elif tag == BR:
+            parts.append('\n' if child.get(TYPE, 'textWrapping') == 'textWrapping' else '')
+        elif tag == CR:
+            parts.append('\n')
+        elif tag == NO_BREAK_HYPHEN:
+            parts.append('-')
+    return ''.join(parts)
+
+
+def _paragraph_block(paragraph, style_name):
+    """(PARAGRAPH, runs, style name, numbering level) for a w:p element."""
+    runs = []
+    properties = None
+
+    for child in paragraph:
+        if child.tag == R:
+            rpr = child.find(RPR)
+            if rpr is None:
+                runs.append((_run_text(child), None, None, None))
+            else:
+                runs.append((_run_text(child), _on_off(rpr.find(BOLD)), _on_off(rpr.find(ITALIC)),
+                             _on_off(rpr.find(STRIKE))))
+        elif child.tag == PPR and properties is None:
+            properties = child
+
+    style_id, level = None, None
+    if properties is not None:
+        pstyle = properties.find(PSTYLE)
+        style_id = pstyle.get(VAL) if pstyle is not None else None
+        numpr = properties.find(NUMPR)
+        if numpr is not None:
+            level = _int_val(numpr.find(ILVL), 0)
+
+    return PARAGRAPH, runs, style_name(style_id), level
+
+
+def _paragraph_text(paragraph):
+    """Plain text of a w:p element, including hyperlink text."""
+    parts = []
+    for child in paragraph:
+        if child.tag == R:
+            parts.append(_run_text(child))
+        elif child.tag == HYPERLINK:
+            parts.extend(_run_text(run) for run in child.iterchildren(R))
+    return ''.join(parts)
+
+
+def _table_block(table):
+    """(TABLE, rows): each row a list of cells, each cell the texts of its paragraphs."""
+    rows = []
+    above = None  # grid offset -> (cell, grid span) of the row above
+
+    for row in table.iterchildren(TR):
+        trpr = row.find(TRPR)
+        offset = _int_val(trpr.find(GRID_BEFORE), 0) if trpr is not None else 0
+        cells, by_offset = [], {}
+
+        for tc in row.iterchildren(TC):
+            tcpr = tc.find(TCPR)
+            span = _int_val(tcpr.find(GRID_SPAN), 1) if tcpr is not None else 1
+            vmerge = tcpr.find(VMERGE) if tcpr is not None else None
+
+            if vmerge is not None and vmerge.get(VAL, 'continue') == 'continue':
+                # Continues the cell above: repeat its content
+                if above is None or offset not in above:
+                    raise UnsupportedDocument("merged cell without a cell above")
+                cell = above[offset]
+            else:
+                cell = ([_paragraph_text(p) for p in tc.iterchildren(P)], span)
+
+            cells.extend([cell[0]] * cell[1])
+            by_offset[offset] = cell
+            offset += span
+
+        rows.append(cells)
+        above = by_offset
+
+    return TABLE, rows
+
+
+def stream_docx_blocks(docx_path):
+    """
+    Yield the top-level blocks of a .docx body in order:
+    (PARAGRAPH, runs, style name, numbering level) with runs as
+    (text, bold, italic, strike) tuples and level None outside numbering,
+    or (TABLE, rows).
+    """
+    with zipfile.ZipFile(docx_path) as archive:
+        document_path, styles_path = _part_paths(archive)
+        style_name = load_style_names(archive, styles_path)
+
+        with archive.open(document_path) as stream:
+            for _, element in etree.iterparse(stream, events=('end',), tag=(P, TBL), **PARSE_OPTIONS):
+                parent = element.getparent()
+                if parent is None or parent.tag != BODY:
+                    continue  # nested in a table or content control; read with it
+
+                if element.tag == P:
+                    yield _paragraph_block(element, style_name)
+                else:
+                    yield _table_block(element)
+
+                # Drop everything read so far
+                element.clear()
+                while element.getprevious() is not None:
+                    del parent[0]
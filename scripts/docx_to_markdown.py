@@ -2,30 +2,81 @@
 """
 Convert .docx files to Markdown format.
 
+Documents are read by streaming their XML (docx_stream.py, needs lxml) and
+fall back to python-docx for documents the streaming reader does not
+support. Both readers yield the same blocks, rendered by the same code.
+
+Converted markdown can be kept in a content-addressed cache, keyed by the
+.docx file's SHA-256 and CONVERTER_VERSION, so a file already converted is
+never converted again.
+
 Usage:
     python3 docx_to_markdown.py input.docx [output.md]
-
-If output.md is not specified, outputs to stdout.
+    python3 docx_to_markdown.py --batch <dir_or_glob> [output_dir] [--workers N] [--cache DIR] [--no-cache]
+    python3 docx_to_markdown.py --benchmark [paragraphs ...]
+
+If output.md is not specified, outputs to stdout. --batch converts every
+.docx under a directory (or matching a glob) in a process pool, writing each
+next to its input or under output_dir, and reports per-file times and the
+cache hit rate. --benchmark converts generated documents of increasing
+length with each reader and prints the time per paragraph, which stays flat
+as documents grow.
 """
 
 import sys
 import os
+import glob
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from document_catalog import hash_file
+
 try:
     from docx import Document
     from docx.shared import Pt
     from docx.enum.text import WD_ALIGN_PARAGRAPH
     from docx.enum.style import WD_STYLE_TYPE
 except ImportError:
+    Document = None
+
+try:
+    from docx_stream import PARAGRAPH, TABLE, UnsupportedDocument, stream_docx_blocks
+except ImportError:
+    PARAGRAPH, TABLE = 'paragraph', 'table'
+    stream_docx_blocks = None
+
+if Document is None and stream_docx_blocks is None:
     print("Error: python-docx is required. Install with: pip install python-docx", file=sys.stderr)
     sys.exit(1)
 
+# Part of every cache key: bump it when a converter change alters the markdown
+CONVERTER_VERSION = 1
 
-def get_heading_level(paragraph):
-    """Determine if paragraph is a heading and what level."""
-    style_name = paragraph.style.name.lower() if paragraph.style else ""
+DEFAULT_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', '~/.cache')).expanduser() / 'docx-to-markdown'
 
+
+def paragraph_style_name(paragraph, style_names=None):
+    """
+    Lowercased style name of a paragraph.
+
+    style_names is a per-document cache of names by style ID, so each style
+    is resolved through the document's styles part only once.
+    """
+    if style_names is None:
+        return paragraph.style.name.lower() if paragraph.style else ""
+
+    style_id = paragraph._p.style
+    if style_id not in style_names:
+        style = paragraph.style
+        style_names[style_id] = style.name.lower() if style else ""
+    return style_names[style_id]
+
+
+def heading_level_for_style(style_name):
+    """Heading level (1-6) for a lowercased paragraph style name, 0 if not a heading."""
     # Check for heading styles
     if 'heading' in style_name:
         # Extract number from "Heading 1", "Heading 2", etc.
@@ -44,86 +95,88 @@ def get_heading_level(paragraph):
     return 0
 
 
-def is_list_paragraph(paragraph):
-    """Check if paragraph is a list item."""
-    # Check style name
-    style_name = paragraph.style.name.lower() if paragraph.style else ""
-    if 'list' in style_name:
-        return True
+def get_heading_level(paragraph, style_names=None):
+    """Determine if paragraph is a heading and what level."""
+    return heading_level_for_style(paragraph_style_name(paragraph, style_names))
+
+
+def numbering_level(paragraph):
+    """The paragraph's numbering level (w:ilvl), or None if it is not numbered."""
+    pPr = paragraph._element.pPr
+    if pPr is None or pPr.numPr is None:
+        return None
+    ilvl = pPr.numPr.ilvl
+    return int(ilvl.val) if ilvl is not None else 0
 
-    # Check for numbering
-    if paragraph._element.pPr is not None:
-        numPr = paragraph._element.pPr.numPr
-        if numPr is not None:
-            return True
 
-    return False
+def is_list_style(style_name, level):
+    """Whether a paragraph with this style name and numbering level is a list item."""
+    return 'list' in style_name or level is not None
+
+
+def is_list_paragraph(paragraph, style_names=None):
+    """Check if paragraph is a list item."""
+    return is_list_style(paragraph_style_name(paragraph, style_names), numbering_level(paragraph))
 
 
 def get_list_level(paragraph):
     """Get the indentation level of a list item."""
-    if paragraph._element.pPr is not None:
-        numPr = paragraph._element.pPr.numPr
-        if numPr is not None:
-            ilvl = numPr.ilvl
-            if ilvl is not None:
-                return int(ilvl.val)
-    return 0
+    return numbering_level(paragraph) or 0
 
 
-def is_numbered_list(paragraph):
+def is_numbered_list(paragraph, style_names=None):
     """Check if paragraph is a numbered list item."""
-    style_name = paragraph.style.name.lower() if paragraph.style else ""
+    style_name = paragraph_style_name(paragraph, style_names)
     return 'number' in style_name or 'ordered' in style_name
 
 
-def format_run(run):
-    """Format a run with appropriate markdown."""
-    text = run.text
+def format_text(text, bold=None, italic=None, strike=None):
+    """Format run text with markdown emphasis."""
     if not text:
         return ""
 
     # Apply formatting
-    if run.bold and run.italic:
+    if bold and italic:
         text = f"***{text}***"
-    elif run.bold:
+    elif bold:
         text = f"**{text}**"
-    elif run.italic:
+    elif italic:
         text = f"*{text}*"
 
     # Underline is not standard markdown, skip
     # Strikethrough
-    if run.font.strike:
+    if strike:
         text = f"~~{text}~~"
 
     return text
 
 
-def paragraph_to_markdown(paragraph, list_counters=None):
-    """Convert a paragraph to markdown."""
-    if list_counters is None:
-        list_counters = {}
+def format_run(run):
+    """Format a run with appropriate markdown."""
+    return format_text(run.text, run.bold, run.italic, run.font.strike)
+
 
-    # Get text with formatting
-    text_parts = []
-    for run in paragraph.runs:
-        text_parts.append(format_run(run))
-    text = "".join(text_parts).strip()
+def format_paragraph(runs, style_name, level, list_counters):
+    """
+    Markdown for a paragraph given as (text, bold, italic, strike) runs, its
+    lowercased style name and numbering level (None when not numbered).
+    """
+    text = "".join(format_text(*run) for run in runs).strip()
 
     if not text:
         return ""
 
     # Check for heading
-    heading_level = get_heading_level(paragraph)
+    heading_level = heading_level_for_style(style_name)
     if heading_level > 0:
         return "#" * heading_level + " " + text
 
     # Check for list
-    if is_list_paragraph(paragraph):
-        level = get_list_level(paragraph)
+    if is_list_style(style_name, level):
+        level = level or 0
         indent = "  " * level
 
-        if is_numbered_list(paragraph):
+        if 'number' in style_name or 'ordered' in style_name:
             # Track numbered list counters per level
             if level not in list_counters:
                 list_counters[level] = 0
@@ -140,18 +193,30 @@ def paragraph_to_markdown(paragraph, list_counters=None):
     return text
 
 
-def table_to_markdown(table):
-    """Convert a table to markdown."""
-    if not table.rows:
+def _runs(paragraph):
+    return [(run.text, run.bold, run.italic, run.font.strike) for run in paragraph.runs]
+
+
+def paragraph_to_markdown(paragraph, list_counters=None, style_names=None):
+    """Convert a paragraph to markdown."""
+    if list_counters is None:
+        list_counters = {}
+    return format_paragraph(_runs(paragraph), paragraph_style_name(paragraph, style_names),
+                            numbering_level(paragraph), list_counters)
+
+
+def rows_to_markdown(rows):
+    """Convert table rows (lists of cells, each a list of paragraph texts) to markdown."""
+    if not rows:
         return ""
 
     markdown_rows = []
 
-    for i, row in enumerate(table.rows):
+    for i, row in enumerate(rows):
         cells = []
-        for cell in row.cells:
+        for paragraphs in row:
             # Get cell text (may span multiple paragraphs)
-            cell_text = " ".join(p.text.strip() for p in cell.paragraphs if p.text.strip())
+            cell_text = " ".join(text.strip() for text in paragraphs if text.strip())
             # Escape pipe characters
             cell_text = cell_text.replace("|", "\\|")
             cells.append(cell_text)
@@ -166,47 +231,68 @@ def table_to_markdown(table):
     return "\n".join(markdown_rows)
 
 
-def convert_docx_to_markdown(docx_path):
-    """Convert a .docx file to markdown string."""
-    doc = Document(docx_path)
+def _rows(table):
+    return [[[p.text for p in cell.paragraphs] for cell in row.cells] for row in table.rows]
+
+
+def table_to_markdown(table):
+    """Convert a table to markdown."""
+    return rows_to_markdown(_rows(table))
+
 
+def document_blocks(doc):
+    """Yield the body blocks of a python-docx Document, in the form docx_stream yields them."""
+    style_names = {}
+
+    # Map body elements to their wrapper objects once (doc.paragraphs and
+    # doc.tables build a new list on every access)
+    paragraphs = {para._element: para for para in doc.paragraphs}
+    tables = {table._element: table for table in doc.tables}
+
+    for element in doc.element.body:
+        para = paragraphs.get(element)
+        if para is not None:
+            yield PARAGRAPH, _runs(para), paragraph_style_name(para, style_names), numbering_level(para)
+            continue
+
+        table = tables.get(element)
+        if table is not None:
+            yield TABLE, _rows(table)
+
+
+def blocks_to_markdown(blocks):
+    """Render a document's body blocks as markdown."""
     markdown_parts = []
     list_counters = {}
     prev_was_list = False
 
-    for element in doc.element.body:
+    for block in blocks:
         # Handle paragraphs
-        if element.tag.endswith('p'):
-            # Find the corresponding paragraph object
-            for para in doc.paragraphs:
-                if para._element == element:
-                    md = paragraph_to_markdown(para, list_counters)
-
-                    # Track list state for proper spacing
-                    is_list = is_list_paragraph(para)
-                    if not is_list and prev_was_list:
-                        # Reset list counters when exiting list
-                        list_counters = {}
-                    prev_was_list = is_list
-
-                    if md:
-                        markdown_parts.append(md)
-                    elif markdown_parts and markdown_parts[-1] != "":
-                        # Add blank line for empty paragraphs (but not multiple)
-                        markdown_parts.append("")
-                    break
+        if block[0] == PARAGRAPH:
+            _, runs, style_name, level = block
+            md = format_paragraph(runs, style_name, level, list_counters)
+
+            # Track list state for proper spacing
+            is_list = is_list_style(style_name, level)
+            if not is_list and prev_was_list:
+                # Reset list counters when exiting list
+                list_counters = {}
+            prev_was_list = is_list
+
+            if md:
+                markdown_parts.append(md)
+            elif markdown_parts and markdown_parts[-1] != "":
+                # Add blank line for empty paragraphs (but not multiple)
+                markdown_parts.append("")
 
         # Handle tables
-        elif element.tag.endswith('tbl'):
-            for table in doc.tables:
-                if table._element == element:
-                    md = table_to_markdown(table)
-                    if md:
-                        if markdown_parts and markdown_parts[-1] != "":
-                            markdown_parts.append("")
-                        markdown_parts.append(md)
-                        markdown_parts.append("")
-                    break
+        else:
+            md = rows_to_markdown(block[1])
+            if md:
+                if markdown_parts and markdown_parts[-1] != "":
+                    markdown_parts.append("")
+                markdown_parts.append(md)
+                markdown_parts.append("")
 
     # Clean up multiple blank lines
     result = []
@@ -227,11 +313,198 @@ def convert_docx_to_markdown(docx_path):
     return "\n\n".join(line if line else "" for line in result)
 
 
+def convert_docx_to_markdown(docx_path, streaming=True):
+    """Convert a .docx file to markdown string."""
+    if streaming and stream_docx_blocks is not None:
+        try:
+            return blocks_to_markdown(stream_docx_blocks(docx_path))
+        except UnsupportedDocument:
+            pass
+
+    if Document is None:
+        raise RuntimeError("python-docx is required for this document. Install with: pip install python-docx")
+    return blocks_to_markdown(document_blocks(Document(docx_path)))
+
+
+def cache_path(cache_dir, digest):
+    """Where the markdown of a .docx with this SHA-256 is cached."""
+    return Path(cache_dir) / digest[:2] / f"{digest}-v{CONVERTER_VERSION}.md"
+
+
+def convert_cached(docx_path, cache_dir, digest=None):
+    """
+    Convert a .docx file through the markdown cache in cache_dir.
+
+    digest is the file's SHA-256 when the caller already has it. Returns
+    (markdown, hit), hit telling whether the markdown came from the cache.
+    """
+    path = cache_path(cache_dir, digest or hash_file(docx_path))
+    try:
+        with open(path, encoding='utf-8', newline='') as f:
+            return f.read(), True
+    except FileNotFoundError:
+        pass
+
+    markdown = convert_docx_to_markdown(docx_path)
+
+    # Written under a temporary name and renamed, so concurrent runs never read a partial entry
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='', dir=path.parent,
+                                     suffix='.tmp', delete=False) as f:
+        f.write(markdown)
+    os.replace(f.name, path)
+    return markdown, False
+
+
+def find_docx_files(target):
+    """The .docx files under a directory or matching a glob, without Word's ~$ lock files."""
+    path = Path(target).expanduser()
+    candidates = path.rglob('*') if path.is_dir() else (Path(p) for p in glob.glob(str(path), recursive=True))
+    return sorted(p for p in candidates
+                  if p.suffix.lower() == '.docx' and not p.name.startswith('~$') and p.is_file())
+
+
+def _convert_job(job):
+    """Convert one file of a batch; runs in worker processes."""
+    docx_path, output_path, cache_dir = job
+    start = time.perf_counter()
+    hit, error = False, None
+    try:
+        if cache_dir:
+            markdown, hit = convert_cached(docx_path, cache_dir)
+        else:
+            markdown = convert_docx_to_markdown(docx_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(markdown, encoding='utf-8')
+    except Exception as e:
+        error = str(e) or type(e).__name__
+    return time.perf_counter() - start, hit, error
+
+
+def convert_batch(jobs, workers=1):
+    """
+    Convert (docx_path, output_path, cache_dir) jobs, printing a row per file in job order.
+
+    Returns (seconds, cache hit, error) per job.
+    """
+    print("| File | Seconds | Cache |")
+    print("|------|---------|-------|")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for (docx_path, _, cache_dir), result in zip(jobs, pool.map(_convert_job, jobs)):
+            seconds, hit, error = result
+            status = f"error: {error}" if error else ('hit' if hit else ('miss' if cache_dir else '-'))
+            print(f"| {docx_path} | {seconds:.3f} | {status} |")
+            results.append(result)
+    return results
+
+
+def batch(target, output_dir=None, workers=None, cache_dir=DEFAULT_CACHE_DIR):
+    """Convert every .docx under target and print per-file times and the cache hit rate."""
+    files = find_docx_files(target)
+    if not files:
+        print(f"No .docx files found: {target}")
+        return
+
+    # Outputs keep their place relative to the searched directory
+    base = Path(target).expanduser()
+    if not base.is_dir():
+        base = Path(os.path.commonpath([path.parent for path in files]))
+
+    jobs = [(path, (Path(output_dir) / path.relative_to(base) if output_dir else path).with_suffix('.md'), cache_dir)
+            for path in files]
+    workers = workers or os.cpu_count() or 1
+    print(f"Converting {len(files)} files with {workers} workers"
+          + (f", cache: {cache_dir}" if cache_dir else "") + "\n")
+
+    start = time.perf_counter()
+    results = convert_batch(jobs, workers)
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for _, _, error in results if error)
+    hits = sum(1 for _, hit, _ in results if hit)
+    print(f"\nConverted: {len(results) - failed} files" + (f" ({failed} failed)" if failed else ""))
+    if cache_dir:
+        print(f"Cache hits: {hits}/{len(results)} ({hits / len(results):.0%})")
+    print(f"Time: {elapsed:.2f}s ({sum(seconds for seconds, _, _ in results):.2f}s converting)")
+    if failed:
+        sys.exit(1)
+
+
+def build_sample_document(path, paragraphs):
+    """Write a .docx of about the given number of paragraphs: headings, lists, formatting and tables."""
+    doc = Document()
+    for i in range(paragraphs):
+        if i % 40 == 0:
+            doc.add_heading(f"Section {i // 40 + 1}", level=1 + (i // 40) % 3)
+        elif i % 40 == 39:
+            table = doc.add_table(rows=4, cols=3)
+            for r, row in enumerate(table.rows):
+                for c, cell in enumerate(row.cells):
+                    cell.text = f"cell {r}.{c}"
+        elif i % 10 < 3:
+            doc.add_paragraph(f"Item {i} of the plan", style='List Bullet' if i % 20 < 10 else 'List Number')
+        else:
+            para = doc.add_paragraph(f"Paragraph {i} describes the design. ")
+            para.add_run("Important detail").bold = True
+            para.add_run(" and an ")
+            para.add_run("aside").italic = True
+    doc.save(path)
+
+
+def benchmark(sizes):
+    """Convert generated documents of each size with each reader and print time per paragraph."""
+    readers = [('python-docx', False)] if stream_docx_blocks is None else [('streaming', True), ('python-docx', False)]
+    print(f"{'paragraphs':>10}" + ''.join(f"  {name + ' s':>14}  {'us/paragraph':>12}" for name, _ in readers))
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = Path(tmp) / f"sample-{size}.docx"
+            build_sample_document(path, size)
+            line = f"{size:>10}"
+            for _, streaming in readers:
+                start = time.perf_counter()
+                convert_docx_to_markdown(path, streaming=streaming)
+                elapsed = time.perf_counter() - start
+                line += f"  {elapsed:>14.3f}  {elapsed / size * 1e6:>12.1f}"
+            print(line)
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python3 docx_to_markdown.py input.docx [output.md]", file=sys.stderr)
         sys.exit(1)
 
+    if sys.argv[1] == '--benchmark':
+        benchmark([int(size) for size in sys.argv[2:]] or [500, 1000, 2000, 4000, 8000])
+        return
+
+    if sys.argv[1] == '--batch':
+        args = []
+        workers = None
+        cache_dir = DEFAULT_CACHE_DIR
+        argv = iter(sys.argv[2:])
+        for arg in argv:
+            if arg == '--workers':
+                workers = int(next(argv, '1'))
+            elif arg.startswith('--workers='):
+                workers = int(arg.split('=', 1)[1])
+            elif arg == '--cache':
+                cache_dir = Path(next(argv)).expanduser()
+            elif arg.startswith('--cache='):
+                cache_dir = Path(arg.split('=', 1)[1]).expanduser()
+            elif arg == '--no-cache':
+                cache_dir = None
+            elif not arg.startswith('--'):
+                args.append(arg)
+
+        if not args:
+            print("Usage: python3 docx_to_markdown.py --batch <dir_or_glob> [output_dir] "
+                  "[--workers N] [--cache DIR] [--no-cache]", file=sys.stderr)
+            sys.exit(1)
+        batch(args[0], args[1] if len(args) > 1 else None, workers, cache_dir)
+        return
+
     input_path = Path(sys.argv[1])
 
     if not input_path.exists():
@@ -34,6 +34,9 @@ except ImportError:
     print("Error: PyYAML is required. Install with: pip install PyYAML")
     sys.exit(1)
 
+sys.path.insert(0, str(Path(__file__).parent))
+from frontmatter_io import parse_frontmatter
+
 try:
     import markdown
     from markdown.extensions.tables import TableExtension
@@ -705,16 +708,10 @@ class KnowledgeFile:
         text = self.path.read_text(encoding='utf-8')
 
         # Parse YAML frontmatter
-        if text.startswith('---'):
-            parts = text.split('---', 2)
-            if len(parts) >= 3:
-                try:
-                    self.frontmatter = yaml.safe_load(parts[1]) or {}
-                    self.content = parts[2].strip()
-                except yaml.YAMLError:
-                    self.content = text
-            else:
-                self.content = text
+        frontmatter, body = parse_frontmatter(text)
+        if frontmatter is not None:
+            self.frontmatter = frontmatter if isinstance(frontmatter, dict) else {}
+            self.content = body.strip()
         else:
             self.content = text
 
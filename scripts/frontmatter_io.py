@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Shared YAML frontmatter reading and writing for pipeline documents.
+
+read_header() streams a file only up to the closing '---' delimiter, so
+metadata-only scans never read multi-megabyte transcript bodies, and caches
+the parsed header keyed by (inode, mtime, size). Parsing uses libyaml's C
+loader when PyYAML was built with it.
+"""
+
+import copy
+import re
+import yaml
+
+
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Give up looking for the closing delimiter after this many header bytes
+MAX_HEADER_BYTES = 1024 * 1024
+
+_header_cache = {}
+
+
+def load_yaml(text):
+    """Parse a YAML document with the fastest available safe loader."""
+    return yaml.load(text, Loader=SafeLoader)
+
+
+def split_frontmatter(content):
+    """
+    Split markdown text into (frontmatter_text, body); frontmatter_text is None if absent.
+
+    The closing '---' may end the text without a newline after it.
+    """
+    if not content.startswith('---'):
+        return None, content
+
+    end_match = re.search(r'\n---(?:\n|$)', content[3:])
+    if not end_match:
+        return None, content
+
+    return content[3:end_match.start() + 3], content[end_match.end() + 3:]
+
+
+def parse_frontmatter(content):
+    """
+    Parse markdown text into (frontmatter, body); frontmatter is None if absent
+    or invalid, and {} if empty ('---' directly followed by '---').
+    """
+    frontmatter_text, body = split_frontmatter(content)
+    if frontmatter_text is None:
+        return None, content
+
+    try:
+        frontmatter = load_yaml(frontmatter_text)
+    except yaml.YAMLError:
+        return None, content
+    return ({} if frontmatter is None else frontmatter), body
+
+
+def read_frontmatter(file_path):
+    """Extract YAML frontmatter and body from markdown file."""
+    content = file_path.read_text(encoding='utf-8')
+    return parse_frontmatter(content)
+
+
+def write_frontmatter(file_path, frontmatter, body):
+    """Write markdown file with YAML frontmatter."""
+    frontmatter_text = yaml.dump(frontmatter, default_flow_style=False, sort_keys=False)
+    content = f"---\n{frontmatter_text}---\n\n{body}"
+    file_path.write_text(content, encoding='utf-8')
+
+
+def _read_header_text(file_path):
+    """Read the raw frontmatter text, stopping at the closing delimiter."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        first = f.readline()
+        if not first.startswith('---'):
+            return None
+
+        lines = [first[3:]]
+        consumed = len(first)
+        for line in f:
+            if line in ('---\n', '---'):
+                return ''.join(lines)
+            lines.append(line)
+            consumed += len(line)
+            if consumed > MAX_HEADER_BYTES:
+                return None
+
+    return None
+
+
+def read_header(file_path, stat=None):
+    """
+    Return a document's parsed frontmatter dict without reading its body.
+
+    Returns None when the file has no (valid) frontmatter. Results are cached
+    per path and reused while the file's inode, mtime and size are unchanged;
+    callers get their own copy and may modify it.
+    """
+    path_key = str(file_path)
+    try:
+        stat = stat or file_path.stat()
+    except OSError:
+        _header_cache.pop(path_key, None)
+        return None
+
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cached = _header_cache.get(path_key)
+    if cached and cached[0] == signature:
+        return copy.deepcopy(cached[1])
+
+    try:
+        header_text = _read_header_text(file_path)
+        header = load_yaml(header_text) if header_text is not None else None
+    except (OSError, UnicodeDecodeError, yaml.YAMLError):
+        header = None
+
+    if not isinstance(header, dict):
+        header = None
+
+    _header_cache[path_key] = (signature, header)
+    return copy.deepcopy(header)
+
+
+def clear_header_cache():
+    _header_cache.clear()
@@ -6,190 +6,42 @@ Converts .docx files, detects source type, adds metadata, and moves to to-proces
 
 import sys
 import os
+import json
 import re
 from pathlib import Path
 from datetime import datetime
 import shutil
+import codecs
+import hashlib
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from types import SimpleNamespace
 
 # Import the docx converter
 sys.path.insert(0, str(Path(__file__).parent))
-from docx_to_markdown import convert_docx_to_markdown
-
-
-def detect_source_type(content):
-    """Detect document source type from content patterns."""
-    content_lower = content.lower()
-
-    # Zoom transcript patterns
-    zoom_patterns = [
-        r'\d{2}:\d{2}:\d{2}',  # Timestamps HH:MM:SS
-        r'^\w+\s+\w+:\s',  # Speaker: format
-        'you\'re on mute',
-        'can you hear me',
-        'share my screen',
-        'webvtt'
-    ]
-    zoom_score = sum(1 for pattern in zoom_patterns if re.search(pattern, content_lower, re.MULTILINE))
-
-    # Slack patterns
-    slack_patterns = [
-        r'\d{1,2}:\d{2}\s*[AP]M',  # Time format
-        r'#[\w-]+',  # Channel references
-        r'@[\w-]+',  # User mentions
-        'slack',
-        'replied to a thread',
-        r':\w+:',  # Emoji patterns
-    ]
-    slack_score = sum(1 for pattern in slack_patterns if re.search(pattern, content, re.MULTILINE))
-
-    # JIRA patterns
-    jira_patterns = [
-        r'[A-Z]{2,}-\d+',  # Ticket IDs
-        'summary:',
-        'description:',
-        'acceptance criteria',
-        'story points',
-        'sprint',
-        'in progress',
-        'to do',
-        'done',
-        'blocked'
-    ]
-    jira_score = sum(1 for pattern in jira_patterns if re.search(pattern, content_lower, re.MULTILINE))
-
-    # Email patterns
-    email_patterns = [
-        r'^from:',
-        r'^to:',
-        r'^subject:',
-        r'^date:',
-        r'^sent:',
-        r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b',  # Email addresses
-        r'^re:',
-        r'^fwd:',
-        'best regards',
-        'sincerely',
-    ]
-    email_score = sum(1 for pattern in email_patterns if re.search(pattern, content_lower, re.MULTILINE))
-
-    # Meeting notes patterns
-    meeting_patterns = [
-        'agenda',
-        'attendees',
-        'minutes',
-        'action items',
-        'meeting notes',
-        'next steps',
-        'decisions',
-        'discussion'
-    ]
-    meeting_score = sum(1 for pattern in meeting_patterns if re.search(pattern, content_lower, re.MULTILINE))
-
-    # Confluence/Wiki patterns
-    wiki_patterns = [
-        'confluence',
-        'table of contents',
-        'wiki',
-        r'^\s*={3,}',  # Wiki-style headers
-        'page information',
-        'space'
-    ]
-    wiki_score = sum(1 for pattern in wiki_patterns if re.search(pattern, content_lower, re.MULTILINE))
-
-    # Determine source type based on scores
-    scores = {
-        'zoom': zoom_score,
-        'slack': slack_score,
-        'jira': jira_score,
-        'email': email_score,
-        'meeting': meeting_score,
-        'wiki': wiki_score
-    }
+from docx_to_markdown import convert_cached, convert_docx_to_markdown
+from date_extraction import extract_date_from_content, extract_date_from_filename
+from document_catalog import DocumentCatalog, hash_bytes, hash_file
+from frontmatter_io import parse_frontmatter
+from source_detectors import detect_source_type, parse_source
+from near_duplicates import band_keys, check_duplicate, fingerprint
+from name_allocator import NameAllocator
+from slack_export import day_members, is_slack_export, load_users, render_channel_day
+from mail_threads import group_threads, hash_eml_directory, index_mailbox, is_eml_directory, is_mailbox, render_thread
+from turn_index import TurnTable
 
-    max_score = max(scores.values())
-    if max_score >= 3:
-        source = max(scores, key=scores.get)
-        confidence = 'high' if max_score >= 5 else 'medium'
-        return source, confidence
-    elif max_score >= 1:
-        source = max(scores, key=scores.get)
-        return source, 'low'
-    else:
-        return 'notes', 'low'
-
-
-def extract_date_from_content(content):
-    """Try to extract a date from document content."""
-    # Common date patterns
-    patterns = [
-        r'\b(\d{4})-(\d{2})-(\d{2})\b',  # YYYY-MM-DD
-        r'\b(\d{1,2})/(\d{1,2})/(\d{4})\b',  # MM/DD/YYYY or DD/MM/YYYY
-        r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+(\d{1,2}),?\s+(\d{4})\b',  # Month DD, YYYY
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
-        if match:
-            try:
-                groups = match.groups()
-                if len(groups) == 3 and groups[0].isdigit() and len(groups[0]) == 4:
-                    # YYYY-MM-DD format
-                    return f"{groups[0]}-{groups[1]}-{groups[2]}"
-                elif len(groups) == 3 and groups[2].isdigit() and len(groups[2]) == 4:
-                    # Month name format
-                    month_map = {
-                        'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04',
-                        'may': '05', 'jun': '06', 'jul': '07', 'aug': '08',
-                        'sep': '09', 'oct': '10', 'nov': '11', 'dec': '12'
-                    }
-                    month = month_map.get(groups[0][:3].lower())
-                    if month:
-                        day = groups[1].zfill(2)
-                        return f"{groups[2]}-{month}-{day}"
-            except:
-                pass
-
-    return None
-
-
-def extract_date_from_filename(filename):
-    """Try to extract a date from filename."""
-    # Look for YYYY-MM-DD pattern
-    match = re.search(r'(\d{4})-(\d{2})-(\d{2})', filename)
-    if match:
-        return f"{match.group(1)}-{match.group(2)}-{match.group(3)}"
-
-    # Look for YYYY-MM-DD at start
-    match = re.match(r'^(\d{4})-(\d{2})-(\d{2})', filename)
-    if match:
-        return f"{match.group(1)}-{match.group(2)}-{match.group(3)}"
-
-    return None
-
-
-def extract_participants(content, source):
-    """Extract participants based on source type."""
-    participants = []
-
-    if source == 'zoom':
-        # Look for speaker patterns
-        matches = re.findall(r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*:', content, re.MULTILINE)
-        participants = list(set(matches))
-
-    elif source == 'slack':
-        # Look for @mentions
-        matches = re.findall(r'@([\w-]+)', content)
-        participants = list(set(matches))
-
-    elif source in ['email', 'meeting']:
-        # Look for From/To/Attendees
-        for line in content.split('\n')[:20]:  # Check first 20 lines
-            if re.match(r'^(from|to|attendees):', line.lower()):
-                # Extract names
-                names = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b', line)
-                participants.extend(names)
-
-    return list(set(participants))[:10]  # Limit to 10
+
+# Text inputs larger than this are streamed into to-process/ instead of read whole
+STREAM_INTAKE_BYTES = 8 * 1024 * 1024
+
+# Streamed inputs are classified, dated and parsed from this much of their start
+HEAD_SAMPLE_BYTES = 1024 * 1024
+
+COPY_CHUNK_CHARS = 1024 * 1024
+
+# Markdown converted from .docx inputs, by content hash, under the project directory
+DOCX_CACHE_DIR = Path('.cache') / 'docx'
 
 
 def generate_short_description(content, filename, source):
@@ -225,17 +77,34 @@ def generate_short_description(content, filename, source):
     return 'document'
 
 
-def process_file(input_path, project_dir):
-    """Process a single file through intake."""
-    print(f"Processing: {input_path.name}")
+def prepare_file(input_path, input_hash=None, docx_cache=None):
+    """
+    Convert and analyze a raw file into the document intake will write.
+
+    Touches neither to-process/ nor the catalog, so it can run in a worker
+    process. A .docx is converted through the markdown cache in docx_cache,
+    when given. Returns None if the file cannot be read or converted.
+    """
+    stream_body = None
 
     # Convert docx to markdown if needed
     if input_path.suffix.lower() == '.docx':
         try:
-            content = convert_docx_to_markdown(input_path)
+            if docx_cache:
+                content, _ = convert_cached(input_path, docx_cache, input_hash)
+            else:
+                content = convert_docx_to_markdown(input_path)
         except Exception as e:
             print(f"  Error converting {input_path.name}: {e}")
             return None
+    elif input_path.stat().st_size > STREAM_INTAKE_BYTES:
+        # Too large to hold in memory: analyze the start, copy the body through when writing
+        try:
+            content = read_head_sample(input_path)
+        except Exception as e:
+            print(f"  Error reading {input_path.name}: {e}")
+            return None
+        stream_body = input_path
     else:
         # Read as text
         try:
@@ -244,18 +113,25 @@ def process_file(input_path, project_dir):
             print(f"  Error reading {input_path.name}: {e}")
             return None
 
-    # Detect source type
+    # Detect source type and parse its structure (speakers, timestamps, participants)
     source, confidence = detect_source_type(content)
+    parsed = parse_source(source, content)
 
     # Extract date
-    doc_date = extract_date_from_filename(input_path.name)
+    doc_date = extract_date_from_filename(input_path.name) or parsed['date']
     if not doc_date:
         doc_date = extract_date_from_content(content)
     if not doc_date:
         doc_date = datetime.fromtimestamp(input_path.stat().st_mtime).strftime('%Y-%m-%d')
 
-    # Extract participants
-    participants = extract_participants(content, source)
+    turns = parsed['turns']
+    if turns is not None and stream_body:
+        # The sample holds only the start of the transcript; index all of it
+        with open(input_path, 'r', encoding='utf-8') as f:
+            turns = TurnTable.parse(f)
+        parsed['participants'] = turns.speakers
+
+    participants = parsed['participants'][:10]  # Limit to 10
 
     # Generate short description
     short_desc = generate_short_description(content, input_path.name, source)
@@ -264,51 +140,538 @@ def process_file(input_path, project_dir):
     new_filename = f"{doc_date}-{source}-{short_desc}.md"
 
     # Create output with frontmatter
-    frontmatter = f"""---
+    frontmatter = format_frontmatter(source, input_path.name, doc_date, participants, confidence, input_hash)
+
+    return {
+        'original': input_path.name,
+        'filename': new_filename,
+        'text': frontmatter if stream_body else f"{frontmatter}{content}\n",
+        'stream_body': stream_body,
+        'source': source,
+        'confidence': confidence,
+        'document_date': doc_date,
+        'participants': participants,
+        'input_hash': input_hash,
+        'fingerprint': fingerprint(content),
+        'turns': turns,
+    }
+
+
+def yaml_string(value):
+    """value as a double-quoted YAML scalar (JSON strings are valid YAML), whatever characters it holds."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def format_frontmatter(source, original, doc_date, participants, confidence, input_hash=None, extra=()):
+    """The frontmatter block intake writes at the top of each document; extra lines go last."""
+    return f"""---
 source: {source}
-original_filename: {input_path.name}
+original_filename: {original}
 intake_date: {datetime.now().strftime('%Y-%m-%d')}
 document_date: {doc_date}
 status: pending
 participants:
-{chr(10).join(f'  - {p}' for p in participants) if participants else '  []'}
+{chr(10).join(f'  - {yaml_string(p)}' for p in participants) if participants else '  []'}
 tags: []
 source_confidence: {confidence}
----
+{f'input_hash: {input_hash}{chr(10)}' if input_hash else ''}{''.join(f'{line}{chr(10)}' for line in extra)}---
 
-{content}
 """
 
+
+# Open Slack export and its user map, kept per process while the archive is intaken
+_slack_export = {}
+
+
+def _open_slack_export(input_path, input_hash):
+    if _slack_export.get('key') != (input_path, input_hash):
+        _close_slack_export()
+        archive = zipfile.ZipFile(input_path)
+        _slack_export.update(key=(input_path, input_hash), archive=archive, users=load_users(archive))
+    return _slack_export['archive'], _slack_export['users']
+
+
+def _close_slack_export():
+    if _slack_export:
+        _slack_export.pop('archive').close()
+        _slack_export.clear()
+
+
+def prepare_slack_day(input_path, input_hash, channel, day, member):
+    """
+    Prepare the document for one channel-day of a Slack export archive.
+
+    Returns a list holding the prepared document (empty for a day without
+    messages), or None if the member cannot be read.
+    """
+    try:
+        archive, users = _open_slack_export(input_path, input_hash)
+        rendered = render_channel_day(archive, member, channel, day, users)
+    except Exception as e:
+        print(f"  Error reading {input_path.name}:{member}: {e}")
+        return None
+
+    if rendered is None:
+        return []
+
+    body, participants = rendered
+    participants = participants[:10]  # Limit to 10
+    short_desc = re.sub(r'[^\w-]', '', channel.lower())[:50] or 'channel'
+    frontmatter = format_frontmatter('slack', input_path.name, day, participants, 'high', input_hash,
+                                     [f'channel: {channel}'])
+
+    return [{
+        'original': input_path.name,
+        'member': member,
+        'filename': f"{day}-slack-{short_desc}.md",
+        'text': f"{frontmatter}{body}",
+        'stream_body': None,
+        'source': 'slack',
+        'confidence': 'high',
+        'document_date': day,
+        'participants': participants,
+        'input_hash': input_hash,
+        'fingerprint': fingerprint(body),
+    }]
+
+
+def _prepare_slack_job(job):
+    return prepare_slack_day(*job)
+
+
+def prepare_slack_export(input_path, input_hash, pool=None):
+    """
+    Yield the prepared document for each channel-day of a Slack export, in
+    channel then date order, or None for a channel-day that failed.
+
+    Members are read straight out of the zip, one channel-day at a time, in
+    the pool's workers when one is given.
+    """
+    with zipfile.ZipFile(input_path) as archive:
+        members = day_members(archive)
+
+    jobs = [(input_path, input_hash, channel, day, member) for channel, day, member in members]
+    days = pool.map(_prepare_slack_job, jobs, chunksize=16) if pool else map(_prepare_slack_job, jobs)
+    try:
+        for documents in days:
+            if documents is None:
+                yield None
+            else:
+                yield from documents
+    finally:
+        _close_slack_export()
+
+
+def prepare_thread(input_path, input_hash, thread):
+    """
+    Prepare the document for one email thread of a mailbox.
+
+    Returns a list holding the prepared document, or None if its messages
+    cannot be read.
+    """
+    try:
+        subject, doc_date, body, participants = render_thread(input_path, thread)
+    except Exception as e:
+        print(f"  Error reading thread {thread[0]['message_id']} of {input_path.name}: {e}")
+        return None
+
+    if not doc_date:
+        doc_date = datetime.fromtimestamp(input_path.stat().st_mtime).strftime('%Y-%m-%d')
+    participants = participants[:10]  # Limit to 10
+    short_desc = '-'.join(re.sub(r'[^\w\s-]', '', subject.lower()).split()[:5])[:50] or 'thread'
+    frontmatter = format_frontmatter('email', input_path.name, doc_date, participants, 'high', input_hash,
+                                     [f"thread_id: {thread[0]['message_id']}", f"message_count: {len(thread)}"])
+
+    return [{
+        'original': input_path.name,
+        'member': thread[0]['message_id'],
+        'filename': f"{doc_date}-email-{short_desc}.md",
+        'text': f"{frontmatter}{body}",
+        'stream_body': None,
+        'source': 'email',
+        'confidence': 'high',
+        'document_date': doc_date,
+        'participants': participants,
+        'input_hash': input_hash,
+        'fingerprint': fingerprint(body),
+    }]
+
+
+def _prepare_thread_job(job):
+    return prepare_thread(*job)
+
+
+def prepare_mailbox(input_path, input_hash, pool=None):
+    """
+    Yield the prepared document for each thread of a mailbox (an mbox file
+    or a directory of .eml files) in order of each thread's first message,
+    or None for a thread that failed.
+
+    The mailbox is read once for its threading headers; each thread's
+    messages are then re-read on their own, in the pool's workers when one
+    is given.
+    """
+    threads = group_threads(index_mailbox(input_path))
+    print(f"  {sum(len(thread) for thread in threads)} messages in {len(threads)} threads")
+
+    jobs = [(input_path, input_hash, thread) for thread in threads]
+    documents = pool.map(_prepare_thread_job, jobs, chunksize=16) if pool else map(_prepare_thread_job, jobs)
+    for thread_documents in documents:
+        if thread_documents is None:
+            yield None
+        else:
+            yield from thread_documents
+
+
+def read_head_sample(input_path, size=HEAD_SAMPLE_BYTES):
+    """Decode the first size bytes of a UTF-8 file, dropping a character cut off at the end."""
+    with open(input_path, 'rb') as f:
+        data = f.read(size)
+
+    text = codecs.getincrementaldecoder('utf-8')().decode(data, final=False)
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+def write_streamed(output_path, frontmatter, body_path):
+    """
+    Write frontmatter followed by the text of body_path, copied in fixed-size chunks.
+
+    Returns the SHA-256 of the written document, computed while copying.
+    """
+    digest = hashlib.sha256()
+
+    with open(body_path, 'r', encoding='utf-8') as src, open(output_path, 'w', encoding='utf-8') as dst:
+        for chunk in chain([frontmatter], iter(lambda: src.read(COPY_CHUNK_CHARS), ''), ['\n']):
+            dst.write(chunk)
+            digest.update(chunk.encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+def add_frontmatter_lines(text, lines):
+    """Insert lines at the end of the frontmatter block that text starts with."""
+    end = text.index('\n---\n', 3) + 1
+    return text[:end] + ''.join(f"{line}\n" for line in lines) + text[end:]
+
+
+def write_prepared(prepared, project_dir, catalog=None, handoff=False, keep_duplicates=False, names=None):
+    """
+    Write a prepared document to to-process/, resolving name collisions.
+
+    names is the run's NameAllocator for to-process/; without one,
+    to-process/ is listed for this document alone.
+
+    With a catalog, a document that duplicates (or nearly duplicates) one
+    intaken earlier is skipped, or written with a duplicate_of field when
+    keep_duplicates is set; the result then names it under 'duplicate_of'
+    and 'new' is None if nothing was written. Documents that largely overlap
+    earlier ones are written with an overlaps list.
+
+    With handoff, the result also carries the written document parsed as
+    (frontmatter, body) under 'document' for the next stage.
+    """
+    new_filename = prepared['filename']
+    frontmatter = prepared['text']
+    source, confidence = prepared['source'], prepared['confidence']
+
+    duplicate, overlaps = None, []
+    if catalog is not None:
+        # Documents split out of one archive share its input hash, so only whole files match exactly
+        exact_hash = None if prepared.get('member') else prepared['input_hash']
+        duplicate, overlaps = check_duplicate(catalog, exact_hash, prepared['fingerprint'])
+
+    if duplicate:
+        print(f"  Duplicate of {duplicate['name']} ({duplicate['kind']}, similarity {duplicate['similarity']})")
+        if not keep_duplicates:
+            result = {
+                'original': prepared['original'],
+                'new': None,
+                'path': None,
+                'source': source,
+                'confidence': confidence,
+                'duplicate_of': duplicate['name'],
+            }
+            if handoff:
+                result['document'] = None
+            return result
+        frontmatter = add_frontmatter_lines(frontmatter, [f"duplicate_of: {duplicate['name']}"])
+
+    if overlaps:
+        print(f"  Overlaps: {', '.join(overlaps)}")
+        frontmatter = add_frontmatter_lines(frontmatter, ['overlaps:'] + [f'  - {yaml_string(name)}' for name in overlaps])
+
     # Write to to-process
-    output_path = project_dir / 'to-process' / new_filename
+    if names is None:
+        names = NameAllocator(project_dir / 'to-process')
 
-    # Handle duplicates
-    counter = 1
-    while output_path.exists():
-        stem = output_path.stem
-        new_filename = f"{stem}-{counter}.md"
-        output_path = project_dir / 'to-process' / new_filename
-        counter += 1
+    # Handle duplicates: name-1.md, name-2.md, ... in the order files are written
+    output_path = names.reserve(new_filename)
 
     try:
-        output_path.write_text(frontmatter, encoding='utf-8')
+        if prepared['stream_body']:
+            content_hash = write_streamed(output_path, frontmatter, prepared['stream_body'])
+        else:
+            output_path.write_text(frontmatter, encoding='utf-8')
+            content_hash = hash_bytes(frontmatter)
     except Exception as e:
         print(f"  Error writing {output_path.name}: {e}")
+        output_path.unlink(missing_ok=True)
         return None
 
+    if catalog is not None:
+        catalog.record(output_path, 'to-process', {
+            'source': source,
+            'original_filename': prepared['original'],
+            'intake_date': datetime.now().strftime('%Y-%m-%d'),
+            'document_date': prepared['document_date'],
+            'status': 'pending',
+            'participants': prepared['participants'],
+            'input_hash': prepared['input_hash'],
+        }, content_hash=content_hash)
+
+        document_fingerprint = prepared['fingerprint']
+        catalog.record_fingerprint(
+            prepared['original'], output_path.name, prepared['input_hash'], document_fingerprint,
+            band_keys(document_fingerprint[0]) if document_fingerprint else [])
+
+        if prepared.get('turns'):
+            catalog.set_turns(output_path, prepared['turns'])
+
     print(f"  → {output_path.name} ({source}, {confidence} confidence)")
 
-    return {
-        'original': input_path.name,
+    result = {
+        'original': prepared['original'],
         'new': output_path.name,
+        'path': output_path,
         'source': source,
         'confidence': confidence
     }
+    if duplicate:
+        result['duplicate_of'] = duplicate['name']
+    if handoff:
+        # Streamed documents are too large, and an archive's documents too many, to hand over;
+        # the next stage reads them from disk
+        handed_over = not (prepared['stream_body'] or prepared.get('member'))
+        result['document'] = parse_frontmatter(frontmatter) if handed_over else None
+
+    return result
+
+
+def process_file(input_path, project_dir, catalog=None, input_hash=None, handoff=False):
+    """Process a single file through intake."""
+    print(f"Processing: {input_path.name}")
+
+    prepared = prepare_file(input_path, input_hash)
+    if prepared is None:
+        return None
+
+    return write_prepared(prepared, project_dir, catalog, handoff)
+
+
+# Returned by intake_if_changed when a raw file was skipped
+UNCHANGED = 'unchanged'
+
+# Returned by prepare_if_changed for a Slack export archive or a mailbox, which are expanded while writing
+SLACK_EXPORT = 'slack-export'
+MAILBOX = 'mailbox'
+
+
+def list_raw_inputs(raw_dir, pattern='*'):
+    """Raw files matching pattern, plus directories of .eml files (each one mailbox)."""
+    return [path for path in raw_dir.glob(pattern) if path.is_file() or is_eml_directory(path)]
+
+
+def input_stat(input_path):
+    """stat() of a raw file; for an .eml directory, its newest mtime and total size."""
+    if not input_path.is_dir():
+        return input_path.stat()
+    stats = [path.stat() for path in input_path.glob('*.eml')]
+    return SimpleNamespace(st_mtime=max((stat.st_mtime for stat in stats), default=0),
+                           st_size=sum(stat.st_size for stat in stats))
+
+
+def hash_input(input_path):
+    """Content hash of a raw file, or of every message in an .eml directory."""
+    return hash_eml_directory(input_path) if input_path.is_dir() else hash_file(input_path)
+
+
+def intake_if_changed(file_path, project_dir, catalog, force=False, handoff=False, keep_duplicates=False):
+    """
+    Intake a raw file unless its content is unchanged since it was last intaken.
+
+    Returns the process_file result (the first document's, for a Slack
+    export), UNCHANGED when skipped, or None on error or when the file
+    yields no documents.
+    """
+    results = intake_files([file_path], project_dir, catalog, force, handoff, keep_duplicates=keep_duplicates)
+    return results[0] if results else None
+
+
+def prepare_if_changed(file_path, known_hash=None, docx_cache=None):
+    """
+    Hash a raw file and prepare it unless the hash equals known_hash.
+
+    Returns (input_hash, prepared), where prepared is UNCHANGED when skipped
+    and None when the file cannot be read (it may have been removed since it
+    was listed). Runs in worker processes for parallel intake.
+    """
+    try:
+        input_hash = hash_input(file_path)
+        if input_hash == known_hash:
+            return input_hash, UNCHANGED
+
+        print(f"Processing: {file_path.name}")
+        if is_slack_export(file_path):
+            return input_hash, SLACK_EXPORT
+        if is_mailbox(file_path):
+            return input_hash, MAILBOX
+        return input_hash, prepare_file(file_path, input_hash, docx_cache)
+    except OSError as e:
+        print(f"  Error reading {file_path.name}: {e}")
+        return None, None
+
+
+def _prepare_job(job):
+    return prepare_if_changed(*job)
+
+
+def intake_files(files, project_dir, catalog, force=False, handoff=False, pool=None, keep_duplicates=False,
+                 released_names=()):
+    """
+    Intake raw files, skipping those unchanged since they were last intaken.
+
+    With a process pool the conversion and analysis of each file run in the
+    workers, while output names, writes and catalog updates are done here in
+    the order of files, so collisions resolve the same way as a serial run.
+    A Slack export archive is expanded into one document per channel-day,
+    and a mailbox (mbox file or directory of .eml files) into one per thread.
+    Markdown converted from a .docx is cached by content hash under
+    .cache/docx/, so a re-intake (--force, or the same file under a new
+    name) does not convert it again.
+
+    A changed file's previous documents are only removed once its new
+    version has been prepared; if that fails they are left in place. The
+    paths removed are released in the to-process/ allocator and in each of
+    released_names, the caller's allocators for later stages.
+
+    Returns the results in file order: UNCHANGED for a skipped file, None for
+    a failed one, and the process_file result of each document written
+    (several for a Slack export or mailbox, possibly none).
+    """
+    results = [[UNCHANGED] for _ in files]
+    pending = []
+    names = NameAllocator(project_dir / 'to-process')
+
+    for i, file_path in enumerate(files):
+        try:
+            stat = input_stat(file_path)
+        except OSError as e:
+            print(f"  Error reading {file_path.name}: {e}")
+            results[i] = [None]
+            continue
+        known = catalog.raw_file(file_path.name)
+
+        # Unchanged stat means unchanged input; otherwise let the hash decide
+        if not force and known and (known['mtime'], known['size']) == (stat.st_mtime, stat.st_size):
+            continue
+
+        known_hash = known['content_hash'] if known and not force else None
+        pending.append((i, file_path, stat, known, known_hash))
+
+    docx_cache = project_dir / DOCX_CACHE_DIR
+    jobs = [(file_path, known_hash, docx_cache) for _, file_path, _, _, known_hash in pending]
+    prepared_files = pool.map(_prepare_job, jobs) if pool else map(_prepare_job, jobs)
+
+    for (i, file_path, stat, known, _), (input_hash, prepared) in zip(pending, prepared_files):
+        if prepared == UNCHANGED:
+            catalog.record_raw(file_path.name, input_hash, stat)
+            continue
+
+        if prepared == SLACK_EXPORT:
+            documents = prepare_slack_export(file_path, input_hash, pool)
+        elif prepared == MAILBOX:
+            documents = prepare_mailbox(file_path, input_hash, pool)
+        else:
+            documents = iter([prepared])
+
+        # Prepare up to the first good document before touching the previous version's outputs
+        head = []
+        try:
+            for document in documents:
+                head.append(document)
+                if document:
+                    break
+        except Exception as e:
+            print(f"  Error reading {file_path.name}: {e}")
+            head.append(None)
+        if head and not any(head):
+            results[i] = head
+            continue
+
+        if known:
+            for removed in remove_derived(catalog, file_path.name, known['content_hash']):
+                for allocator in (names, *released_names):
+                    allocator.release(removed)
+
+        file_results = []
+        for document in chain(head, documents):
+            result = write_prepared(document, project_dir, catalog, handoff, keep_duplicates, names) if document else None
+            file_results.append(result)
+            if result and prepared in (SLACK_EXPORT, MAILBOX):
+                catalog.commit()
+
+        if all(file_results):
+            catalog.record_raw(file_path.name, input_hash, stat)
+            catalog.commit()
+        results[i] = file_results
+
+    catalog.commit()
+    return [result for file_results in results for result in file_results]
+
+
+def write_intake_log(project_dir, results):
+    """Append the per-run table of intaken files to today's intake log."""
+    log_dir = project_dir / 'logs'
+    log_dir.mkdir(exist_ok=True)
+    log_file = log_dir / f"intake-{datetime.now().strftime('%Y-%m-%d')}.md"
+
+    log_content = f"## Intake Log - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    log_content += "| Original | New Name | Source | Confidence |\n"
+    log_content += "|----------|----------|--------|------------|\n"
+
+    for r in results:
+        new_name = r['new'] or f"(duplicate of {r['duplicate_of']})"
+        log_content += f"| {r['original']} | {new_name} | {r['source']} | {r['confidence']} |\n"
+
+    log_content += "\n"
+
+    with open(log_file, 'a') as f:
+        f.write(log_content)
+
+    return log_file
+
+
+def remove_derived(catalog, origin, input_hash):
+    """
+    Delete the document and extractions produced from a raw file that has since changed.
+
+    Returns the paths removed.
+    """
+    catalog.remove_fingerprints(origin)
+    removed = []
+    for key in catalog.derived_from(origin, input_hash):
+        path = catalog.path(key)
+        if path.exists():
+            path.unlink()
+            removed.append(path)
+            print(f"  Superseded: {key}")
+        catalog.remove(key)
+    return removed
 
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python3 intake_processor.py <project_dir> [file_pattern]")
+        print("Usage: python3 intake_processor.py <project_dir> [file_pattern] [--force] [--workers N] [--keep-duplicates]")
         sys.exit(1)
 
     project_dir = Path(sys.argv[1]).expanduser()
@@ -318,12 +681,29 @@ def main():
         print(f"Error: raw/ directory not found in {project_dir}")
         sys.exit(1)
 
+    args = []
+    force = False
+    keep_duplicates = False
+    workers = 1
+    argv = iter(sys.argv[2:])
+    for arg in argv:
+        if arg == '--force':
+            force = True
+        elif arg == '--keep-duplicates':
+            keep_duplicates = True
+        elif arg == '--workers':
+            workers = int(next(argv, '1'))
+        elif arg.startswith('--workers='):
+            workers = int(arg.split('=', 1)[1])
+        elif not arg.startswith('--'):
+            args.append(arg)
+
     # Get files to process
-    if len(sys.argv) >= 3:
-        pattern = sys.argv[2]
-        files = list(raw_dir.glob(pattern))
+    if args:
+        pattern = args[0]
+        files = list_raw_inputs(raw_dir, pattern)
     else:
-        files = [f for f in raw_dir.iterdir() if f.is_file()]
+        files = list_raw_inputs(raw_dir)
 
     if not files:
         print("No files to process in raw/")
@@ -333,36 +713,29 @@ def main():
     print(f"=================")
     print(f"Files to process: {len(files)}\n")
 
-    results = []
-    for file_path in sorted(files):
-        result = process_file(file_path, project_dir)
-        if result:
-            results.append(result)
+    files = sorted(files)
+    with DocumentCatalog(project_dir) as catalog:
+        if workers > 1:
+            print(f"Workers: {workers}\n")
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                outcomes = intake_files(files, project_dir, catalog, force, pool=pool,
+                                        keep_duplicates=keep_duplicates)
+        else:
+            outcomes = intake_files(files, project_dir, catalog, force, keep_duplicates=keep_duplicates)
+
+    # Log rows follow the sorted input order regardless of worker scheduling
+    results = [r for r in outcomes if r and r != UNCHANGED]
+    unchanged = outcomes.count(UNCHANGED)
+    skipped = [r for r in results if not r['new']]
 
     print(f"\nIntake Complete")
     print(f"===============")
-    print(f"Processed: {len(results)} files")
+    print(f"Processed: {len(files) - unchanged} files, {len(results) - len(skipped)} documents")
+    if skipped:
+        print(f"Duplicates: {len(skipped)} documents (skipped)")
+    print(f"Unchanged: {unchanged} files (skipped)")
 
-    # Create log entry
-    log_dir = project_dir / 'logs'
-    log_dir.mkdir(exist_ok=True)
-    log_file = log_dir / f"intake-{datetime.now().strftime('%Y-%m-%d')}.md"
-
-    log_content = f"## Intake Log - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-    log_content += "| Original | New Name | Source | Confidence |\n"
-    log_content += "|----------|----------|--------|------------|\n"
-
-    for r in results:
-        log_content += f"| {r['original']} | {r['new']} | {r['source']} | {r['confidence']} |\n"
-
-    log_content += "\n"
-
-    # Append to log
-    if log_file.exists():
-        existing = log_file.read_text()
-        log_file.write_text(existing + log_content)
-    else:
-        log_file.write_text(log_content)
+    log_file = write_intake_log(project_dir, results)
 
     print(f"\nLog written to: {log_file}")
     print(f"Files moved to: to-process/")
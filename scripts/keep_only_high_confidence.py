@@ -6,27 +6,11 @@ Keep only high-confidence extractions.
 """
 
 import sys
-import re
-import yaml
 from pathlib import Path
 from collections import Counter
 
-
-def read_frontmatter(file_path):
-    """Extract YAML frontmatter from markdown file."""
-    try:
-        content = file_path.read_text(encoding='utf-8')
-        if not content.startswith('---'):
-            return None
-
-        end_match = re.search(r'\n---\n', content[3:])
-        if not end_match:
-            return None
-
-        frontmatter_text = content[3:end_match.start() + 3]
-        return yaml.safe_load(frontmatter_text)
-    except:
-        return None
+sys.path.insert(0, str(Path(__file__).parent))
+from document_catalog import open_catalog
 
 
 # Well-known technical terms that are safe to keep
@@ -74,18 +58,8 @@ KNOWN_TECH_TERMS = {
 
 def get_all_participants(processed_dir):
     """Get all people from participants frontmatter across all documents."""
-    all_participants = set()
-
-    for doc in processed_dir.glob('*.md'):
-        fm = read_frontmatter(doc)
-        if fm and 'participants' in fm:
-            participants = fm['participants']
-            if isinstance(participants, list):
-                for p in participants:
-                    if p and isinstance(p, str) and len(p) > 3:
-                        all_participants.add(p)
-
-    return all_participants
+    with open_catalog(processed_dir.parent, ['processed']) as catalog:
+        return {p for p in catalog.participants('processed') if len(p) > 3}
 
 
 def main():
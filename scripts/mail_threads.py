@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Read mailboxes (an mbox file or a directory of .eml files) as threads.
+
+A first pass streams the mailbox once and keeps only each message's location
+and threading headers (Message-ID, In-Reply-To, References, Subject, Date).
+Messages are grouped into threads by those IDs, and each thread is then
+rendered on its own by re-reading just its messages, so memory depends on
+the number of messages, never on the size of the mailbox.
+"""
+
+import hashlib
+import re
+from datetime import datetime, timezone
+from email import policy
+from email.header import decode_header, make_header
+from email.parser import BytesParser
+from email.utils import getaddresses, parsedate_to_datetime
+
+
+MBOX_SUFFIXES = ('.mbox', '.mbx')
+
+# mbox separator line: "From sender@example.com Mon Mar  4 10:00:00 2024"
+MBOX_FROM_LINE = re.compile(rb'^From \S+ +.*\b\d{1,2}:\d{2}(?::\d{2})?\b.*\d{4}\s*$')
+
+# Body line that an mbox writer escaped so it is not read as a separator (">From ", ">>From ", ...)
+MBOX_ESCAPED_FROM = re.compile(r'^>+From ')
+
+MESSAGE_ID = re.compile(r'<[^<>\s]+>')
+
+# Reply and forward prefixes, possibly repeated: "Re: Fwd: RE[2]: ..."
+SUBJECT_PREFIX = re.compile(r'^(?:\s*(?:re|fwd?|aw|sv)(?:\[\d+\])?\s*:)+\s*', re.IGNORECASE)
+
+# "On Mon, Mar 4, 2024 at 10:00 AM Jane Doe <jane@example.com> wrote:" introducing a quote
+QUOTE_INTRO = re.compile(r'^On .{0,200}wrote:\s*$')
+
+HTML_TAG = re.compile(r'<[^>]+>')
+
+# The only headers the index pass reads
+INDEX_HEADERS = ('message-id', 'references', 'in-reply-to', 'subject', 'date')
+
+_message_parser = BytesParser(policy=policy.default)
+
+
+def is_mbox(path):
+    """An mbox file: .mbox/.mbx, or a file starting with an mbox "From " separator line."""
+    if not path.is_file():
+        return False
+    if path.suffix.lower() in MBOX_SUFFIXES:
+        return True
+    with open(path, 'rb') as f:
+        return bool(MBOX_FROM_LINE.match(f.readline(1024)))
+
+
+def is_eml_directory(path):
+    """A directory holding .eml files."""
+    return path.is_dir() and any(path.glob('*.eml'))
+
+
+def is_mailbox(path):
+    """An mbox file or a directory of .eml files."""
+    return is_mbox(path) or is_eml_directory(path)
+
+
+def eml_files(directory):
+    """The .eml files of a directory, in name order."""
+    return sorted(directory.glob('*.eml'))
+
+
+def hash_eml_directory(directory):
+    """SHA-256 over the names and contents of a directory's .eml files."""
+    digest = hashlib.sha256()
+    for path in eml_files(directory):
+        digest.update(path.name.encode('utf-8') + b'\0')
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def scan_mbox(path):
+    """Yield ((start, end), header bytes) for each message of an mbox file, in one pass."""
+    start, headers, in_headers = None, [], False
+    offset, previous_blank = 0, True
+
+    with open(path, 'rb') as f:
+        for line in f:
+            blank = line in (b'\n', b'\r\n')
+            if previous_blank and line.startswith(b'From '):
+                if start is not None:
+                    yield (start, offset), b''.join(headers)
+                start, headers, in_headers = offset, [], True
+            elif in_headers:
+                if blank:
+                    in_headers = False
+                else:
+                    headers.append(line)
+            previous_blank = blank
+            offset += len(line)
+
+    if start is not None:
+        yield (start, offset), b''.join(headers)
+
+
+def scan_eml_directory(directory):
+    """Yield (file name, header bytes) for each .eml file of a directory."""
+    for path in eml_files(directory):
+        headers = []
+        with open(path, 'rb') as f:
+            for line in f:
+                if line in (b'\n', b'\r\n'):
+                    break
+                headers.append(line)
+        yield path.name, b''.join(headers)
+
+
+def read_message(mailbox, key):
+    """Parse the full message at key: an mbox (start, end) range or an .eml file name."""
+    if isinstance(key, str):
+        return _message_parser.parsebytes((mailbox / key).read_bytes())
+
+    start, end = key
+    with open(mailbox, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return _message_parser.parsebytes(data.split(b'\n', 1)[1] if b'\n' in data else b'')
+
+
+def threading_headers(header_bytes):
+    """The INDEX_HEADERS of a raw header block (first occurrence each), unfolded."""
+    fields = {}
+    name = None
+    for line in header_bytes.decode('utf-8', 'replace').splitlines():
+        if line[:1] in (' ', '\t'):
+            if name:
+                fields[name] += ' ' + line.strip()
+            continue
+        key, separator, value = line.partition(':')
+        name = key.strip().lower() if separator else None
+        if name in INDEX_HEADERS and name not in fields:
+            fields[name] = value.strip()
+        else:
+            name = None
+    return fields
+
+
+def decode_words(value):
+    """Decode RFC 2047 encoded words ("=?utf-8?q?Caf=C3=A9?=") in a header value."""
+    if '=?' not in value:
+        return value
+    try:
+        return str(make_header(decode_header(value)))
+    except Exception:
+        return value
+
+
+def _timestamp(value):
+    try:
+        sent = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if sent.tzinfo is None:
+        sent = sent.replace(tzinfo=timezone.utc)
+    return sent.timestamp()
+
+
+def normalize_subject(subject):
+    """A subject without Re:/Fwd: prefixes and with runs of whitespace collapsed."""
+    return SUBJECT_PREFIX.sub('', ' '.join(subject.split())).strip()
+
+
+def index_mailbox(mailbox):
+    """
+    Read the threading headers of every message in a mailbox, in one pass.
+
+    Returns a list of dicts with key, message_id, parents, subject and
+    timestamp, in mailbox order.
+    """
+    scan = scan_eml_directory(mailbox) if mailbox.is_dir() else scan_mbox(mailbox)
+    index = []
+    for position, (key, header_bytes) in enumerate(scan):
+        headers = threading_headers(header_bytes)
+        message_ids = MESSAGE_ID.findall(headers.get('message-id', ''))
+        parents = MESSAGE_ID.findall(headers.get('references', '') + ' ' + headers.get('in-reply-to', ''))
+        index.append({
+            'key': key,
+            'message_id': message_ids[0] if message_ids else f"<message-{position}@mailbox>",
+            'parents': parents,
+            'subject': decode_words(headers.get('subject', '')),
+            'timestamp': _timestamp(headers.get('date')),
+        })
+    return index
+
+
+def group_threads(index):
+    """
+    Group indexed messages into threads.
+
+    Messages are joined through Message-ID, In-Reply-To and References; a
+    reply that references nothing ("Re: ...") joins the thread whose first
+    message has the same subject. Returns lists of messages, each in sent
+    order, ordered by each thread's first message.
+    """
+    parent = {}
+
+    def find(message_id):
+        root = message_id
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while parent.get(message_id, message_id) != root:
+            parent[message_id], message_id = root, parent[message_id]
+        return root
+
+    def union(a, b):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    for message in index:
+        parent.setdefault(message['message_id'], message['message_id'])
+        for referenced in message['parents']:
+            union(message['message_id'], referenced)
+
+    by_subject = {}
+    for message in index:
+        if message['parents']:
+            continue
+        subject = normalize_subject(message['subject']).lower()
+        if not subject:
+            continue
+        if SUBJECT_PREFIX.match(message['subject']) and subject in by_subject:
+            union(by_subject[subject], message['message_id'])
+        else:
+            by_subject.setdefault(subject, message['message_id'])
+
+    threads = {}
+    for position, message in enumerate(index):
+        threads.setdefault(find(message['message_id']), []).append((position, message))
+
+    def sent_order(entry):
+        position, message = entry
+        return (message['timestamp'] is None, message['timestamp'] or 0, position)
+
+    ordered = [sorted(thread, key=sent_order) for thread in threads.values()]
+    ordered.sort(key=lambda thread: sent_order(thread[0]))
+    return [[message for _, message in thread] for thread in ordered]
+
+
+def _body_text(message, from_mbox=False):
+    """
+    The message's own text: plain part preferred, quoted replies dropped.
+
+    For a message read from an mbox file, escaped ">From " lines are
+    unescaped rather than taken for quotes.
+    """
+    try:
+        part = message.get_body(preferencelist=('plain', 'html'))
+        text = part.get_content() if part else ''
+        if part and part.get_content_type() == 'text/html':
+            text = HTML_TAG.sub('', text)
+    except Exception:
+        payload = message.get_payload(decode=True) or b''
+        text = payload.decode('utf-8', 'replace') if isinstance(payload, bytes) else str(payload)
+
+    lines = []
+    for line in text.replace('\r\n', '\n').split('\n'):
+        if from_mbox and MBOX_ESCAPED_FROM.match(line):
+            line = line[1:]
+        elif line.startswith('>') or QUOTE_INTRO.match(line):
+            continue
+        lines.append(line.rstrip())
+    return '\n'.join(lines).strip()
+
+
+def _addresses(message, *names):
+    """(name, address) pairs from the given address headers, read raw to skip header objects."""
+    names = {name.lower() for name in names}
+    values = [str(value) for key, value in message.raw_items() if key.lower() in names]
+    return [(decode_words(name), address) for name, address in getaddresses(values)]
+
+
+def _add_people(people, seen, addresses):
+    for name, address in addresses:
+        person = name or address
+        key = (address or name).lower()
+        if person and key not in seen:
+            seen.add(key)
+            people.append(person)
+
+
+def render_thread(mailbox, thread):
+    """
+    Render one thread as a document body.
+
+    Returns (subject, date, body, participants): the thread's subject, the
+    YYYY-MM-DD of its first message, and its senders then its recipients
+    (names, or addresses when a name is missing) in order of appearance.
+    """
+    subject = normalize_subject(thread[0]['subject']) or '(no subject)'
+    date = None
+    senders, recipients, seen = [], [], set()
+    sections = []
+    from_mbox = not mailbox.is_dir()
+
+    for entry in thread:
+        message = read_message(mailbox, entry['key'])
+        sent_by = _addresses(message, 'From')
+        sent_to = _addresses(message, 'To', 'Cc')
+        _add_people(senders, seen, sent_by)
+        recipients.extend(sent_to)
+
+        sent = datetime.fromtimestamp(entry['timestamp'], timezone.utc) if entry['timestamp'] else None
+        if sent and not date:
+            date = sent.strftime('%Y-%m-%d')
+
+        sender = ', '.join(f"{name} <{address}>" if name else address for name, address in sent_by) or 'unknown'
+        lines = [f"## {sender}" + (f" — {sent.strftime('%Y-%m-%d %H:%M')}" if sent else '')]
+        if sent_to:
+            lines.append(f"To: {', '.join(name or address for name, address in sent_to)}")
+        lines.append('')
+        lines.append(_body_text(message, from_mbox))
+        sections.append('\n'.join(lines))
+
+    participants = list(senders)
+    _add_people(participants, seen, recipients)
+
+    body = f"# {subject}\n\n" + '\n\n'.join(sections) + '\n'
+    return subject, date, body, participants
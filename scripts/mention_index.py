@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Positional index of the people and terms entity extraction finds.
+
+smart_entity_extractor records where each entity it counts is mentioned: one
+posting per (entity, kind, document) holding, for every mention, the byte
+range of the mention in the document file and of its context (the mention's
+line, clipped to CONTEXT_CHARS either side). A posting is a flat typed
+array, stored in the catalog with the document's entity counts, so "every
+mention of Lokesh in January" or the documents of a person's profile are an
+index lookup and a seek into each file instead of a re-scan of the corpus.
+
+Usage:
+    python3 mention_index.py <project_dir> <entity> [--kind KIND] [--date PREFIX] [--limit N]
+
+--date matches the start of the document date, e.g. --date 2025-01 for January.
+"""
+
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+
+# Characters of context kept on each side of a mention, within its line
+CONTEXT_CHARS = 120
+
+# Per mention, in serialization order: start, end, context start, context end (byte offsets)
+FIELDS = 4
+TYPECODE = 'I'
+
+CRLF = re.compile('\r\n')
+
+
+def context_span(text, start, end):
+    """Character span of the context of text[start:end]: its line, at most CONTEXT_CHARS either side."""
+    window_start = max(0, start - CONTEXT_CHARS)
+    window_end = min(len(text), end + CONTEXT_CHARS)
+    line_end = text.find('\n', end, window_end)
+    return max(text.rfind('\n', window_start, start) + 1, window_start), window_end if line_end < 0 else line_end
+
+
+def byte_offsets(raw, offsets):
+    """
+    {offset: byte offset} for character offsets into raw text read with
+    universal newlines, mapped back to the UTF-8 encoding of raw.
+    """
+    # Where each "\r\n" of raw sits in the text once it is read as "\n"
+    crlf = [match.start() - k for k, match in enumerate(CRLF.finditer(raw))]
+    if not crlf and raw.isascii():
+        return {offset: offset for offset in offsets}
+
+    positions = {}
+    raw_position = byte = 0
+    for offset in sorted(set(offsets)):
+        raw_offset = offset + bisect_left(crlf, offset)
+        byte += len(raw[raw_position:raw_offset].encode('utf-8'))
+        raw_position = raw_offset
+        positions[offset] = byte
+    return positions
+
+
+def document_postings(raw, content, body_start, mentions):
+    """
+    Postings of one document as (entity, kind, data) tuples.
+
+    raw is the file's decoded text, content the same with universal
+    newlines, and mentions {kind: {entity: [(start, end), ...]}} with
+    character spans in content[body_start:].
+    """
+    spans = {}
+    for kind, entities in mentions.items():
+        for entity, found in entities.items():
+            rows = spans[entity, kind] = []
+            for start, end in found:
+                start, end = body_start + start, body_start + end
+                rows.append((start, end) + context_span(content, start, end))
+
+    offsets = byte_offsets(raw, [offset for rows in spans.values() for row in rows for offset in row])
+    return [
+        (entity, kind, array(TYPECODE, [offsets[offset] for row in rows for offset in row]).tobytes())
+        for (entity, kind), rows in spans.items()
+    ]
+
+
+def unpack(data):
+    """A posting's mentions as (start, end, context start, context end) byte offsets."""
+    values = array(TYPECODE)
+    values.frombytes(data)
+    return [tuple(values[i:i + FIELDS]) for i in range(0, len(values), FIELDS)]
+
+
+def read_mentions(doc_path, data):
+    """(mention, context) texts of a posting, sliced from the document file."""
+    body = doc_path.read_bytes()
+    return [
+        (body[start:end].decode('utf-8', errors='replace'),
+         body[context_start:context_end].decode('utf-8', errors='replace'))
+        for start, end, context_start, context_end in unpack(data)
+    ]
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: python3 mention_index.py <project_dir> <entity> [--kind KIND] [--date PREFIX] [--limit N]")
+        sys.exit(1)
+
+    sys.path.insert(0, str(Path(__file__).parent))
+    from document_catalog import DocumentCatalog
+
+    project_dir = Path(sys.argv[1]).expanduser()
+    entity = sys.argv[2]
+    kind = date = limit = None
+    argv = iter(sys.argv[3:])
+    for arg in argv:
+        if arg == '--kind':
+            kind = next(argv, None)
+        elif arg == '--date':
+            date = next(argv, None)
+        elif arg == '--limit':
+            limit = int(next(argv, '0'))
+
+    with DocumentCatalog(project_dir) as catalog:
+        postings = catalog.mentions(entity, kind=kind, date_prefix=date)
+
+    if not postings:
+        print(f"No mentions of {entity} in the index (run smart_entity_extractor.py first)")
+        return
+
+    total = sum(len(data) // (FIELDS * array(TYPECODE).itemsize) for _, _, _, data in postings)
+    print(f"\n{entity}: {total} mentions in {len(postings)} documents")
+
+    shown = 0
+    for doc_path, document_date, posting_kind, data in postings:
+        print(f"\n{doc_path.name} ({document_date or 'undated'}, {posting_kind})")
+        for _, context in read_mentions(doc_path, data):
+            print(f"  ... {' '.join(context.split())} ...")
+            shown += 1
+            if limit and shown >= limit:
+                return
+
+
+if __name__ == '__main__':
+    main()
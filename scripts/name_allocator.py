@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Unique output names for a stage directory.
+
+Stages name their outputs after the input (date, source, description), so
+many documents can want the same name. Instead of probing name-1, name-2, ...
+with a stat call each, a NameAllocator lists the directory once and hands
+out names from memory, remembering the next free counter for each base
+name. Every name is claimed by creating the file with O_EXCL, so a name
+taken meanwhile by another process is skipped rather than overwritten.
+"""
+
+import os
+
+
+class NameAllocator:
+    """Hand out unused file names in a directory: name.md, then name-1.md, name-2.md, ..."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.taken = set()
+        self.counters = {}
+        if directory.exists():
+            with os.scandir(directory) as entries:
+                self.taken.update(entry.name for entry in entries)
+
+    def allocate(self, filename):
+        """Return an unused name for filename without touching the filesystem."""
+        if filename not in self.taken:
+            self.taken.add(filename)
+            return filename
+
+        stem, suffix = os.path.splitext(filename)
+        counter = self.counters.get(filename, 1)
+        while f"{stem}-{counter}{suffix}" in self.taken:
+            counter += 1
+        self.counters[filename] = counter + 1
+
+        name = f"{stem}-{counter}{suffix}"
+        self.taken.add(name)
+        return name
+
+    def reserve(self, filename):
+        """
+        Claim an unused name for filename by creating it empty; returns its path.
+
+        The caller then writes or renames its output over the empty file.
+        """
+        while True:
+            path = self.directory / self.allocate(filename)
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+                return path
+            except FileExistsError:
+                # Created since the listing (another run or worker); it stays taken
+                continue
+
+    def release(self, path):
+        """Make the name of a file removed from the directory available again."""
+        if path.parent == self.directory:
+            self.taken.discard(path.name)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Duplicate and near-duplicate detection for intake.
+
+Each intaken document gets a MinHash signature of its word 5-shingles
+(one-permutation hashing: every shingle hash lands in one of SIGNATURE_SIZE
+bins and each bin keeps its minimum). Signatures are split into LSH bands
+and stored in the project catalog, so finding candidates for a new document
+is a handful of indexed bucket lookups however many documents came before.
+
+A candidate is a near-duplicate when the estimated Jaccard similarity of the
+two shingle sets reaches DUPLICATE_SIMILARITY. Bands only bring up documents
+of similar size, so overlaps (most of one document's shingles appearing in
+the other, e.g. a Slack thread pasted into meeting notes) are found through
+a second index: every document's shingles whose hash falls in a fixed
+1/OVERLAP_SAMPLING slice of the hash space. The same shingle is sampled in
+every document that has it, so the share of the smaller document's samples
+found in the other estimates containment whatever the two sizes.
+"""
+
+import hashlib
+import re
+from array import array
+from functools import reduce
+from operator import mul, xor
+
+
+SHINGLE_WORDS = 5
+
+SIGNATURE_SIZE = 128
+
+# 32 bands of 4 rows: documents with Jaccard 0.5 share a bucket ~87% of the time, 0.9 almost always
+LSH_BANDS = 32
+LSH_ROWS = SIGNATURE_SIZE // LSH_BANDS
+
+# Only this much of a document is fingerprinted
+FINGERPRINT_CHARS = 1024 * 1024
+
+# Estimated Jaccard similarity at which a document counts as a near-duplicate
+DUPLICATE_SIMILARITY = 0.9
+
+# Share of the smaller document's shingles found in the other to flag an overlap
+OVERLAP_CONTAINMENT = 0.8
+
+# Shingles whose hash is below 2**64 / OVERLAP_SAMPLING are indexed for overlap detection
+OVERLAP_SAMPLING = 16
+SAMPLE_LIMIT = (1 << 64) // OVERLAP_SAMPLING
+
+# Fewer sampled shingles than this in the smaller document are too few to call an overlap
+OVERLAP_MIN_SAMPLES = 4
+
+EMPTY_BIN = 0xFFFFFFFF
+
+MASK64 = 0xFFFFFFFFFFFFFFFF
+
+# One odd 64-bit multiplier per word position of a shingle
+SHINGLE_MIX = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93, 0xFF51AFD7ED558CCD)
+
+# Word hashes are kept across documents until this many distinct words have been seen
+WORD_CACHE_SIZE = 1 << 18
+
+_word_hashes = {}
+
+WORD = re.compile(r'\w+')
+
+
+def _word_hash(word):
+    return int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _shingle_hashes(hashes):
+    """Set of 64-bit hashes of the SHINGLE_WORDS-word runs of a list of word hashes."""
+    size = min(SHINGLE_WORDS, len(hashes))
+    runs = zip(*(hashes[i:len(hashes) - size + 1 + i] for i in range(size)))
+    if size == SHINGLE_WORDS:
+        k0, k1, k2, k3, k4 = SHINGLE_MIX
+        return {(a * k0 ^ b * k1 ^ c * k2 ^ d * k3 ^ e * k4) & MASK64 for a, b, c, d, e in runs}
+    return {reduce(xor, map(mul, run, SHINGLE_MIX)) & MASK64 for run in runs}
+
+
+def fingerprint(text, limit=FINGERPRINT_CHARS):
+    """
+    MinHash signature and overlap samples of text's word shingles.
+
+    Returns (signature, shingle_count, samples), or None when text has no
+    words. The signature is an array of SIGNATURE_SIZE 32-bit values and
+    samples a sorted array of the sampled shingle hashes.
+    """
+    words = WORD.findall(text[:limit].lower())
+    if not words:
+        return None
+
+    # Each distinct word is hashed once; a shingle's hash mixes its word hashes with
+    # fixed odd multipliers, so signatures are the same in every process, run and Python
+    missing = set(words).difference(_word_hashes)
+    if len(_word_hashes) + len(missing) > WORD_CACHE_SIZE:
+        _word_hashes.clear()
+        missing = set(words)
+    _word_hashes.update((word, _word_hash(word)) for word in missing)
+    shingles = _shingle_hashes(list(map(_word_hashes.__getitem__, words)))
+
+    bins = [EMPTY_BIN] * SIGNATURE_SIZE
+    for value in shingles:
+        index = value % SIGNATURE_SIZE
+        value = (value >> 32) & 0xFFFFFFFE
+        if value < bins[index]:
+            bins[index] = value
+
+    # Fill empty bins from the next non-empty one (rotation densification);
+    # borrowed values are odd and real ones even, so they never collide
+    if EMPTY_BIN in bins:
+        original = list(bins)
+        for i in range(SIGNATURE_SIZE):
+            if original[i] == EMPTY_BIN:
+                distance = 1
+                while original[(i + distance) % SIGNATURE_SIZE] == EMPTY_BIN:
+                    distance += 1
+                bins[i] = ((original[(i + distance) % SIGNATURE_SIZE] + distance) & 0xFFFFFFFF) | 1
+
+    return array('I', bins), len(shingles), array('q', sorted(value for value in shingles if value < SAMPLE_LIMIT))
+
+
+def band_keys(signature):
+    """One 64-bit bucket key per LSH band of a signature."""
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()
+        keys.append(int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), 'little', signed=True))
+    return keys
+
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(1 for a, b in zip(signature, other) if a == b) / SIGNATURE_SIZE
+
+
+def check_duplicate(catalog, input_hash, document_fingerprint):
+    """
+    Compare a document about to be intaken against every earlier one.
+
+    Returns (duplicate, overlaps): duplicate is a dict naming the earlier
+    document it duplicates (exactly or nearly), or None; overlaps lists the
+    names of earlier documents that largely contain it or that it contains.
+    """
+    if input_hash:
+        exact = catalog.fingerprint_by_hash(input_hash)
+        if exact:
+            return {'name': exact['name'], 'similarity': 1.0, 'kind': 'exact'}, []
+
+    if document_fingerprint is None:
+        return None, []
+
+    signature, _, samples = document_fingerprint
+    best, near = None, set()
+    for candidate in catalog.fingerprint_candidates(band_keys(signature)):
+        other = array('I')
+        other.frombytes(candidate['signature'])
+        jaccard = similarity(signature, other)
+        if jaccard >= DUPLICATE_SIMILARITY:
+            near.add(candidate['id'])
+            if best is None or jaccard > best['similarity']:
+                best = {'name': candidate['name'], 'similarity': round(jaccard, 3), 'kind': 'near'}
+
+    overlaps = []
+    for candidate, shared in catalog.sample_candidates(samples):
+        smaller = min(len(samples), candidate['samples'])
+        if candidate['id'] not in near and smaller >= OVERLAP_MIN_SAMPLES and shared / smaller >= OVERLAP_CONTAINMENT:
+            overlaps.append(candidate['name'])
+
+    return best, sorted(overlaps)
@@ -7,11 +7,14 @@ Stage 3 of the document pipeline.
 import sys
 import os
 import re
-import yaml
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent))
+from document_catalog import open_catalog
+from frontmatter_io import read_frontmatter, write_frontmatter
+
 
 # Common false positives to filter out (same as processor)
 COMMON_WORDS = {
@@ -32,34 +35,6 @@ COMMON_WORDS = {
 }
 
 
-def read_frontmatter(file_path):
-    """Extract YAML frontmatter from markdown file."""
-    content = file_path.read_text(encoding='utf-8')
-
-    if not content.startswith('---'):
-        return None, content
-
-    end_match = re.search(r'\n---\n', content[3:])
-    if not end_match:
-        return None, content
-
-    frontmatter_text = content[3:end_match.start() + 3]
-    body = content[end_match.end() + 3:]
-
-    try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-        return frontmatter, body
-    except:
-        return None, content
-
-
-def write_frontmatter(file_path, frontmatter, body):
-    """Write markdown file with YAML frontmatter."""
-    frontmatter_text = yaml.dump(frontmatter, default_flow_style=False, sort_keys=False)
-    content = f"---\n{frontmatter_text}---\n\n{body}"
-    file_path.write_text(content, encoding='utf-8')
-
-
 def normalize_name(name):
     """Normalize a person's name for file naming."""
     name = name.strip()
@@ -123,9 +98,58 @@ def is_valid_term(term):
     return True
 
 
-def organize_tasks(extraction_path, kb_dir, stats):
+def is_organized(catalog, extraction_path):
+    """Check the catalog's sidecar state for an already organized extraction."""
+    return catalog is not None and catalog.get_state(extraction_path).get('status') == 'organized'
+
+
+def mark_organized(catalog, extraction_path, frontmatter, body):
+    """Record an organized extraction in the catalog, or in its frontmatter without one."""
+    if catalog is None:
+        write_frontmatter(extraction_path, frontmatter, body)
+        return
+    catalog.set_state(
+        extraction_path,
+        status='organized',
+        organized=True,
+        organized_date=frontmatter['organized_date'],
+        organized_to=frontmatter['organized_to'],
+    )
+
+
+def empty_stats():
+    """Counters updated by the organize_* functions."""
+    return {
+        'tasks_new': 0,
+        'tasks_updated': 0,
+        'people_new': 0,
+        'people_updated': 0,
+        'definitions_new': 0,
+        'definitions_updated': 0,
+        'status_new': 0,
+        'status_updated': 0,
+        'wiki_new': 0,
+        'jira_drafts': 0
+    }
+
+
+def organize_extraction(extraction_path, kb_dir, stats, catalog=None, document=None, filter_type='all'):
+    """Route an extraction to the organizer for its kind; document is an optional parsed (frontmatter, body)."""
+    name = extraction_path.name
+    if name.endswith('-tasks.md') and filter_type in ['all', 'tasks']:
+        organize_tasks(extraction_path, kb_dir, stats, catalog, document)
+    elif name.endswith('-entities.md') and filter_type in ['all', 'people', 'definitions']:
+        organize_entities(extraction_path, kb_dir, stats, catalog, document)
+    elif name.endswith('-summary.md') and filter_type in ['all', 'status', 'wiki']:
+        organize_summaries(extraction_path, kb_dir, stats, catalog, document)
+
+
+def organize_tasks(extraction_path, kb_dir, stats, catalog=None, document=None):
     """Organize task extractions into knowledge/tasks/."""
-    frontmatter, body = read_frontmatter(extraction_path)
+    if is_organized(catalog, extraction_path):
+        return
+
+    frontmatter, body = document or read_frontmatter(extraction_path)
 
     if not frontmatter or frontmatter.get('organized'):
         return
@@ -191,12 +215,15 @@ def organize_tasks(extraction_path, kb_dir, stats):
     frontmatter['organized'] = True
     frontmatter['organized_date'] = datetime.now().strftime('%Y-%m-%d')
     frontmatter['organized_to'] = [f"knowledge/tasks/{task_file.name}"]
-    write_frontmatter(extraction_path, frontmatter, body)
+    mark_organized(catalog, extraction_path, frontmatter, body)
 
 
-def organize_entities(extraction_path, kb_dir, stats):
+def organize_entities(extraction_path, kb_dir, stats, catalog=None, document=None):
     """Organize entity extractions with intelligent filtering."""
-    frontmatter, body = read_frontmatter(extraction_path)
+    if is_organized(catalog, extraction_path):
+        return
+
+    frontmatter, body = document or read_frontmatter(extraction_path)
 
     if not frontmatter or frontmatter.get('organized'):
         return
@@ -287,12 +314,15 @@ def organize_entities(extraction_path, kb_dir, stats):
     frontmatter['organized'] = True
     frontmatter['organized_date'] = datetime.now().strftime('%Y-%m-%d')
     frontmatter['organized_to'] = organized_to
-    write_frontmatter(extraction_path, frontmatter, body)
+    mark_organized(catalog, extraction_path, frontmatter, body)
 
 
-def organize_summaries(extraction_path, kb_dir, stats):
+def organize_summaries(extraction_path, kb_dir, stats, catalog=None, document=None):
     """Organize summary extractions into knowledge/project-status/."""
-    frontmatter, body = read_frontmatter(extraction_path)
+    if is_organized(catalog, extraction_path):
+        return
+
+    frontmatter, body = document or read_frontmatter(extraction_path)
 
     if not frontmatter or frontmatter.get('organized'):
         return
@@ -359,7 +389,28 @@ def organize_summaries(extraction_path, kb_dir, stats):
     frontmatter['organized'] = True
     frontmatter['organized_date'] = datetime.now().strftime('%Y-%m-%d')
     frontmatter['organized_to'] = [f"knowledge/project-status/{status_file.name}"]
-    write_frontmatter(extraction_path, frontmatter, body)
+    mark_organized(catalog, extraction_path, frontmatter, body)
+
+
+def write_organize_log(project_dir, stats):
+    """Append this run's new/updated counts to today's organize log."""
+    log_dir = project_dir / 'logs'
+    log_dir.mkdir(exist_ok=True)
+    log_file = log_dir / f"organize-{datetime.now().strftime('%Y-%m-%d')}.md"
+
+    log_content = f"## Organization Log (Improved) - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    log_content += "| Category | New | Updated |\n"
+    log_content += "|----------|-----|----------|\n"
+    log_content += f"| Tasks | {stats['tasks_new']} | {stats['tasks_updated']} |\n"
+    log_content += f"| People | {stats['people_new']} | {stats['people_updated']} |\n"
+    log_content += f"| Definitions | {stats['definitions_new']} | {stats['definitions_updated']} |\n"
+    log_content += f"| Project Status | {stats['status_new']} | {stats['status_updated']} |\n\n"
+
+    separator = "\n" if log_file.exists() else ""
+    with open(log_file, 'a') as f:
+        f.write(separator + log_content)
+
+    return log_file
 
 
 def main():
@@ -381,43 +432,31 @@ def main():
     for subdir in ['tasks', 'people', 'definitions', 'project-status', 'wiki', 'jira-drafts']:
         (kb_dir / subdir).mkdir(exist_ok=True)
 
-    files = list(extractions_dir.glob('*.md'))
+    catalog = open_catalog(project_dir, ['extractions'])
+    files = catalog.documents('extractions', status='pending')
 
     if not files:
         print("No extractions to organize")
+        catalog.close()
         return
 
     print(f"\nOrganizing Extractions (Stage 3 - Improved)")
     print(f"============================================")
     print(f"Extractions to process: {len(files)}\n")
 
-    stats = {
-        'tasks_new': 0,
-        'tasks_updated': 0,
-        'people_new': 0,
-        'people_updated': 0,
-        'definitions_new': 0,
-        'definitions_updated': 0,
-        'status_new': 0,
-        'status_updated': 0,
-        'wiki_new': 0,
-        'jira_drafts': 0
-    }
+    stats = empty_stats()
 
-    for i, file_path in enumerate(sorted(files), 1):
+    for i, file_path in enumerate(files, 1):
         if i % 50 == 0:
             print(f"Progress: {i}/{len(files)}")
 
         try:
-            if file_path.name.endswith('-tasks.md') and filter_type in ['all', 'tasks']:
-                organize_tasks(file_path, kb_dir, stats)
-            elif file_path.name.endswith('-entities.md') and filter_type in ['all', 'people', 'definitions']:
-                organize_entities(file_path, kb_dir, stats)
-            elif file_path.name.endswith('-summary.md') and filter_type in ['all', 'status', 'wiki']:
-                organize_summaries(file_path, kb_dir, stats)
+            organize_extraction(file_path, kb_dir, stats, catalog, filter_type=filter_type)
         except Exception as e:
             print(f"  Error organizing {file_path.name}: {e}")
 
+    catalog.close()
+
     print(f"\n\nOrganization Complete")
     print(f"=====================\n")
 
@@ -437,24 +476,7 @@ def main():
     print(f"- {stats['status_new']} new status files created")
     print(f"- {stats['status_updated']} status files updated")
 
-    # Write log
-    log_dir = project_dir / 'logs'
-    log_dir.mkdir(exist_ok=True)
-    log_file = log_dir / f"organize-{datetime.now().strftime('%Y-%m-%d')}.md"
-
-    log_content = f"## Organization Log (Improved) - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-    log_content += "| Category | New | Updated |\n"
-    log_content += "|----------|-----|----------|\n"
-    log_content += f"| Tasks | {stats['tasks_new']} | {stats['tasks_updated']} |\n"
-    log_content += f"| People | {stats['people_new']} | {stats['people_updated']} |\n"
-    log_content += f"| Definitions | {stats['definitions_new']} | {stats['definitions_updated']} |\n"
-    log_content += f"| Project Status | {stats['status_new']} | {stats['status_updated']} |\n\n"
-
-    if log_file.exists():
-        existing = log_file.read_text()
-        log_file.write_text(existing + "\n" + log_content)
-    else:
-        log_file.write_text(log_content)
+    log_file = write_organize_log(project_dir, stats)
 
     print(f"\nLog written to: {log_file}")
     print(f"See knowledge/ directory for organized content")
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Run the whole document pipeline (intake → process → organize → crossref) in
+one process.
+
+Each stage hands its parsed (frontmatter, body) output straight to the next
+one instead of the next script re-reading and re-parsing it from disk, and
+the catalog and knowledge-base name index are opened once for the whole run.
+Raw files are taken in batches so that only one batch of parsed documents is
+held in memory at a time.
+
+`pipeline.py watch` keeps running and feeds each file through the same
+stages as soon as it has been written to raw/.
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent))
+from document_catalog import open_catalog
+from intake_processor import UNCHANGED, intake_files, list_raw_inputs, write_intake_log
+from name_allocator import NameAllocator
+from process_documents_legacy import process_document, write_process_log
+from organize_extractions import organize_extraction, write_organize_log
+from organize_extractions import empty_stats as empty_organize_stats
+from crossref_analyzer import crossref_document, load_kb_names, write_crossref_summary, write_crossref_log
+from crossref_analyzer import empty_stats as empty_crossref_stats
+from raw_watcher import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL, watch
+
+
+KB_SUBDIRS = ['tasks', 'people', 'definitions', 'project-status', 'wiki', 'jira-drafts']
+
+DEFAULT_BATCH_SIZE = 50
+
+
+def run_batch(run, documents):
+    """
+    Process, organize and cross-reference a batch of to-process documents.
+
+    documents is a list of (path, document) pairs where document is the parsed
+    (frontmatter, body) handed over by intake, or None to read it from disk.
+    """
+    project_dir, catalog, kb_dir = run['project_dir'], run['catalog'], run['kb_dir']
+
+    processed = []
+    for doc_path, document in documents:
+        try:
+            result = process_document(doc_path, project_dir, catalog, document, handoff=True,
+                                      names=run['processed_names'])
+        except Exception as e:
+            run['errors'].append((doc_path.name, str(e)))
+            print(f"  Error processing {doc_path.name}: {e}")
+            continue
+        if result:
+            processed.append(result)
+
+    for result in processed:
+        for extraction_path, extraction in result['extractions'].values():
+            run['organized'].add(extraction_path)
+            try:
+                organize_extraction(extraction_path, kb_dir, run['organize_stats'], catalog, extraction)
+            except Exception as e:
+                print(f"  Error organizing {extraction_path.name}: {e}")
+
+    if not run['skip_crossref']:
+        # Organizing may have added people and terms, so reload once per batch
+        kb_names = load_kb_names(kb_dir)
+        for result in processed:
+            crossref(run, result['path'], result['document'], kb_names)
+
+    # Only the stats are kept for the run's logs, not the parsed documents
+    for result in processed:
+        del result['document'], result['extractions']
+        run['processed'].append(result)
+
+    catalog.commit()
+
+
+def crossref(run, doc_path, document, kb_names):
+    """Cross-reference one processed document, advancing the run's proposal counter."""
+    try:
+        run['proposal_counter'] = crossref_document(
+            doc_path, run['kb_dir'], run['proposals_dir'], run['proposal_counter'],
+            run['crossref_stats'], run['catalog'], document, kb_names)
+    except Exception as e:
+        print(f"  Error analyzing {doc_path.name}: {e}")
+
+
+def run_pipeline(project_dir, force=False, skip_crossref=False, batch_size=DEFAULT_BATCH_SIZE, pool=None,
+                 raw_files=None, catalog=None, keep_duplicates=False):
+    """
+    Run all four stages over a project directory and return the run's results and stats.
+
+    With a process pool, each batch's raw files are converted and analyzed in
+    parallel. raw_files limits intake to the given files instead of all of
+    raw/, and a catalog passed in is reconciled and left open for the caller.
+    Duplicates of earlier documents are skipped unless keep_duplicates is set.
+    """
+    raw_dir = project_dir / 'raw'
+    kb_dir = project_dir / 'knowledge'
+    proposals_dir = project_dir / 'proposed-updates'
+
+    for stage_dir in ['to-process', 'processed', 'extractions']:
+        (project_dir / stage_dir).mkdir(exist_ok=True)
+    kb_dir.mkdir(exist_ok=True)
+    for subdir in KB_SUBDIRS:
+        (kb_dir / subdir).mkdir(exist_ok=True)
+    proposals_dir.mkdir(exist_ok=True)
+
+    keep_open = catalog is not None
+    if keep_open:
+        for stage in ['to-process', 'processed', 'extractions']:
+            catalog.sync_stage(stage)
+    else:
+        catalog = open_catalog(project_dir, ['to-process', 'processed', 'extractions'])
+
+    run = {
+        'project_dir': project_dir,
+        'catalog': catalog,
+        'kb_dir': kb_dir,
+        'proposals_dir': proposals_dir,
+        'skip_crossref': skip_crossref,
+        'intake': [],
+        'intake_files': 0,
+        'unchanged': 0,
+        'duplicates': 0,
+        'processed': [],
+        'errors': [],
+        'organized': set(),
+        'processed_names': NameAllocator(project_dir / 'processed'),
+        'organize_stats': empty_organize_stats(),
+        'crossref_stats': empty_crossref_stats(),
+        'proposal_counter': len(list(proposals_dir.glob('update-*.md'))) + 1,
+    }
+
+    if raw_files is None:
+        raw_files = list_raw_inputs(raw_dir) if raw_dir.exists() else []
+    raw_files = sorted(raw_files)
+
+    # Documents already waiting in to-process/ go through with the first batch
+    backlog = [(path, None) for path in catalog.documents('to-process', exclude_status='processed')]
+
+    for start in range(0, max(len(raw_files), 1), batch_size):
+        documents, backlog = backlog, []
+        batch = raw_files[start:start + batch_size]
+        run['intake_files'] += len(batch)
+        for result in intake_files(batch, project_dir, catalog, force, handoff=True, pool=pool,
+                                   keep_duplicates=keep_duplicates, released_names=[run['processed_names']]):
+            if result == UNCHANGED:
+                run['intake_files'] -= 1
+                run['unchanged'] += 1
+            elif result:
+                run['intake'].append(result)
+                if result['path']:
+                    documents.append((result['path'], result['document']))
+                else:
+                    run['duplicates'] += 1
+
+        # A Slack export yields many documents from one raw file
+        for offset in range(0, len(documents), batch_size):
+            run_batch(run, documents[offset:offset + batch_size])
+
+        if start + batch_size < len(raw_files):
+            print(f"Progress: {start + batch_size}/{len(raw_files)}")
+
+    # Pick up work left over from earlier, interrupted runs
+    for extraction_path in catalog.documents('extractions', status='pending'):
+        if extraction_path in run['organized']:
+            continue
+        try:
+            organize_extraction(extraction_path, kb_dir, run['organize_stats'], catalog)
+        except Exception as e:
+            print(f"  Error organizing {extraction_path.name}: {e}")
+
+    if not skip_crossref:
+        today = datetime.now().date()
+        midnight = datetime.combine(today, datetime.min.time()).timestamp()
+        leftovers = catalog.documents(
+            'processed',
+            where='crossref_date IS NULL AND (processed_date = ? OR mtime >= ?)',
+            params=(today.strftime('%Y-%m-%d'), midnight),
+        )
+        if leftovers:
+            kb_names = load_kb_names(kb_dir)
+            for doc_path in leftovers:
+                crossref(run, doc_path, None, kb_names)
+
+    if keep_open:
+        catalog.commit()
+    else:
+        catalog.close()
+
+    return run
+
+
+def write_run_logs(run):
+    """Write each stage's log for a run; returns the crossref summary file, if any."""
+    project_dir = run['project_dir']
+
+    write_intake_log(project_dir, run['intake'])
+    write_process_log(project_dir, run['processed'], run['errors'])
+    write_organize_log(project_dir, run['organize_stats'])
+
+    if run['skip_crossref']:
+        return None
+
+    write_crossref_log(project_dir, run['crossref_stats'])
+    return write_crossref_summary(run['proposals_dir'], run['crossref_stats'])
+
+
+def watch_project(project_dir, skip_crossref=False, debounce=DEFAULT_DEBOUNCE,
+                  poll_interval=DEFAULT_POLL_INTERVAL, polling=False):
+    """Run the pipeline over raw/ once, then again for each file as it lands there."""
+    catalog = open_catalog(project_dir)
+
+    def handle(paths):
+        started = time.monotonic()
+        try:
+            run = run_pipeline(project_dir, skip_crossref=skip_crossref, raw_files=paths, catalog=catalog)
+            if run['intake'] or run['processed']:
+                write_run_logs(run)
+        except Exception as e:
+            # One bad batch must not stop the watcher; its files are retried when next written
+            print(f"  Error running {', '.join(path.name for path in paths)}: {e}")
+            return
+        print(f"  {run['intake_files']} files intaken, {len(run['processed'])} documents processed, "
+              f"{run['crossref_stats']['proposals_created']} proposals ({time.monotonic() - started:.2f}s)")
+
+    # Catch up on anything that arrived while no watcher was running
+    handle(list_raw_inputs(project_dir / 'raw'))
+
+    try:
+        watch(project_dir / 'raw', handle, debounce, poll_interval, polling)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        catalog.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the document pipeline in a single process')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Intake, process, organize and cross-reference')
+    run_parser.add_argument('project_dir', help='Project directory')
+    run_parser.add_argument('--force', action='store_true',
+                            help='Re-intake raw files even if their content is unchanged')
+    run_parser.add_argument('--skip-crossref', action='store_true',
+                            help='Stop after organizing')
+    run_parser.add_argument('--keep-duplicates', action='store_true',
+                            help='Intake duplicates of earlier documents instead of skipping them')
+    run_parser.add_argument('--workers', type=int, default=1,
+                            help='Processes used to convert and analyze raw files (default: 1)')
+    run_parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help=f'Raw files carried through all stages together (default: {DEFAULT_BATCH_SIZE})')
+
+    watch_parser = subparsers.add_parser('watch', help='Run the pipeline on each file as it lands in raw/')
+    watch_parser.add_argument('project_dir', help='Project directory')
+    watch_parser.add_argument('--skip-crossref', action='store_true',
+                              help='Stop after organizing')
+    watch_parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                              help=f'Seconds a file must go unwritten before intake (default: {DEFAULT_DEBOUNCE})')
+    watch_parser.add_argument('--poll', action='store_true',
+                              help='Poll raw/ instead of using inotify')
+    watch_parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                              help=f'Seconds between directory scans when polling (default: {DEFAULT_POLL_INTERVAL})')
+
+    args = parser.parse_args()
+
+    project_dir = Path(args.project_dir).expanduser()
+    if not (project_dir / 'raw').exists():
+        print(f"Error: raw/ directory not found in {project_dir}")
+        sys.exit(1)
+
+    if args.command == 'watch':
+        watch_project(project_dir, args.skip_crossref, args.debounce, args.poll_interval, args.poll)
+        return
+
+    print(f"\nPipeline Run")
+    print(f"============\n")
+
+    batch_size = max(args.batch_size, 1)
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            run = run_pipeline(project_dir, args.force, args.skip_crossref, batch_size, pool,
+                               keep_duplicates=args.keep_duplicates)
+    else:
+        run = run_pipeline(project_dir, args.force, args.skip_crossref, batch_size,
+                           keep_duplicates=args.keep_duplicates)
+
+    organize_stats = run['organize_stats']
+    crossref_stats = run['crossref_stats']
+
+    print(f"\n\nPipeline Complete")
+    print(f"=================\n")
+    print(f"Intake: {run['intake_files']} files, {len(run['intake']) - run['duplicates']} documents "
+          f"({run['unchanged']} files unchanged, {run['duplicates']} duplicate documents, skipped)")
+    print(f"Processed: {len(run['processed'])} documents")
+    if run['errors']:
+        print(f"Errors: {len(run['errors'])} documents failed")
+    print(f"Organized: {organize_stats['tasks_new'] + organize_stats['tasks_updated']} task collections, "
+          f"{organize_stats['people_new'] + organize_stats['people_updated']} people, "
+          f"{organize_stats['definitions_new'] + organize_stats['definitions_updated']} definitions")
+
+    summary_file = write_run_logs(run)
+
+    if summary_file:
+        print(f"Cross-referenced: {crossref_stats['documents_analyzed']} documents, "
+              f"{crossref_stats['proposals_created']} proposals")
+        print(f"\nSummary written to: {summary_file}")
+        print(f"\n⚠️  IMPORTANT: No changes were auto-applied. Review each proposal before applying.")
+
+    print(f"\nLogs written to: logs/")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,21 @@
 #!/usr/bin/env python3
 """
 Populate knowledge base with high-confidence extracted entities.
+
+Person profiles list the documents that mention each person, read from the
+catalog's mention index (see mention_index.py) rather than the documents.
 """
 
 import sys
-import re
 import yaml
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent))
+from document_catalog import CATALOG_FILENAME, DocumentCatalog
+from mention_index import read_mentions
+from smart_entity_extractor import ENTITIES_FILE, load_entities
+
 
 # Final validation - common words that should never be in names
 INVALID_WORDS = {
@@ -60,6 +67,9 @@ KNOWN_VALID_PEOPLE = {
 MIN_PERSON_MENTIONS = 50  # Must appear at least this many times
 MIN_TERM_MENTIONS = 20    # Must appear at least this many times
 
+# Documents listed in a person profile, most mentions first
+MAX_PROFILE_DOCUMENTS = 20
+
 
 def is_valid_person_name(name):
     """Final validation for person names."""
@@ -98,61 +108,45 @@ def normalize_name(name):
 
 
 def read_extracted_entities(project_dir):
-    """Read the extracted entities file."""
-    entities_file = project_dir / 'extracted_entities.md'
+    """Read the people and terms written by smart_entity_extractor."""
+    entities_file = project_dir / ENTITIES_FILE
 
     if not entities_file.exists():
-        print("Error: extracted_entities.md not found. Run smart_entity_extractor.py first.")
+        print(f"Error: {ENTITIES_FILE} not found. Run smart_entity_extractor.py first.")
         return None, None
 
-    content = entities_file.read_text()
+    return load_entities(entities_file)
 
-    # Parse people section
-    people = {}
-    in_people = False
-    for line in content.split('\n'):
-        if line.startswith('## People'):
-            in_people = True
-            continue
-        if line.startswith('## Technical Terms'):
-            in_people = False
-            continue
 
-        if in_people and line.startswith('|') and not line.startswith('| Name'):
-            parts = [p.strip() for p in line.split('|')[1:-1]]
-            if len(parts) >= 3:
-                name = parts[0]
-                try:
-                    count = int(parts[1])
-                    name_type = parts[2]
-                    people[name] = {'count': count, 'type': name_type}
-                except:
-                    pass
-
-    # Parse terms section
-    terms = {}
-    in_terms = False
-    for line in content.split('\n'):
-        if line.startswith('## Technical Terms'):
-            in_terms = True
-            continue
+def seen_fields(info):
+    """Frontmatter fields for when and where an entity was seen, as far as the extractor knows."""
+    fields = {key: info[key] for key in ('first_seen', 'last_seen') if info.get(key)}
+    if info.get('documents'):
+        fields['document_count'] = len(info['documents'])
+    return fields
+
 
-        if in_terms and line.startswith('|') and not line.startswith('| Term'):
-            parts = [p.strip() for p in line.split('|')[1:-1]]
-            if len(parts) >= 4:
-                term = parts[0]
-                try:
-                    count = int(parts[1])
-                    term_type = parts[2]
-                    definition = parts[3] if len(parts) > 3 else ''
-                    terms[term] = {'count': count, 'type': term_type, 'definition': definition}
-                except:
-                    pass
+def document_mentions(catalog, name):
+    """Profile lines for the documents that mention a name, from the mention index."""
+    documents = {}
+    for doc_path, document_date, _, data in catalog.mentions(name):
+        mentions = read_mentions(doc_path, data)
+        if doc_path in documents:
+            documents[doc_path][1].extend(mentions)
+        else:
+            documents[doc_path] = (document_date, mentions)
 
-    return people, terms
+    lines = []
+    ranked = sorted(documents.items(), key=lambda item: len(item[1][1]), reverse=True)
+    for doc_path, (document_date, mentions) in ranked[:MAX_PROFILE_DOCUMENTS]:
+        context = ' '.join(mentions[0][1].split())
+        lines.append(f"- {doc_path.stem} ({document_date or 'undated'}, {len(mentions)} mentions): \"{context}\"")
+    if len(ranked) > MAX_PROFILE_DOCUMENTS:
+        lines.append(f"- ... and {len(ranked) - MAX_PROFILE_DOCUMENTS} more documents")
+    return lines
 
 
-def write_person_file(people_dir, name, info):
+def write_person_file(people_dir, name, info, catalog=None):
     """Write a person profile file."""
     filename = normalize_name(name) + '.md'
     filepath = people_dir / filename
@@ -163,6 +157,11 @@ def write_person_file(people_dir, name, info):
         'updated': datetime.now().strftime('%Y-%m-%d'),
         'mention_count': info['count']
     }
+    frontmatter.update(seen_fields(info))
+
+    mentions = document_mentions(catalog, name) if catalog is not None else []
+    if not mentions:
+        mentions = ['- Appears frequently in meeting transcripts and discussions']
 
     content = f"""---
 {yaml.dump(frontmatter, default_flow_style=False)}---
@@ -175,8 +174,7 @@ Identified as a team member based on {info['count']} mentions across project doc
 
 ## Document Mentions
 
-- Appears frequently in meeting transcripts and discussions
-"""
+""" + '\n'.join(mentions) + '\n'
 
     filepath.write_text(content)
     return filepath
@@ -197,6 +195,7 @@ def write_term_file(defs_dir, term, info):
         'mention_count': info['count'],
         'term_type': info.get('type', 'unknown')
     }
+    frontmatter.update(seen_fields(info))
 
     content = f"""---
 {yaml.dump(frontmatter, default_flow_style=False)}---
@@ -283,11 +282,14 @@ def main():
     for f in defs_dir.glob('*.md'):
         f.unlink()
 
-    # Write people files
+    # Write people files, with their documents from the mention index when there is one
     print(f"\nWriting people profiles...")
+    catalog = DocumentCatalog(project_dir) if (project_dir / CATALOG_FILENAME).exists() else None
     for name, info in sorted(valid_people.items(), key=lambda x: x[1]['count'], reverse=True):
-        write_person_file(people_dir, name, info)
+        write_person_file(people_dir, name, info, catalog)
         print(f"  ✓ {name} ({info['count']} mentions)")
+    if catalog is not None:
+        catalog.close()
 
     # Write term files
     print(f"\nWriting term definitions...")
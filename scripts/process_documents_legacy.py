@@ -23,38 +23,14 @@ For best results, use the /process command instead.
 import sys
 import os
 import re
-import yaml
 from pathlib import Path
 from datetime import datetime
 from collections import Counter
 
-
-def read_frontmatter(file_path):
-    """Extract YAML frontmatter from markdown file."""
-    content = file_path.read_text(encoding='utf-8')
-
-    if not content.startswith('---'):
-        return None, content
-
-    end_match = re.search(r'\n---\n', content[3:])
-    if not end_match:
-        return None, content
-
-    frontmatter_text = content[3:end_match.start() + 3]
-    body = content[end_match.end() + 3:]
-
-    try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-        return frontmatter, body
-    except:
-        return None, content
-
-
-def write_frontmatter(file_path, frontmatter, body):
-    """Write markdown file with YAML frontmatter."""
-    frontmatter_text = yaml.dump(frontmatter, default_flow_style=False, sort_keys=False)
-    content = f"---\n{frontmatter_text}---\n\n{body}"
-    file_path.write_text(content, encoding='utf-8')
+sys.path.insert(0, str(Path(__file__).parent))
+from document_catalog import open_catalog, hash_bytes, hash_file
+from frontmatter_io import read_frontmatter, write_frontmatter, parse_frontmatter
+from name_allocator import NameAllocator
 
 
 # Common false positives to filter out
@@ -244,9 +220,9 @@ def count_document_stats(body):
     }
 
 
-def create_summary_extraction(doc_path, source_doc_name, stats):
+def create_summary_extraction(doc_path, source_doc_name, stats, document=None):
     """Create a summary extraction file."""
-    frontmatter, body = read_frontmatter(doc_path)
+    frontmatter, body = document or read_frontmatter(doc_path)
 
     title_match = re.search(r'^#\s+(.+)$', body, re.MULTILINE)
     title = title_match.group(1) if title_match else source_doc_name
@@ -284,9 +260,9 @@ extracted_date: {datetime.now().strftime('%Y-%m-%d')}
     return summary_content
 
 
-def create_tasks_extraction(doc_path, source_doc_name, stats):
+def create_tasks_extraction(doc_path, source_doc_name, stats, document=None):
     """Create a tasks extraction file."""
-    frontmatter, body = read_frontmatter(doc_path)
+    frontmatter, body = document or read_frontmatter(doc_path)
 
     task_patterns = [
         r'(?:TODO|Action Item|Task|Follow[- ]up):\s*(.+)',
@@ -325,9 +301,9 @@ This is an automated extraction. Manual review recommended for accuracy.
     return tasks_content
 
 
-def create_entities_extraction(doc_path, source_doc_name, stats):
+def create_entities_extraction(doc_path, source_doc_name, stats, document=None):
     """Create an entities extraction file with filtered, meaningful entities."""
-    frontmatter, body = read_frontmatter(doc_path)
+    frontmatter, body = document or read_frontmatter(doc_path)
 
     people = stats['people_list']
     acronyms = stats['acronyms_list']
@@ -360,9 +336,25 @@ This is an automated extraction. Manual review recommended for accuracy.
     return entities_content
 
 
-def process_document(doc_path, project_dir):
-    """Process a single document through Stage 2."""
-    frontmatter, body = read_frontmatter(doc_path)
+# Extraction kinds written for every document, in order
+EXTRACTION_BUILDERS = (
+    ('summary', create_summary_extraction),
+    ('tasks', create_tasks_extraction),
+    ('entities', create_entities_extraction),
+)
+
+
+def process_document(doc_path, project_dir, catalog=None, document=None, handoff=False, names=None):
+    """
+    Process a single document through Stage 2.
+
+    document is an already parsed (frontmatter, body) pair to use instead of
+    reading doc_path. With handoff, the result also carries the processed
+    document and each new extraction, parsed, for the next stage. names is
+    the run's NameAllocator for processed/; without one, processed/ is listed
+    for this document alone.
+    """
+    frontmatter, body = document or read_frontmatter(doc_path)
 
     if not frontmatter:
         print(f"  Warning: {doc_path.name} missing frontmatter, skipping")
@@ -378,22 +370,32 @@ def process_document(doc_path, project_dir):
     extractions_dir.mkdir(exist_ok=True)
 
     extraction_files = {}
+    extraction_documents = {}
+
+    # Content hash of this document, recorded on each extraction as its input
+    doc_hash = None
+    if catalog is not None:
+        doc_hash = (catalog.get(doc_path) or {}).get('content_hash') or hash_file(doc_path)
+
+    # Create extractions, skipping any already built from identical input
+    for kind, create_extraction in EXTRACTION_BUILDERS:
+        extraction_path = extractions_dir / f"{base_name}-{kind}.md"
+        extraction_files[kind] = f"extractions/{extraction_path.name}"
 
-    # Create extractions
-    summary_path = extractions_dir / f"{base_name}-summary.md"
-    summary_content = create_summary_extraction(doc_path, doc_path.name, stats)
-    summary_path.write_text(summary_content, encoding='utf-8')
-    extraction_files['summary'] = f"extractions/{summary_path.name}"
+        if catalog is not None and extraction_path.exists():
+            existing = catalog.get(extraction_path)
+            if existing and existing['input_hash'] == doc_hash:
+                continue
 
-    tasks_path = extractions_dir / f"{base_name}-tasks.md"
-    tasks_content = create_tasks_extraction(doc_path, doc_path.name, stats)
-    tasks_path.write_text(tasks_content, encoding='utf-8')
-    extraction_files['tasks'] = f"extractions/{tasks_path.name}"
+        content = create_extraction(doc_path, doc_path.name, stats, (frontmatter, body))
+        extraction_path.write_text(content, encoding='utf-8')
+        if handoff:
+            extraction_documents[kind] = (extraction_path, parse_frontmatter(content))
 
-    entities_path = extractions_dir / f"{base_name}-entities.md"
-    entities_content = create_entities_extraction(doc_path, doc_path.name, stats)
-    entities_path.write_text(entities_content, encoding='utf-8')
-    extraction_files['entities'] = f"extractions/{entities_path.name}"
+        if catalog is not None:
+            catalog.record(extraction_path, 'extractions', {
+                'source_document': f"to-process/{doc_path.name}",
+            }, status='pending', state=None, input_hash=doc_hash, content_hash=hash_bytes(content))
 
     # Update frontmatter
     frontmatter['status'] = 'processed'
@@ -403,26 +405,71 @@ def process_document(doc_path, project_dir):
     frontmatter['people_count'] = stats['estimated_people']
     frontmatter['definition_count'] = stats['estimated_definitions']
 
-    write_frontmatter(doc_path, frontmatter, body)
+    # With a catalog the state lives in the sidecar and the document is moved as-is
+    if catalog is None:
+        write_frontmatter(doc_path, frontmatter, body)
 
     # Move to processed
     processed_dir = project_dir / 'processed'
     processed_dir.mkdir(exist_ok=True)
-    dest_path = processed_dir / doc_path.name
+    if names is None:
+        names = NameAllocator(processed_dir)
 
-    counter = 1
-    while dest_path.exists():
-        dest_path = processed_dir / f"{doc_path.stem}-{counter}{doc_path.suffix}"
-        counter += 1
+    # Handle duplicates: name-1.md, name-2.md, ...; the reserved empty file is replaced by the move
+    dest_path = names.reserve(doc_path.name)
+    try:
+        doc_path.replace(dest_path)
+    except OSError:
+        dest_path.unlink(missing_ok=True)
+        raise
 
-    doc_path.rename(dest_path)
+    if catalog is not None:
+        catalog.move(doc_path, dest_path, 'processed')
+        catalog.record(dest_path, 'processed', frontmatter, content_hash=doc_hash)
 
-    return {
+    result = {
         'original': doc_path.name,
+        'path': dest_path,
         'tasks': stats['estimated_tasks'],
         'people': stats['estimated_people'],
         'definitions': stats['estimated_definitions']
     }
+    if handoff:
+        result['document'] = (frontmatter, body)
+        result['extractions'] = extraction_documents
+
+    return result
+
+
+def write_process_log(project_dir, results, errors):
+    """Append this run's per-document stats and errors to today's process log."""
+    log_dir = project_dir / 'logs'
+    log_dir.mkdir(exist_ok=True)
+    log_file = log_dir / f"process-{datetime.now().strftime('%Y-%m-%d')}.md"
+
+    log_content = f"## Processing Log (Improved) - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    log_content += "| Document | Tasks | People | Definitions |\n"
+    log_content += "|----------|-------|--------|-------------|\n"
+
+    for r in results[:50]:
+        log_content += f"| {r['original']} | {r['tasks']} | {r['people']} | {r['definitions']} |\n"
+
+    if len(results) > 50:
+        log_content += f"\n... and {len(results) - 50} more documents\n"
+
+    log_content += f"\n**Total:** {len(results)} documents processed\n"
+    log_content += f"**Errors:** {len(errors)} documents failed\n\n"
+
+    if errors:
+        log_content += "### Errors\n\n"
+        for filename, error in errors:
+            log_content += f"- {filename}: {error}\n"
+
+    separator = "\n" if log_file.exists() else ""
+    with open(log_file, 'a') as f:
+        f.write(separator + log_content)
+
+    return log_file
 
 
 def main():
@@ -437,10 +484,12 @@ def main():
         print(f"Error: to-process/ not found in {project_dir}")
         sys.exit(1)
 
-    files = list(to_process_dir.glob('*.md'))
+    catalog = open_catalog(project_dir, ['to-process'])
+    files = catalog.documents('to-process', exclude_status='processed')
 
     if not files:
         print("No files to process in to-process/")
+        catalog.close()
         return
 
     print(f"\nProcessing Documents (Stage 2 - Improved)")
@@ -450,18 +499,23 @@ def main():
     results = []
     errors = []
 
-    for i, file_path in enumerate(sorted(files), 1):
+    (project_dir / 'processed').mkdir(exist_ok=True)
+    names = NameAllocator(project_dir / 'processed')
+
+    for i, file_path in enumerate(files, 1):
         try:
             if i % 10 == 0:
                 print(f"Progress: {i}/{len(files)}")
 
-            result = process_document(file_path, project_dir)
+            result = process_document(file_path, project_dir, catalog, names=names)
             if result:
                 results.append(result)
         except Exception as e:
             errors.append((file_path.name, str(e)))
             print(f"  Error processing {file_path.name}: {e}")
 
+    catalog.close()
+
     print(f"\n\nProcessing Complete")
     print(f"===================")
     print(f"Processed: {len(results)} documents")
@@ -478,34 +532,7 @@ def main():
     print(f"- Total people identified: {total_people}")
     print(f"- Total definitions found: {total_defs}")
 
-    # Write log
-    log_dir = project_dir / 'logs'
-    log_dir.mkdir(exist_ok=True)
-    log_file = log_dir / f"process-{datetime.now().strftime('%Y-%m-%d')}.md"
-
-    log_content = f"## Processing Log (Improved) - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-    log_content += "| Document | Tasks | People | Definitions |\n"
-    log_content += "|----------|-------|--------|-------------|\n"
-
-    for r in results[:50]:
-        log_content += f"| {r['original']} | {r['tasks']} | {r['people']} | {r['definitions']} |\n"
-
-    if len(results) > 50:
-        log_content += f"\n... and {len(results) - 50} more documents\n"
-
-    log_content += f"\n**Total:** {len(results)} documents processed\n"
-    log_content += f"**Errors:** {len(errors)} documents failed\n\n"
-
-    if errors:
-        log_content += "### Errors\n\n"
-        for filename, error in errors:
-            log_content += f"- {filename}: {error}\n"
-
-    if log_file.exists():
-        existing = log_file.read_text()
-        log_file.write_text(existing + "\n" + log_content)
-    else:
-        log_file.write_text(log_content)
+    log_file = write_process_log(project_dir, results, errors)
 
     print(f"\nLog written to: {log_file}")
     print(f"Extractions written to: extractions/")
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Watch a directory for files that have finished being written.
+
+On Linux the watcher uses inotify (through libc, no extra packages) and
+reports a file as soon as it is closed after writing or moved into the
+directory. Elsewhere, or when inotify is unavailable, it falls back to
+polling the directory listing for new or changed files. A directory of .eml
+files is one input (a mailbox): it is reported by its own name when it is
+moved in or when one of its .eml files is written.
+
+Callers debounce the reported names: a file is handed on only once it has
+gone quiet for a short interval, so rapid successive writes are intaken once.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+from mail_threads import is_eml_directory
+
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+EVENT_HEADER = struct.Struct('iIII')
+
+DEFAULT_DEBOUNCE = 0.2
+DEFAULT_POLL_INTERVAL = 0.5
+
+
+def is_watched_name(name):
+    """Skip hidden and temporary files written alongside the real ones."""
+    return not (name.startswith('.') or name.endswith('~') or name.endswith(('.part', '.tmp', '.swp')))
+
+
+def is_watched_eml(name):
+    return name.endswith('.eml') and is_watched_name(name)
+
+
+def list_files(directory):
+    """
+    Map each regular file in directory to its (mtime_ns, size), and each
+    directory of .eml files to its newest .eml mtime_ns and total size.
+    """
+    files = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not is_watched_name(entry.name):
+                continue
+            if entry.is_file():
+                stat = entry.stat()
+                files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+            elif entry.is_dir():
+                with os.scandir(entry.path) as messages:
+                    stats = [message.stat() for message in messages
+                             if message.is_file() and is_watched_eml(message.name)]
+                if stats:
+                    files[entry.name] = (max(stat.st_mtime_ns for stat in stats), sum(stat.st_size for stat in stats))
+    return files
+
+
+class InotifyWatcher:
+    """
+    Report files closed after writing or moved into a directory, via inotify.
+
+    Each subdirectory gets a watch of its own, so that writing an .eml file
+    into one reports the subdirectory.
+    """
+
+    kind = 'inotify'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+        self.root = self.libc.inotify_add_watch(self.fd, os.fsencode(str(directory)),
+                                                IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE)
+        if self.root < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f'inotify_add_watch failed for {directory}')
+
+        # Watch descriptor -> name of the subdirectory it watches
+        self.subdirectories = {}
+        self.watch_subdirectories()
+
+    def watch_subdirectory(self, name):
+        if name in self.subdirectories.values():
+            return
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(str(self.directory / name)),
+                                         IN_CLOSE_WRITE | IN_MOVED_TO)
+        if wd >= 0:
+            self.subdirectories[wd] = name
+
+    def watch_subdirectories(self):
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_dir() and is_watched_name(entry.name):
+                    self.watch_subdirectory(entry.name)
+
+    def wait(self, timeout=None):
+        """Block up to timeout seconds (forever if None); return the set of names that changed."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        names = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; report everything and let the caller's skip logic sort it out
+                self.watch_subdirectories()
+                names.update(list_files(self.directory))
+            elif mask & IN_IGNORED:
+                self.subdirectories.pop(wd, None)
+            elif wd in self.subdirectories:
+                # An .eml file written into a subdirectory stands for the whole mailbox
+                if name and not mask & IN_ISDIR and is_watched_eml(name):
+                    names.add(self.subdirectories[wd])
+            elif not name or not is_watched_name(name):
+                continue
+            elif mask & IN_ISDIR:
+                # A directory moved in, or filled before its watch was added, may already hold .eml files
+                self.watch_subdirectory(name)
+                names.add(name)
+            elif not mask & IN_CREATE:
+                names.add(name)
+
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Report files that are new or changed since the previous directory listing."""
+
+    kind = 'polling'
+
+    def __init__(self, directory, interval=DEFAULT_POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.files = list_files(directory)
+
+    def wait(self, timeout=None):
+        """Sleep up to one poll interval (less if timeout is shorter); return the set of names that changed."""
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+
+        files = list_files(self.directory)
+        names = {name for name, signature in files.items() if self.files.get(name) != signature}
+        self.files = files
+        return names
+
+    def close(self):
+        pass
+
+
+def open_watcher(directory, poll_interval=DEFAULT_POLL_INTERVAL, polling=False):
+    """Watch directory with inotify where available, otherwise by polling."""
+    if not polling:
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory, poll_interval)
+
+
+def watch(directory, handle, debounce=DEFAULT_DEBOUNCE, poll_interval=DEFAULT_POLL_INTERVAL, polling=False):
+    """
+    Call handle(paths) with each batch of files (or .eml directories) written to directory, until interrupted.
+
+    A file is handed on once no further writes to it have been seen for
+    debounce seconds; files that settle together are passed as one sorted batch.
+    """
+    watcher = open_watcher(directory, poll_interval, polling)
+    print(f"Watching {directory} ({watcher.kind})")
+
+    due = {}
+    try:
+        while True:
+            timeout = max(0.0, min(due.values()) - time.monotonic()) if due else None
+            for name in watcher.wait(timeout):
+                due[name] = time.monotonic() + debounce
+
+            now = time.monotonic()
+            ready = sorted(name for name, deadline in due.items() if deadline <= now)
+            for name in ready:
+                del due[name]
+
+            paths = [directory / name for name in ready
+                     if (directory / name).is_file() or is_eml_directory(directory / name)]
+            if paths:
+                handle(paths)
+    finally:
+        watcher.close()
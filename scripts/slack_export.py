@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Read Slack workspace export archives (.zip) without extracting them.
+
+A Slack export holds users.json, channels.json and one JSON file of messages
+per channel per day (general/2024-03-04.json). Intake turns every
+channel-day into its own document: the archive's members are read one at a
+time straight out of the zip, each JSON array is decoded message by message,
+and user IDs are resolved through users.json, which is read once per archive.
+"""
+
+import io
+import json
+import re
+import zipfile
+from datetime import datetime, timezone
+
+
+DAY_MEMBER = re.compile(r'^(?:[^/]+/)?(?P<channel>[^/]+)/(?P<day>\d{4}-\d{2}-\d{2})\.json$')
+
+# Slack markup: <@U123>, <@U123|name>, <#C123|general>, <https://url|label>, <!here>
+MARKUP = re.compile(r'<([@#!]?)([^|>]+)(?:\|([^>]*))?>')
+
+READ_CHARS = 64 * 1024
+
+
+def is_slack_export(path):
+    """True for a zip archive laid out like a Slack workspace export."""
+    if path.suffix.lower() != '.zip' or not zipfile.is_zipfile(path):
+        return False
+    with zipfile.ZipFile(path) as archive:
+        names = {name.rsplit('/', 1)[-1] for name in archive.namelist()}
+    return 'users.json' in names and ('channels.json' in names or 'groups.json' in names)
+
+
+def iter_json_array(stream):
+    """
+    Yield the elements of the JSON array in a binary stream one at a time.
+
+    Only the element being decoded (plus one read buffer) is held in memory,
+    however long the array is.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig')
+    decoder = json.JSONDecoder()
+    buffer, pos, started, eof = '', 0, False, False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+            pos += 1
+
+        element = end = None
+        if pos < len(buffer):
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError('expected a JSON array')
+                started, pos = True, pos + 1
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+
+        # Read more when the buffer is used up, an element is cut off, or a
+        # number may continue in the next chunk
+        if end is None or (not eof and (end == len(buffer) or buffer[end] not in ' \t\r\n,]')):
+            if eof:
+                return
+            chunk = text.read(max(READ_CHARS, len(buffer) - pos))
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+
+        yield element
+        pos = end
+
+
+def day_members(archive):
+    """(channel, day, member name) for every channel-day file in an export, sorted."""
+    members = []
+    for name in archive.namelist():
+        match = DAY_MEMBER.match(name)
+        if match:
+            members.append((match.group('channel'), match.group('day'), name))
+    return sorted(members)
+
+
+def load_users(archive):
+    """Map each user ID in the export's users.json to a display name."""
+    member = next((name for name in archive.namelist() if name.rsplit('/', 1)[-1] == 'users.json'), None)
+    if member is None:
+        return {}
+
+    users = {}
+    with archive.open(member) as stream:
+        for user in iter_json_array(stream):
+            if not isinstance(user, dict) or 'id' not in user:
+                continue
+            profile = user.get('profile') or {}
+            users[user['id']] = (user.get('real_name') or profile.get('real_name')
+                                 or profile.get('display_name') or user.get('name') or user['id'])
+    return users
+
+
+def format_text(text, users, mentioned):
+    """Replace Slack markup with readable text, adding mentioned users' names to mentioned."""
+    def replace(match):
+        kind, target, label = match.groups()
+        if kind == '@':
+            name = users.get(target, label or target)
+            mentioned.append(name)
+            return f"@{name}"
+        if kind == '#':
+            return f"#{label or target}"
+        if kind == '!':
+            return f"@{label or target}"
+        return label or target
+
+    return MARKUP.sub(replace, text).replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&')
+
+
+def render_channel_day(archive, member, channel, day, users):
+    """
+    Render one channel-day file as a transcript.
+
+    Returns (body, participants), where participants are message authors in
+    order of first message followed by users only mentioned; None when the
+    day has no messages.
+    """
+    lines = []
+    authors, mentioned = [], []
+
+    with archive.open(member) as stream:
+        for message in iter_json_array(stream):
+            if not isinstance(message, dict) or message.get('subtype') in ('channel_join', 'channel_leave'):
+                continue
+
+            profile = message.get('user_profile') or {}
+            author = users.get(message.get('user')) or profile.get('real_name') or message.get('username')
+            author = author or message.get('user') or 'unknown'
+            if author not in authors:
+                authors.append(author)
+
+            try:
+                sent = datetime.fromtimestamp(float(message.get('ts')), timezone.utc).strftime('%I:%M %p')
+            except (TypeError, ValueError):
+                sent = '--:--'
+
+            text = format_text(message.get('text') or '', users, mentioned)
+            for attachment in message.get('files') or []:
+                text += f" [file: {attachment.get('name') or attachment.get('title') or 'attachment'}]"
+
+            prefix = '  ↳ ' if message.get('thread_ts') not in (None, message.get('ts')) else ''
+            lines.append(f"{prefix}[{sent}] {author}: {text}")
+
+    if not lines:
+        return None
+
+    participants = authors + [name for name in dict.fromkeys(mentioned) if name not in authors]
+    body = f"# #{channel} — {day}\n\n" + '\n'.join(lines) + '\n'
+    return body, participants
@@ -2,13 +2,34 @@
 """
 Smart entity extractor that uses contextual patterns to extract people and terms.
 Project-agnostic - works with any document set.
+
+Each document is extracted on its own, in a pool of worker processes, and
+the per-document counts are merged before the corpus-wide thresholds apply,
+so memory is bounded by the largest document rather than the corpus. The
+per-document counts are kept in the catalog by content hash, so a re-run
+only extracts documents that are new or changed; --force extracts all.
+Where each entity is mentioned is indexed alongside (see mention_index.py).
+
+Usage:
+    python3 smart_entity_extractor.py <project_dir> [--workers N] [--force]
 """
 
+import os
 import sys
 import re
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from collections import Counter
 
+sys.path.insert(0, str(Path(__file__).parent))
+from dictionary_matcher import dictionary_files, load_matcher
+from document_catalog import DocumentCatalog, hash_bytes
+from mention_index import document_postings
+from token_stream import TokenStream, is_acronym_word, is_capitals, is_letters, is_name_word
+
 
 # Pronouns and common words to filter out
 PRONOUNS = {'he', 'she', 'they', 'it', 'we', 'i', 'you', 'who', 'what', 'that', 'this', 'there'}
@@ -96,6 +117,7 @@ SPEAKING_VERBS = [
     'indicated', 'indicates', 'informed', 'informs', 'conveyed', 'conveys',
     'shared', 'shares', 'revealed', 'reveals', 'admitted', 'admits'
 ]
+SPEAKING_VERB_SET = frozenset(SPEAKING_VERBS)
 
 # Common acronym false positives
 ACRONYM_FALSE_POSITIVES = {
@@ -114,43 +136,63 @@ ACRONYM_FALSE_POSITIVES = {
 }
 
 
-def extract_speakers_from_content(content):
-    """Extract people names from speaker patterns in document content."""
-    speakers = Counter()
-
-    # Build regex pattern for speaking verbs
-    verb_pattern = '|'.join(SPEAKING_VERBS)
+def extract_speakers_from_content(content, tokens=None, mentions=None):
+    """
+    Extract people names from speaker patterns in document content.
 
-    # Pattern: "Name (verb)" - captures first name before speaking verb
-    pattern = rf'\b([A-Z][a-z]+)\s+(?:{verb_pattern})\b'
+    When mentions is a dict, the character span of each counted name is
+    appended to mentions[name]; the other extractors take it too.
+    """
+    tokens = tokens or TokenStream(content)
+    words, gaps = tokens.words, tokens.gaps
+    speakers = Counter()
 
-    for match in re.finditer(pattern, content, re.IGNORECASE):
-        name = match.group(1)
+    # "Name (verb)": a word of letters in any case, whitespace, then a speaking verb.
+    # Matches do not overlap: a verb that ended one match cannot be the next one's name
+    free = 0
+    for i, word in enumerate(tokens.folded):
+        if word not in SPEAKING_VERB_SET:
+            continue
+        name_index = i - 1
+        if name_index < free or not gaps[name_index].isspace() or not is_letters(words[name_index]):
+            continue
+        free = i + 1
+        name = words[name_index]
         if name.lower() not in PRONOUNS and name.lower() not in COMMON_FALSE_POSITIVES:
             speakers[name] += 1
+            if mentions is not None:
+                mentions.setdefault(name, []).append(tokens.span(name_index))
 
     # Also look for "Name's" pattern (possessive indicating person)
-    pattern2 = r"\b([A-Z][a-z]+)'s\b"
-    for match in re.finditer(pattern2, content):
-        name = match.group(1)
+    for i in tokens.capitalized:
+        if gaps[i] != "'" or words[i + 1] != 's' or not is_name_word(words[i]):
+            continue
+        name = words[i]
         if name.lower() not in PRONOUNS and name.lower() not in COMMON_FALSE_POSITIVES:
             # Give less weight to possessives
             speakers[name] += 0.5
+            if mentions is not None:
+                mentions.setdefault(name, []).append(tokens.span(i))
 
     return speakers
 
 
-def extract_full_names(content):
+def extract_full_names(content, tokens=None, mentions=None):
     """Extract full names (First Last) that appear in content."""
+    tokens = tokens or TokenStream(content)
+    words, gaps = tokens.words, tokens.gaps
     full_names = Counter()
 
-    # Pattern for First Last (and optionally Middle)
-    pattern = r'\b([A-Z][a-z]+)\s+([A-Z][a-z]+)(?:\s+([A-Z][a-z]+))?\b'
-
-    for match in re.finditer(pattern, content):
-        first = match.group(1)
-        last = match.group(2)
-        middle = match.group(3)
+    # First Last (and optionally a third name word): capitalized words separated by whitespace.
+    # A candidate uses up its words even when the checks below reject it
+    free = 0
+    for i in tokens.capitalized:
+        if i < free or not gaps[i].isspace() or not is_name_word(words[i]) or not is_name_word(words[i + 1]):
+            continue
+        first = words[i]
+        last = words[i + 1]
+        middle = words[i + 2] if gaps[i + 1].isspace() and is_name_word(words[i + 2]) else None
+        free = i + (3 if middle else 2)
 
         # Skip if any part is a common word
         if first.lower() in COMMON_FALSE_POSITIVES or last.lower() in COMMON_FALSE_POSITIVES:
@@ -192,88 +234,81 @@ def extract_full_names(content):
         parts = full_name.split()
         if all(2 <= len(p) <= 15 for p in parts):
             full_names[full_name] += 1
+            if mentions is not None:
+                mentions.setdefault(full_name, []).append(tokens.span(i, i + len(parts) - 1))
 
     return full_names
 
 
-def extract_acronyms(content, min_occurrences=5):
+def extract_acronyms(content, min_occurrences=5, tokens=None, mentions=None):
     """Extract meaningful acronyms from content."""
+    tokens = tokens or TokenStream(content)
+    words = tokens.words
     acronyms = Counter()
 
-    # Pattern for acronyms (2-6 uppercase letters, optionally with numbers)
-    pattern = r'\b([A-Z][A-Z0-9]{1,5})\b'
-
-    for match in re.finditer(pattern, content):
-        acronym = match.group(1)
+    # Acronyms are words of 2-6 uppercase letters, optionally with numbers
+    for i in tokens.capitalized:
+        acronym = words[i]
+        if not is_acronym_word(acronym):
+            continue
 
         # Skip false positives
         if acronym in ACRONYM_FALSE_POSITIVES:
             continue
 
-        # Skip if too short (single letter) or contains only numbers
-        if len(acronym) < 2 or acronym.isdigit():
-            continue
-
         acronyms[acronym] += 1
+        if mentions is not None:
+            mentions.setdefault(acronym, []).append(tokens.span(i))
 
     # Return only those with sufficient occurrences
     return Counter({k: v for k, v in acronyms.items() if v >= min_occurrences})
 
 
-def extract_technical_phrases(content, min_occurrences=3):
-    """Extract multi-word technical phrases."""
-    phrases = Counter()
-
-    # Common technical phrase patterns
-    phrase_patterns = [
-        r'\b(Data\s+Federation)\b',
-        r'\b(Stream\s+Processing)\b',
-        r'\b(Change\s+Data\s+Capture)\b',
-        r'\b(Data\s+Lake(?:house)?)\b',
-        r'\b(Apache\s+(?:Iceberg|Spark|Kafka|Hudi|Hadoop|Parquet|Avro))\b',
-        r'\b(Medallion\s+Architecture)\b',
-        r'\b(Bronze|Silver|Gold)\s+(?:Layer|Table|Zone|Data)\b',
-        r'\b((?:Bronze|Silver|Gold))\b',  # Just the layer names
-        r'\b(Full\s+Load)\b',
-        r'\b(Initial\s+Sync)\b',
-        r'\b(Data\s+Pipeline)\b',
-        r'\b(Data\s+Warehouse)\b',
-        r'\b(Machine\s+Learning)\b',
-        r'\b(Continuous\s+Integration)\b',
-        r'\b(Continuous\s+Delivery)\b',
-        r'\b(Infrastructure\s+as\s+Code)\b',
-        r'\b(Version\s+Control)\b',
-        r'\b(Pull\s+Request)\b',
-        r'\b(Code\s+Review)\b',
-        r'\b(Unit\s+Test(?:ing)?)\b',
-        r'\b(Integration\s+Test(?:ing)?)\b',
-        r'\b(Load\s+Test(?:ing)?)\b',
-        r'\b(Schema\s+Evolution)\b',
-        r'\b(Time\s+Travel)\b',
-        r'\b(Batch\s+Processing)\b',
-        r'\b(Real[\s-]?[Tt]ime\s+Processing)\b',
-    ]
+def capitalize_words(phrase):
+    """Technical phrases are counted with each word capitalized."""
+    return ' '.join(word.capitalize() for word in phrase.split())
+
+
+@lru_cache(maxsize=None)
+def phrase_matcher(project_dir=None):
+    """Matcher for the technical phrase dictionary (and the project's additions)."""
+    return load_matcher(dictionary_files('technical_phrases.txt', project_dir), capitalize_words)
 
-    for pattern in phrase_patterns:
-        for match in re.finditer(pattern, content, re.IGNORECASE):
-            phrase = match.group(1)
-            # Normalize to title case
-            phrase = ' '.join(word.capitalize() for word in phrase.split())
-            phrases[phrase] += 1
 
+@lru_cache(maxsize=None)
+def product_matcher(project_dir=None):
+    """Matcher for the product name dictionary (and the project's additions)."""
+    return load_matcher(dictionary_files('product_names.txt', project_dir), str.title)
+
+
+def extract_technical_phrases(content, min_occurrences=3, matcher=None, tokens=None, mentions=None):
+    """Extract multi-word technical phrases from the phrase dictionary."""
+    phrases = (matcher or phrase_matcher()).count_tokens(tokens or TokenStream(content), mentions)
     return Counter({k: v for k, v in phrases.items() if v >= min_occurrences})
 
 
-def extract_defined_terms(content):
+def extract_defined_terms(content, tokens=None):
     """Extract terms that are explicitly defined (e.g., 'CDC (Change Data Capture)')."""
+    tokens = tokens or TokenStream(content)
+    text, words, gaps, starts = tokens.text, tokens.words, tokens.gaps, tokens.starts
     defined_terms = {}
 
-    # Pattern: ACRONYM (Full Definition)
-    pattern = r'\b([A-Z]{2,6})\s*\(([^)]+)\)'
-
-    for match in re.finditer(pattern, content):
-        acronym = match.group(1)
-        definition = match.group(2).strip()
+    # ACRONYM (Full Definition): 2-6 capitals, optional whitespace, then text up to the first ")".
+    # The parenthesis is used up, so acronyms inside a definition do not start another
+    free = 0
+    for i in tokens.capitalized:
+        acronym = words[i]
+        if starts[i] < free or not is_capitals(acronym):
+            continue
+        after = gaps[i].lstrip()
+        if not after.startswith('('):
+            continue
+        opening = starts[i] + len(acronym) + len(gaps[i]) - len(after)
+        closing = text.find(')', opening + 1)
+        if closing <= opening + 1:
+            continue
+        free = closing + 1
+        definition = text[opening + 1:closing].strip()
 
         # Skip if definition is too short or too long
         if len(definition) < 5 or len(definition) > 100:
@@ -303,50 +338,110 @@ def extract_defined_terms(content):
     return defined_terms
 
 
-def extract_product_names(content, min_occurrences=5):
-    """Extract product/technology names."""
-    products = Counter()
-
-    # Common product/tech name patterns
-    product_patterns = [
-        r'\b(MongoDB)\b',
-        r'\b(Terraform)\b',
-        r'\b(Snowflake)\b',
-        r'\b(Databricks)\b',
-        r'\b(Fivetran)\b',
-        r'\b(Confluent)\b',
-        r'\b(Kubernetes)\b',
-        r'\b(Docker)\b',
-        r'\b(Jenkins)\b',
-        r'\b(GitHub)\b',
-        r'\b(GitLab)\b',
-        r'\b(Jira)\b',
-        r'\b(Confluence)\b',
-        r'\b(Slack)\b',
-        r'\b(Python)\b',
-        r'\b(Scala)\b',
-        r'\b(Java)\b',
-        r'\b(Spark)\b',
-        r'\b(Iceberg)\b',
-        r'\b(Parquet)\b',
-        r'\b(Hadoop)\b',
-        r'\b(PySpark)\b',
-        r'\b(DataFrame)\b',
-        r'\b(Atlas)\b',
-        r'\b(Octa)\b',
-        r'\b(Netflix)\b',  # Often mentioned as Iceberg origin
-    ]
+def extract_product_names(content, min_occurrences=5, matcher=None, tokens=None, mentions=None):
+    """Extract product/technology names from the product dictionary."""
+    products = (matcher or product_matcher()).count_tokens(tokens or TokenStream(content), mentions)
+    return Counter({k: v for k, v in products.items() if v >= min_occurrences})
 
-    for pattern in product_patterns:
-        for match in re.finditer(pattern, content, re.IGNORECASE):
-            product = match.group(1)
-            # Normalize capitalization
-            products[product.title() if product.lower() != 'pyspark' else 'PySpark'] += 1
 
-    return Counter({k: v for k, v in products.items() if v >= min_occurrences})
+# Per-document entity counts, merged across documents by merge_entities
+COUNTED_ENTITIES = ('speakers', 'full_names', 'acronyms', 'phrases', 'products')
+
+# Part of the signature of cached counts: bump it when an extractor change alters them
+EXTRACTOR_VERSION = 3
+
+DICTIONARIES = ('technical_phrases.txt', 'product_names.txt')
 
+# Results: one JSON record per person and term, and the markdown report rendered from them
+ENTITIES_FILE = 'extracted_entities.jsonl'
+REPORT_FILE = 'extracted_entities.md'
 
-def process_documents(project_dir):
+# Mention index kind of each person and term type
+ENTITY_KINDS = {
+    'first_name': 'speakers', 'full_name': 'full_names',
+    'acronym': 'acronyms', 'phrase': 'phrases', 'product': 'products',
+}
+
+
+def extractor_signature(project_dir=None):
+    """What per-document counts depend on besides the document: extractor version and dictionaries."""
+    digest = hashlib.sha256(f"extractor {EXTRACTOR_VERSION}\n".encode('utf-8'))
+    for name in DICTIONARIES:
+        for path in dictionary_files(name, project_dir):
+            digest.update(f"{name}\n".encode('utf-8') + path.read_bytes())
+    return digest.hexdigest()
+
+
+def document_body(content):
+    """Document text without its frontmatter."""
+    if content.startswith('---'):
+        end = content.find('\n---\n', 3)
+        if end > 0:
+            return content[end + 5:]
+    return content
+
+
+def extract_document_entities(content, project_dir=None, mentions=None):
+    """
+    Entity counts of one document, before any corpus-wide threshold.
+
+    Returns a Counter per COUNTED_ENTITIES name, plus 'defined_terms'
+    (acronym -> definition). Phrases and products are matched against the
+    dictionaries of project_dir. The text is tokenized once for all of them.
+    When mentions is a dict, it is filled with {COUNTED_ENTITIES name:
+    {entity: [(start, end), ...]}}, the character spans of every mention counted.
+    """
+    tokens = TokenStream(content)
+    if mentions is None:
+        found = dict.fromkeys(COUNTED_ENTITIES)
+    else:
+        found = mentions
+        found.update((name, {}) for name in COUNTED_ENTITIES)
+    return {
+        'speakers': extract_speakers_from_content(content, tokens, found['speakers']),
+        'full_names': extract_full_names(content, tokens, found['full_names']),
+        'acronyms': extract_acronyms(content, 1, tokens, found['acronyms']),
+        'phrases': extract_technical_phrases(content, 1, phrase_matcher(project_dir), tokens, found['phrases']),
+        'products': extract_product_names(content, 1, product_matcher(project_dir), tokens, found['products']),
+        'defined_terms': extract_defined_terms(content, tokens),
+    }
+
+
+def _extract_job(job):
+    """
+    (content hash, entities as JSON, mention postings, error) for one document file; runs in worker processes.
+
+    The content hash is only computed when the catalog has none.
+    """
+    doc_path, content_hash, project_dir = job
+    try:
+        data = doc_path.read_bytes()
+        raw = data.decode('utf-8')
+    except Exception as e:
+        return content_hash, None, None, str(e)
+    content = raw.replace('\r\n', '\n').replace('\r', '\n')
+    body = document_body(content)
+    mentions = {}
+    entities = extract_document_entities(body, project_dir, mentions)
+    postings = document_postings(raw, content, len(content) - len(body), mentions)
+    return content_hash or hash_bytes(data), json.dumps(entities), postings, None
+
+
+def merge_entities(documents):
+    """Sum per-document entity counts; a term's first definition, in document order, wins."""
+    totals = {name: Counter() for name in COUNTED_ENTITIES}
+    totals['defined_terms'] = {}
+
+    for entities in documents:
+        for name in COUNTED_ENTITIES:
+            totals[name].update(entities[name])
+        for acronym, definition in entities['defined_terms'].items():
+            totals['defined_terms'].setdefault(acronym, definition)
+
+    return totals
+
+
+def process_documents(project_dir, workers=None, force=False):
     """Process all documents in a project directory."""
     project_dir = Path(project_dir).expanduser()
     processed_dir = project_dir / 'processed'
@@ -355,35 +450,48 @@ def process_documents(project_dir):
         print(f"Error: processed/ directory not found in {project_dir}")
         return None, None
 
-    # Combine all document content
-    all_content = ""
-    doc_count = 0
-
-    for doc in processed_dir.glob('*.md'):
-        try:
-            content = doc.read_text(encoding='utf-8')
-            # Skip frontmatter
-            if content.startswith('---'):
-                end = content.find('\n---\n', 3)
-                if end > 0:
-                    content = content[end + 5:]
-            all_content += "\n\n" + content
-            doc_count += 1
-        except Exception as e:
-            print(f"Warning: Could not read {doc.name}: {e}")
-
-    print(f"Processed {doc_count} documents")
-
-    # Extract entities
-    print("\nExtracting people...")
-    speakers = extract_speakers_from_content(all_content)
-    full_names = extract_full_names(all_content)
-
-    print("Extracting technical terms...")
-    acronyms = extract_acronyms(all_content, min_occurrences=10)
-    phrases = extract_technical_phrases(all_content, min_occurrences=5)
-    defined_terms = extract_defined_terms(all_content)
-    products = extract_product_names(all_content, min_occurrences=10)
+    signature = extractor_signature(project_dir)
+    workers = workers or os.cpu_count() or 1
+
+    with DocumentCatalog(project_dir) as catalog:
+        # Every file's stat is checked, so documents edited in place are extracted again
+        catalog.sync_stage('processed', check_files=True)
+        documents = catalog.content_hashes('processed')
+        cached = set() if force else catalog.entity_count_hashes(signature)
+        jobs = [(doc, content_hash, str(project_dir)) for doc, content_hash in documents
+                if content_hash not in cached]
+
+        print(f"Extracting people and technical terms from {len(documents)} documents "
+              f"({len(documents) - len(jobs)} unchanged, {len(jobs)} to extract, {workers} workers)...")
+
+        def counts(extracted):
+            """Per-document counts in document order: from the catalog, or freshly extracted and stored."""
+            for doc, content_hash in documents:
+                if content_hash in cached:
+                    yield json.loads(catalog.entity_counts(content_hash, signature))
+                    continue
+
+                digest, data, postings, error = next(extracted)
+                if error:
+                    print(f"Warning: Could not read {doc.name}: {error}")
+                    continue
+                if content_hash is None:
+                    catalog.update(doc, content_hash=digest)
+                catalog.set_entity_counts(digest, signature, data, postings)
+                yield json.loads(data)
+
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                totals = merge_entities(counts(pool.map(_extract_job, jobs, chunksize=16)))
+        else:
+            totals = merge_entities(counts(map(_extract_job, jobs)))
+
+        catalog.prune_entity_counts(signature)
+
+    speakers, full_names, defined_terms = totals['speakers'], totals['full_names'], totals['defined_terms']
+    acronyms = Counter({k: v for k, v in totals['acronyms'].items() if v >= 10})
+    phrases = Counter({k: v for k, v in totals['phrases'].items() if v >= 5})
+    products = Counter({k: v for k, v in totals['products'].items() if v >= 10})
 
     # Combine people (prefer full names when available)
     people = {}
@@ -431,21 +539,107 @@ def process_documents(project_dir):
         if product not in terms:  # Don't duplicate
             terms[product] = {'count': count, 'type': 'product'}
 
+    with DocumentCatalog(project_dir) as catalog:
+        add_sources(catalog, people)
+        add_sources(catalog, terms)
+
+    return people, terms
+
+
+def add_sources(catalog, entities):
+    """Add first/last seen document dates and the documents mentioning each entity, from the mention index."""
+    for name, info in entities.items():
+        lookups = [(name, ENTITY_KINDS[info['type']])]
+        if 'first_name' in info:
+            # Mentions by first name were merged into the full name
+            lookups.append((info['first_name'], 'speakers'))
+
+        seen = {}
+        for entity, kind in lookups:
+            seen.update(catalog.mention_documents(entity, kind))
+
+        dates = sorted(date for date in seen.values() if date)
+        info['first_seen'] = dates[0] if dates else None
+        info['last_seen'] = dates[-1] if dates else None
+        info['documents'] = sorted(seen)
+
+
+def entity_records(people, terms):
+    """Records of the results, people then terms, each by mention count."""
+    records = []
+    for category, entities in (('person', people), ('term', terms)):
+        for name, info in sorted(entities.items(), key=lambda x: x[1]['count'], reverse=True):
+            records.append({'name': name, 'category': category, **info})
+    return records
+
+
+def write_entities(path, records):
+    """Write entity records as JSON lines."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def load_entities(path):
+    """(people, terms) from an entities file, as process_documents returns them."""
+    people, terms = {}, {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            info = json.loads(line)
+            name, category = info.pop('name'), info.pop('category')
+            (people if category == 'person' else terms)[name] = info
     return people, terms
 
 
+def render_report(records, document_count):
+    """The markdown report of entity records."""
+    lines = [
+        "# Extracted Entities\n",
+        f"*Generated from {document_count} documents*\n",
+        "## People\n",
+        "| Name | Mentions | Type |",
+        "|------|----------|------|",
+    ]
+    for record in records:
+        if record['category'] == 'person':
+            lines.append(f"| {record['name']} | {record['count']} | {record['type']} |")
+
+    lines += [
+        "\n## Technical Terms\n",
+        "| Term | Mentions | Type | Definition |",
+        "|------|----------|------|------------|",
+    ]
+    for record in records:
+        if record['category'] == 'term':
+            lines.append(f"| {record['name']} | {record['count']} | {record['type']} | {record.get('definition', '')} |")
+
+    return '\n'.join(lines) + '\n'
+
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python3 smart_entity_extractor.py <project_dir>")
+        print("Usage: python3 smart_entity_extractor.py <project_dir> [--workers N] [--force]")
         sys.exit(1)
 
     project_dir = Path(sys.argv[1]).expanduser()
+    workers = None
+    force = False
+    argv = iter(sys.argv[2:])
+    for arg in argv:
+        if arg == '--force':
+            force = True
+        elif arg == '--workers':
+            workers = int(next(argv, '1'))
+        elif arg.startswith('--workers='):
+            workers = int(arg.split('=', 1)[1])
 
     print(f"\nSmart Entity Extraction")
     print(f"=======================")
     print(f"Project: {project_dir}")
 
-    people, terms = process_documents(project_dir)
+    people, terms = process_documents(project_dir, workers, force)
 
     if people is None:
         sys.exit(1)
@@ -476,27 +670,17 @@ def main():
     if len(sorted_terms) > 40:
         print(f"  ... and {len(sorted_terms) - 40} more")
 
-    # Save results
-    output_file = project_dir / 'extracted_entities.md'
-
-    with open(output_file, 'w') as f:
-        f.write("# Extracted Entities\n\n")
-        f.write(f"*Generated from {len(list((project_dir / 'processed').glob('*.md')))} documents*\n\n")
-
-        f.write("## People\n\n")
-        f.write("| Name | Mentions | Type |\n")
-        f.write("|------|----------|------|\n")
-        for name, info in sorted_people:
-            f.write(f"| {name} | {info['count']} | {info['type']} |\n")
+    # Save results, and the report rendered from them
+    records = entity_records(people, terms)
+    entities_file = project_dir / ENTITIES_FILE
+    write_entities(entities_file, records)
 
-        f.write("\n## Technical Terms\n\n")
-        f.write("| Term | Mentions | Type | Definition |\n")
-        f.write("|------|----------|------|------------|\n")
-        for term, info in sorted_terms:
-            definition = info.get('definition', '')
-            f.write(f"| {term} | {info['count']} | {info['type']} | {definition} |\n")
+    report_file = project_dir / REPORT_FILE
+    document_count = len(list((project_dir / 'processed').glob('*.md')))
+    report_file.write_text(render_report(records, document_count), encoding='utf-8')
 
-    print(f"\n\nResults saved to: {output_file}")
+    print(f"\n\nResults saved to: {entities_file}")
+    print(f"Report: {report_file}")
 
     return people, terms
 
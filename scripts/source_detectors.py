@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Source type registry for intake.
+
+Each source type registers:
+- signals: patterns that each add a point to its score,
+- sniff: an optional test that recognizes its export format outright from
+  the first few KB of a document,
+- parse: an optional parser that collects participants, speakers, timestamps
+  and the document date in one pass over the content.
+
+Adding a source is one register_source() call; detect_source_type() and
+parse_source() do not change.
+"""
+
+import csv
+import io
+import json
+import re
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.parser import HeaderParser
+from email.utils import getaddresses, parsedate_to_datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from turn_index import parse_transcript
+
+
+# Registered sources in registration order; score ties go to the earlier one
+SOURCES = {}
+
+# (source, needle, compiled regex or None, match_case) for every registered signal
+_SIGNALS = []
+
+DEFAULT_SOURCE = 'notes'
+
+# Only this much of a document is scanned for source signals by default
+SOURCE_SCAN_CHARS = 64 * 1024
+
+# Sniff tests see only this much of a document
+SNIFF_CHARS = 4096
+
+HIGH_CONFIDENCE_SCORE = 5
+
+
+def register_source(name, signals=(), sniff=None, parse=None):
+    """
+    Register a source type.
+
+    signals are (needle, regex, match_case) tuples. A signal is the plain
+    substring needle when regex is None; otherwise the regex only runs when
+    the needle occurs. Signals match lowercased text unless match_case is set.
+    sniff(head) returns True when the start of a document is unmistakably this
+    source, and parse(content) returns a dict shaped like empty_parse().
+    """
+    SOURCES[name] = {'signal_count': len(signals), 'sniff': sniff, 'parse': parse}
+    for needle, pattern, match_case in signals:
+        _SIGNALS.append((name, needle, re.compile(pattern, re.MULTILINE) if pattern else None, match_case))
+
+
+def empty_parse():
+    """What parse_source returns for a source without a parser."""
+    return {
+        'participants': [],  # names, in order of first appearance
+        'speakers': {},      # speaker -> number of turns or messages
+        'timestamps': [],    # one per turn or message, as written in the source
+        'date': None,        # YYYY-MM-DD when the source states it
+        'turns': None,       # turn_index.TurnTable for transcripts
+    }
+
+
+def _is_decided(scores, remaining):
+    """True once further signals can change neither the winning source nor its confidence."""
+    leader = max(scores, key=scores.get)
+    if scores[leader] < HIGH_CONFIDENCE_SCORE:
+        return False
+
+    order = list(scores)
+    for source in order:
+        if source == leader:
+            continue
+        reachable = scores[source] + remaining[source]
+        # Ties go to the source registered first
+        if reachable > scores[leader] or (reachable == scores[leader] and order.index(source) < order.index(leader)):
+            return False
+    return True
+
+
+def score_source_signals(content, limit=SOURCE_SCAN_CHARS):
+    """
+    Score each source type by how many of its signals occur in content.
+
+    Only the first limit characters are scanned (all of them if limit is
+    None), so the cost does not grow with document length, and only that
+    window is lowercased. Scanning stops as soon as further signals can no
+    longer change the result.
+    """
+    text = content if limit is None else content[:limit]
+    text_lower = text.lower()
+
+    scores = dict.fromkeys(SOURCES, 0)
+    remaining = {name: source['signal_count'] for name, source in SOURCES.items()}
+
+    for source, needle, regex, match_case in _SIGNALS:
+        remaining[source] -= 1
+        haystack = text if match_case else text_lower
+        if needle not in haystack or (regex and not regex.search(haystack)):
+            continue
+
+        scores[source] += 1
+        if _is_decided(scores, remaining):
+            break
+
+    return scores
+
+
+def detect_source_type(content, limit=SOURCE_SCAN_CHARS):
+    """Detect document source type: a matching sniff test first, otherwise signal scores."""
+    head = content[:SNIFF_CHARS]
+    for name, source in SOURCES.items():
+        if source['sniff'] and source['sniff'](head):
+            return name, 'high'
+
+    scores = score_source_signals(content, limit)
+
+    max_score = max(scores.values())
+    if max_score >= 3:
+        source = max(scores, key=scores.get)
+        confidence = 'high' if max_score >= HIGH_CONFIDENCE_SCORE else 'medium'
+        return source, confidence
+    elif max_score >= 1:
+        source = max(scores, key=scores.get)
+        return source, 'low'
+    else:
+        return DEFAULT_SOURCE, 'low'
+
+
+def parse_source(source, content):
+    """Run the registered parser for a source type over content."""
+    parse = SOURCES.get(source, {}).get('parse')
+    return parse(content) if parse else empty_parse()
+
+
+def _add_turn(parsed, speaker, timestamp=None):
+    """Count one turn for speaker, recording its timestamp."""
+    if speaker not in parsed['speakers']:
+        parsed['speakers'][speaker] = 0
+        parsed['participants'].append(speaker)
+    parsed['speakers'][speaker] += 1
+    if timestamp:
+        parsed['timestamps'].append(timestamp)
+
+
+def _parse_date(value):
+    """Normalize a date as written in an email, JIRA or Slack export to YYYY-MM-DD."""
+    value = (value or '').strip()
+    if not value:
+        return None
+
+    try:
+        return parsedate_to_datetime(value).strftime('%Y-%m-%d')
+    except (TypeError, ValueError, IndexError):
+        pass
+
+    for fmt in ('%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%d %H:%M', '%Y-%m-%d',
+                '%d/%b/%y %I:%M %p', '%d/%b/%Y %I:%M %p', '%B %d, %Y', '%b %d, %Y',
+                '%A, %B %d, %Y %I:%M %p', '%A, %B %d, %Y'):
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+
+    return None
+
+
+def sniff_zoom(head):
+    """WEBVTT transcript files."""
+    return head.lstrip('\ufeff \r\n').startswith('WEBVTT')
+
+
+def parse_zoom(content):
+    """
+    Build a Zoom transcript's turn table (WEBVTT cues, "HH:MM:SS Speaker: text"
+    and bare "Speaker: text" lines) and collect speakers and timestamps from it.
+    """
+    parsed = empty_parse()
+    turns = parse_transcript(content)
+    for i, speaker in enumerate(turns.speaker):
+        _add_turn(parsed, turns.speakers[speaker], turns.timestamp(i))
+    parsed['turns'] = turns
+    return parsed
+
+
+# Slack text: "@john.smith 10:30 AM" / "John Smith  10:30 AM" message headers,
+# "[10:30 AM] John Smith: text" lines, and @mentions anywhere
+SLACK_LINE = re.compile(
+    r'^@?(?P<speaker>[A-Za-z][\w.\'-]*(?:[ \t]+[A-Z][\w.\'-]*){0,3})[ \t]+\[?(?P<ts>\d{1,2}:\d{2}(?:[ \t]*[AP]M)?)\]?[ \t]*$'
+    r'|^\[(?P<ts2>\d{1,2}:\d{2}(?:[ \t]*[AP]M)?)\][ \t]+(?P<speaker2>[^:\n]{1,60}):'
+    r'|@(?P<mention>[\w.-]*\w)',
+    re.MULTILINE)
+
+
+def sniff_slack(head):
+    """Slack's JSON export: a list of message objects with "ts" fields."""
+    return head.lstrip('\ufeff \r\n').startswith(('[', '{')) and '"ts"' in head
+
+
+def _parse_slack_json(content):
+    """Collect authors and timestamps from a Slack JSON export, or None if it is not one."""
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return None
+
+    messages = data.get('messages', []) if isinstance(data, dict) else data
+    if not isinstance(messages, list):
+        return None
+
+    parsed = empty_parse()
+    for message in messages:
+        if not isinstance(message, dict):
+            continue
+        profile = message.get('user_profile') or {}
+        author = profile.get('real_name') or message.get('user_name') or message.get('user')
+        try:
+            sent = datetime.fromtimestamp(float(message.get('ts')), timezone.utc)
+        except (TypeError, ValueError):
+            sent = None
+        if author:
+            _add_turn(parsed, author, sent.strftime('%Y-%m-%dT%H:%M:%SZ') if sent else None)
+        if sent and not parsed['date']:
+            parsed['date'] = sent.strftime('%Y-%m-%d')
+    return parsed
+
+
+def parse_slack(content):
+    """Collect message authors, timestamps and @mentions from a Slack export (JSON or text)."""
+    if sniff_slack(content[:SNIFF_CHARS]):
+        parsed = _parse_slack_json(content)
+        if parsed is not None:
+            return parsed
+
+    parsed = empty_parse()
+    mentions = []
+    for match in SLACK_LINE.finditer(content):
+        if match.group('mention'):
+            mentions.append(match.group('mention'))
+        elif match.group('speaker'):
+            _add_turn(parsed, match.group('speaker'), match.group('ts'))
+        else:
+            _add_turn(parsed, match.group('speaker2').strip(), match.group('ts2'))
+
+    for mention in mentions:
+        if mention not in parsed['speakers'] and mention not in parsed['participants']:
+            parsed['participants'].append(mention)
+    return parsed
+
+
+EMAIL_HEADER = re.compile(
+    r'^(?:from|to|cc|subject|date|sent|received|return-path|message-id|reply-to|mime-version):',
+    re.IGNORECASE | re.MULTILINE)
+
+
+def _email_header_block(content):
+    """The leading header block of an email: everything before the first blank line."""
+    text = content.lstrip('\ufeff \r\n')
+    end = re.search(r'\r?\n[ \t]*\r?\n', text)
+    return text[:end.start()] if end else text
+
+
+def sniff_email(head):
+    """Starts with a block of at least two RFC 822 style headers."""
+    block = _email_header_block(head)
+    return bool(EMAIL_HEADER.match(block)) and len(EMAIL_HEADER.findall(block)) >= 2
+
+
+def parse_email(content):
+    """
+    Collect correspondents and the sent date from an email's headers.
+
+    Without a header block at the start (a forwarded-message banner or a
+    title first), names come from From/To/Attendees lines in the first 20
+    lines, as for meeting notes.
+    """
+    parsed = empty_parse()
+    block = _email_header_block(content)
+    if not EMAIL_HEADER.match(block):
+        return parse_meeting(content)
+
+    headers = HeaderParser().parsestr(block)
+    senders = getaddresses(headers.get_all('From', []))
+    recipients = getaddresses(headers.get_all('To', []) + headers.get_all('Cc', []))
+
+    sent = headers.get('Date') or headers.get('Sent')
+    for name, _ in senders:
+        if name:
+            _add_turn(parsed, name, sent)
+    for name, _ in recipients:
+        if name and name not in parsed['participants']:
+            parsed['participants'].append(name)
+
+    parsed['date'] = _parse_date(sent)
+    return parsed
+
+
+# Meeting notes list people on From/To/Attendees lines near the top
+MEETING_PEOPLE_LINE = re.compile(r'^(from|to|attendees):', re.IGNORECASE)
+PERSON_NAME = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b')
+
+
+def parse_meeting(content):
+    """Collect names from From/To/Attendees lines in the first 20 lines."""
+    parsed = empty_parse()
+    for line in content.split('\n', 20)[:20]:
+        if MEETING_PEOPLE_LINE.match(line):
+            for name in PERSON_NAME.findall(line):
+                if name not in parsed['participants']:
+                    parsed['participants'].append(name)
+    return parsed
+
+
+JIRA_FIELD = re.compile(r'^(?P<field>Key|Issue Type|Status|Priority|Assignee|Reporter|Creator|Created|Updated|Resolution):[ \t]*(?P<value>.*)$',
+                        re.MULTILINE)
+JIRA_PEOPLE_FIELDS = ('Assignee', 'Reporter', 'Creator')
+
+
+def sniff_jira(head):
+    """JIRA CSV/XML exports, or a text export with several issue fields."""
+    first_line = head.lstrip('\ufeff \r\n').split('\n', 1)[0]
+    if 'Issue key' in first_line and ',' in first_line:
+        return True
+    if head.lstrip().startswith(('<?xml', '<rss')) and 'jira' in head.lower():
+        return True
+    return len({m.group('field') for m in JIRA_FIELD.finditer(head)}) >= 4
+
+
+def _jira_issue(parsed, people, created):
+    """Record one issue's people and creation time."""
+    for person in people:
+        person = (person or '').strip()
+        if person and person != 'Unassigned':
+            _add_turn(parsed, person)
+    if created:
+        parsed['timestamps'].append(created.strip())
+    date = _parse_date(created)
+    if date and (not parsed['date'] or date < parsed['date']):
+        parsed['date'] = date
+
+
+def parse_jira(content):
+    """Collect assignees, reporters and creation dates from a JIRA export (CSV, XML or text)."""
+    parsed = empty_parse()
+    text = content.lstrip('\ufeff \r\n')
+    first_line = text.split('\n', 1)[0]
+
+    if 'Issue key' in first_line and ',' in first_line:
+        for row in csv.DictReader(io.StringIO(text)):
+            _jira_issue(parsed, [row.get(field) for field in JIRA_PEOPLE_FIELDS], row.get('Created'))
+        return parsed
+
+    if text.startswith(('<?xml', '<rss')):
+        try:
+            root = ET.fromstring(text)
+        except ET.ParseError:
+            root = None
+        if root is not None:
+            for item in root.iter('item'):
+                people = [item.findtext(field.lower()) for field in JIRA_PEOPLE_FIELDS]
+                _jira_issue(parsed, people, item.findtext('created'))
+            return parsed
+
+    people, created = [], None
+    for match in JIRA_FIELD.finditer(content):
+        field, value = match.group('field'), match.group('value')
+        if field in JIRA_PEOPLE_FIELDS:
+            people.append(value)
+        elif field == 'Created' and created is None:
+            created = value
+    _jira_issue(parsed, people, created)
+    return parsed
+
+
+register_source('zoom', sniff=sniff_zoom, parse=parse_zoom, signals=[
+    (':', r'\d{2}:\d{2}:\d{2}', False),  # Timestamps HH:MM:SS
+    (':', r'^\w+\s+\w+:\s', False),  # Speaker: format
+    ("you're on mute", None, False),
+    ('can you hear me', None, False),
+    ('share my screen', None, False),
+    ('webvtt', None, False),
+])
+
+register_source('slack', sniff=sniff_slack, parse=parse_slack, signals=[
+    ('M', r'\d{1,2}:\d{2}\s*[AP]M', True),  # Time format
+    ('#', r'#[\w-]+', True),  # Channel references
+    ('@', r'@[\w-]+', True),  # User mentions
+    ('slack', None, True),
+    ('replied to a thread', None, True),
+    (':', r':\w+:', True),  # Emoji patterns
+])
+
+register_source('jira', sniff=sniff_jira, parse=parse_jira, signals=[
+    ('-', r'[A-Z]{2,}-\d+', True),  # Ticket IDs
+    ('summary:', None, False),
+    ('description:', None, False),
+    ('acceptance criteria', None, False),
+    ('story points', None, False),
+    ('sprint', None, False),
+    ('in progress', None, False),
+    ('to do', None, False),
+    ('done', None, False),
+    ('blocked', None, False),
+])
+
+register_source('email', sniff=sniff_email, parse=parse_email, signals=[
+    ('from:', r'^from:', False),
+    ('to:', r'^to:', False),
+    ('subject:', r'^subject:', False),
+    ('date:', r'^date:', False),
+    ('sent:', r'^sent:', False),
+    ('@', r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b', False),  # Email addresses
+    ('re:', r'^re:', False),
+    ('fwd:', r'^fwd:', False),
+    ('best regards', None, False),
+    ('sincerely', None, False),
+])
+
+register_source('meeting', parse=parse_meeting, signals=[
+    ('agenda', None, False),
+    ('attendees', None, False),
+    ('minutes', None, False),
+    ('action items', None, False),
+    ('meeting notes', None, False),
+    ('next steps', None, False),
+    ('decisions', None, False),
+    ('discussion', None, False),
+])
+
+register_source('wiki', signals=[
+    ('confluence', None, False),
+    ('table of contents', None, False),
+    ('wiki', None, False),
+    ('===', r'^\s*={3,}', False),  # Wiki-style headers
+    ('page information', None, False),
+    ('space', None, False),
+])
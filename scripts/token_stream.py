@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+A document's words, read once for every entity extractor.
+
+The text is split in one regex pass into its words (runs of \\w, the units
+\\b delimits) and the separators between them. Extractors walk these lists
+instead of each running its own regex over the text: dictionary and verb
+lookups use the case-folded words, name and acronym rules only visit the
+capitalized words, and character offsets are computed when first needed.
+"""
+
+import re
+from itertools import accumulate
+
+
+SEPARATORS = re.compile(r'(\W+)')
+
+
+class TokenStream:
+    """
+    words[i] is the i-th word and gaps[i] the separator after it ('' after
+    the last). words[0] is '' when the text starts with a separator, and
+    the last word is '' when it ends with one.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self._parts = SEPARATORS.split(text)
+        self.words = self._parts[0::2]
+        self.gaps = self._parts[1::2]
+        self.gaps.append('')
+        self._folded = None
+        self._capitalized = None
+        self._starts = None
+
+    def __len__(self):
+        return len(self.words)
+
+    @property
+    def folded(self):
+        """Case-folded words, for case-insensitive lookups."""
+        if self._folded is None:
+            # One casefold call for the whole document; words never contain NUL
+            self._folded = '\0'.join(self.words).casefold().split('\0')
+        return self._folded
+
+    @property
+    def capitalized(self):
+        """Indices of the words starting with an ASCII capital letter."""
+        if self._capitalized is None:
+            self._capitalized = [i for i, word in enumerate(self.words) if 'A' <= word[:1] <= 'Z']
+        return self._capitalized
+
+    @property
+    def starts(self):
+        """Character offset of each word in the text."""
+        if self._starts is None:
+            self._starts = list(accumulate(map(len, self._parts), initial=0))[0::2]
+        return self._starts
+
+    def span(self, first, last=None):
+        """Character span (start, end) of words first to last, inclusive."""
+        if last is None:
+            last = first
+        starts = self.starts
+        return starts[first], starts[last] + len(self.words[last])
+
+
+def is_name_word(word):
+    """An ASCII capital followed by lowercase letters ([A-Z][a-z]+)."""
+    return len(word) > 1 and word.isascii() and word.isalpha() and word[0].isupper() and word[1:].islower()
+
+
+def is_letters(word):
+    """Two or more ASCII letters in any case ([A-Z][a-z]+ ignoring case)."""
+    return len(word) > 1 and word.isascii() and word.isalpha()
+
+
+def is_acronym_word(word):
+    """Two to six ASCII capitals and digits, starting with a capital ([A-Z][A-Z0-9]{1,5})."""
+    return 1 < len(word) < 7 and word.isascii() and word.isalnum() and word[0].isalpha() and word.isupper()
+
+
+def is_capitals(word):
+    """Two to six ASCII capitals ([A-Z]{2,6})."""
+    return 1 < len(word) < 7 and word.isascii() and word.isalpha() and word.isupper()
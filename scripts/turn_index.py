@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Speaker-turn index for transcripts.
+
+Intake parses a Zoom transcript (WEBVTT cues, "HH:MM:SS Speaker: text" or
+bare "Speaker: text" lines) once into a TurnTable: one row per turn holding
+the speaker's id, start and end time in milliseconds, and the byte range of
+the turn's text in the document body (after its leading blank lines, which
+frontmatter rewrites may change). The table is a handful of typed
+arrays, stored in the catalog next to the document, so speaker lists,
+talk time and quotes are read from it instead of re-scanning the text.
+
+Usage:
+    python3 turn_index.py <project_dir> [document_name] [--speaker NAME]
+"""
+
+import io
+import json
+import re
+import sys
+from array import array
+from itertools import dropwhile
+from pathlib import Path
+
+
+# "00:00:01.000 --> 00:00:04.000" cue timings
+CUE = re.compile(r'^(\d{1,2}:\d{2}:\d{2}[.,]\d{3})[ \t]+-->[ \t]*(\d{1,2}:\d{2}:\d{2}[.,]\d{3})?')
+
+# "00:00:01 Speaker Name: text" and "Speaker Name: text"
+TURN = re.compile(r'^(?:(\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?)[ \t]+)?([A-Z][a-z]+(?:[ \t]+[A-Z][a-z]+)*)[ \t]*:[ \t]*')
+
+# Time of a turn that the transcript does not state
+UNKNOWN = -1
+
+# Column typecodes, in serialization order: speaker id, start ms, end ms, text start, text end
+COLUMNS = (('speaker', 'H'), ('start', 'i'), ('end', 'i'), ('text_start', 'Q'), ('text_end', 'Q'))
+
+
+def parse_time(value):
+    """Milliseconds in an "HH:MM:SS", "HH:MM:SS.mmm" or "HH:MM:SS,mmm" time."""
+    hours, minutes, seconds = value.replace(',', '.').split(':')
+    return round((int(hours) * 3600 + int(minutes) * 60 + float(seconds)) * 1000)
+
+
+def format_time(ms):
+    seconds, ms = divmod(ms, 1000)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}" + (f".{ms:03d}" if ms else '')
+
+
+class TurnTable:
+    """Columnar table of a transcript's speaker turns; speakers are numbered in order of first turn."""
+
+    def __init__(self):
+        self.speakers = []
+        self._ids = {}
+        for column, typecode in COLUMNS:
+            setattr(self, column, array(typecode))
+
+    def __len__(self):
+        return len(self.speaker)
+
+    def add(self, speaker, start, end, text_start, text_end):
+        if speaker not in self._ids:
+            self._ids[speaker] = len(self.speakers)
+            self.speakers.append(speaker)
+        self.speaker.append(self._ids[speaker])
+        self.start.append(start)
+        self.end.append(end)
+        self.text_start.append(text_start)
+        self.text_end.append(text_end)
+
+    @classmethod
+    def parse(cls, lines):
+        """
+        Build the table from a transcript's lines (newlines included).
+
+        Lines without a speaker continue the turn above them; offsets count
+        from the first line that is not blank.
+        """
+        table = cls()
+        position = 0
+        cue = None
+        in_turn = False
+
+        for line in dropwhile(lambda line: not line.rstrip('\r\n'), lines):
+            text = line.rstrip('\r\n')
+            size = len(line.encode('utf-8'))
+
+            cue_match = CUE.match(text)
+            turn_match = None if cue_match else TURN.match(text)
+            if cue_match:
+                start, end = cue_match.groups()
+                cue = (parse_time(start), parse_time(end) if end else UNKNOWN)
+                in_turn = False
+            elif turn_match:
+                timestamp, speaker = turn_match.groups()
+                start, end = cue or (parse_time(timestamp) if timestamp else UNKNOWN, UNKNOWN)
+                table.add(speaker, start, end,
+                          position + len(text[:turn_match.end()].encode('utf-8')),
+                          position + len(text.encode('utf-8')))
+                cue = None
+                in_turn = True
+            elif not text.strip():
+                in_turn = False
+            elif in_turn:
+                table.text_end[-1] = position + len(text.encode('utf-8'))
+
+            position += size
+
+        return table
+
+    def turn_counts(self):
+        """Speaker -> number of turns."""
+        counts = [0] * len(self.speakers)
+        for speaker in self.speaker:
+            counts[speaker] += 1
+        return dict(zip(self.speakers, counts))
+
+    def talk_time(self):
+        """
+        Speaker -> milliseconds spoken.
+
+        A turn without an end time lasts until the next turn starts; the
+        last one, or one without a start time, counts as zero.
+        """
+        totals = [0] * len(self.speakers)
+        for i, speaker in enumerate(self.speaker):
+            start, end = self.start[i], self.end[i]
+            if end == UNKNOWN and i + 1 < len(self):
+                end = self.start[i + 1]
+            if start != UNKNOWN and end != UNKNOWN and end > start:
+                totals[speaker] += end - start
+        return dict(zip(self.speakers, totals))
+
+    def turns_of(self, speaker):
+        """Row numbers of a speaker's turns."""
+        if speaker not in self._ids:
+            return []
+        speaker_id = self._ids[speaker]
+        return [i for i, value in enumerate(self.speaker) if value == speaker_id]
+
+    def quote(self, body, i):
+        """The text of turn i, sliced from the document body (bytes)."""
+        return body[self.text_start[i]:self.text_end[i]].decode('utf-8')
+
+    def timestamp(self, i):
+        """Turn i's start as written (HH:MM:SS[.mmm]), or None."""
+        return format_time(self.start[i]) if self.start[i] != UNKNOWN else None
+
+    def to_bytes(self):
+        """Serialize as a JSON header line followed by the raw columns."""
+        header = json.dumps({'speakers': self.speakers, 'rows': len(self)}).encode('utf-8') + b'\n'
+        return header + b''.join(getattr(self, column).tobytes() for column, _ in COLUMNS)
+
+    @classmethod
+    def from_bytes(cls, data):
+        header_end = data.index(b'\n')
+        header = json.loads(data[:header_end])
+        table = cls()
+        table.speakers = header['speakers']
+        table._ids = {speaker: i for i, speaker in enumerate(table.speakers)}
+
+        position = header_end + 1
+        for column, typecode in COLUMNS:
+            values = array(typecode)
+            size = values.itemsize * header['rows']
+            values.frombytes(data[position:position + size])
+            setattr(table, column, values)
+            position += size
+        return table
+
+
+def parse_transcript(content):
+    """The turn table of transcript text."""
+    return TurnTable.parse(io.StringIO(content))
+
+
+def document_body(doc_path):
+    """A document's body without leading blank lines, as bytes, for TurnTable.quote."""
+    data = doc_path.read_bytes()
+    if data.startswith(b'---'):
+        end = data.find(b'\n---\n', 3)
+        if end >= 0:
+            data = data[end + 5:]
+    return data.lstrip(b'\r\n')
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 turn_index.py <project_dir> [document_name] [--speaker NAME]")
+        sys.exit(1)
+
+    sys.path.insert(0, str(Path(__file__).parent))
+    from document_catalog import open_catalog
+
+    project_dir = Path(sys.argv[1]).expanduser()
+    args = sys.argv[2:]
+    speaker = None
+    if '--speaker' in args:
+        index = args.index('--speaker')
+        speaker = args[index + 1] if index + 1 < len(args) else None
+        del args[index:index + 2]
+
+    catalog = open_catalog(project_dir)
+    documents = catalog.documents_with_turns()
+    if args:
+        documents = [path for path in documents if args[0] in path.name]
+
+    if not documents:
+        print("No transcripts with a turn index")
+        catalog.close()
+        return
+
+    for doc_path in documents:
+        table = catalog.turns(doc_path)
+        print(f"\n{doc_path.name}: {len(table)} turns, {len(table.speakers)} speakers")
+
+        counts = table.turn_counts()
+        for name, ms in sorted(table.talk_time().items(), key=lambda item: -item[1]):
+            print(f"  {name}: {counts[name]} turns, {format_time(ms - ms % 1000)} talk time")
+
+        if speaker:
+            body = document_body(doc_path)
+            for i in table.turns_of(speaker):
+                print(f"  [{table.timestamp(i) or '--:--:--'}] {speaker}: {table.quote(body, i)}")
+
+    catalog.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from frontmatter_io import parse_frontmatter, read_header
+from export_knowledge_base import KnowledgeFile
+
+
+def test_frontmatter_and_body():
+    assert parse_frontmatter("---\ntitle: Notes\n---\n\nBody\n") == ({'title': 'Notes'}, "\nBody\n")
+
+
+def test_empty_frontmatter_is_an_empty_dict():
+    assert parse_frontmatter("---\n---\n# Notes\n") == ({}, "# Notes\n")
+
+
+def test_closing_delimiter_at_end_of_text():
+    assert parse_frontmatter("---\ntitle: Notes\n---") == ({'title': 'Notes'}, "")
+
+
+def test_missing_or_invalid_frontmatter():
+    assert parse_frontmatter("# Notes\n") == (None, "# Notes\n")
+    assert parse_frontmatter("---\ntitle: Notes\n") == (None, "---\ntitle: Notes\n")
+    assert parse_frontmatter("---\ntitle: [\n---\nBody") == (None, "---\ntitle: [\n---\nBody")
+
+
+def test_read_header_with_closing_delimiter_at_end_of_file(tmp_path):
+    path = tmp_path / 'note.md'
+    path.write_text("---\ntitle: Notes\n---")
+    assert read_header(path) == {'title': 'Notes'}
+
+
+def test_knowledge_file_with_empty_frontmatter(tmp_path):
+    path = tmp_path / 'wiki' / 'notes.md'
+    path.parent.mkdir()
+    path.write_text("---\n---\n# Weekly Notes\n\nBody\n")
+    knowledge_file = KnowledgeFile(path, tmp_path)
+    assert knowledge_file.frontmatter == {}
+    assert knowledge_file.content == "# Weekly Notes\n\nBody"
+    assert knowledge_file.title == 'Weekly Notes'
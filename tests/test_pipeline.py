@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from pipeline import run_pipeline
+
+
+TRANSCRIPT = """2024-03-04 Standup
+
+Alice Smith: Yesterday I finished the ingest job.
+Bob Jones: I am reviewing the schema change today.
+"""
+
+
+def processed_names(project_dir):
+    return sorted(path.name for path in (project_dir / 'processed').glob('*.md'))
+
+
+def test_edited_raw_file_keeps_its_processed_name(tmp_path):
+    raw = tmp_path / 'raw' / '2024-03-04-standup.txt'
+    raw.parent.mkdir()
+    raw.write_text(TRANSCRIPT)
+    run_pipeline(tmp_path, skip_crossref=True)
+    names = processed_names(tmp_path)
+    assert len(names) == 1
+
+    for edit in range(3):
+        raw.write_text(TRANSCRIPT + f"Carol White: Edit number {edit}.\n")
+        run_pipeline(tmp_path, skip_crossref=True)
+        assert processed_names(tmp_path) == names
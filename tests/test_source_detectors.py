@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from source_detectors import parse_source
+
+
+def test_email_headers_at_the_start():
+    parsed = parse_source('email', (
+        "From: Jane Doe <jane@example.com>\n"
+        "To: John Smith <john@example.com>\n"
+        "Date: Mon, 4 Mar 2024 10:00:00 +0000\n"
+        "Subject: Launch\n"
+        "\n"
+        "See you there.\n"
+    ))
+    assert parsed['participants'] == ['Jane Doe', 'John Smith']
+    assert parsed['date'] == '2024-03-04'
+
+
+def test_email_with_preamble_scans_the_first_lines():
+    parsed = parse_source('email', (
+        "\n"
+        "---------- Forwarded message ---------\n"
+        "From: Jane Doe <jane@example.com>\n"
+        "To: John Smith <john@example.com>, Ann Lee <ann@example.com>\n"
+        "Subject: Launch\n"
+        "\n"
+        "See you there.\n"
+    ))
+    assert parsed['participants'] == ['Jane Doe', 'John Smith', 'Ann Lee']